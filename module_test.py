@@ -22,7 +22,15 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import gc
 import os
+import sys
+import time
+import weakref
+import threading
+import multiprocessing
+
+import pytest
 
 if os.path.exists("logfile.log"):
     os.remove("logfile.log")
@@ -32,6 +40,17 @@ if os.path.exists("logfile2.log"):
 
 
 from simplelogger.logger import Logger
+from simplelogger.sinks import FileSink
+from simplelogger.formatting import Timestamper
+from simplelogger.collector import Collector
+
+
+def _shared_logfile_worker(logfile: str, worker: int) -> None:
+    logger = Logger(f"Worker #{worker}", logfile, multiprocess=True, buffer_size=512, max_logfile_sz=8192 / 1024 / 1024, backup_count=100)
+    for i in range(1, 501):
+        logger.error(f"Worker #{worker} Logging test #{i}")
+
+    logger.close()
 
 
 class TestClass():
@@ -117,3 +136,808 @@ class TestClass():
         assert len(logger.getAllLogs()) == 10
         assert logger.getLoggerInfo()["stats"]["log_size"] == 10
         assert logger.getAllLogs()[0]["msg"] == "Autoforget Logging Information test #2"
+
+    def test_buffered_sink(self, tmp_path):
+        logfile = str(tmp_path / "buffered.log")
+        with Logger("Buffered Sink Test Logger", logfile, loglevel=5, buffer_size=1 << 20, flush_interval=None) as logger:
+            for i in range(1, 101):
+                logger.info(f"Buffered Logging test #{i}")
+
+            assert not os.path.exists(logfile)  # Everything is still in the write buffer.
+            logger.flush()
+            with open(logfile, 'r') as f:
+                assert len(f.readlines()) == 100
+
+            logger.info("Buffered Logging test #101")
+
+        with open(logfile, 'r') as f:
+            assert f.readlines()[-1].endswith("| Buffered Logging test #101\n")
+
+    def test_unbuffered_sink(self, tmp_path):
+        logfile = str(tmp_path / "unbuffered.log")
+        logger = Logger("Unbuffered Sink Test Logger", logfile, buffer_size=0)
+        logger.warning("Unbuffered Logging test")
+        with open(logfile, 'r') as f:
+            assert len(f.readlines()) == 1
+
+        logger.close()
+
+    def test_asynchronous_logging(self, tmp_path):
+        logfile = str(tmp_path / "async.log")
+        logger = Logger("Asynchronous Test Logger", logfile, loglevel=5, asynchronous=True, queue_size=100)
+        for i in range(1, 1001):
+            logger.info(f"Asynchronous Logging test #{i}")
+
+        assert logger.getLoggerInfo()["stats"]["log_size"] == 1000
+        logger.flush()
+        with open(logfile, 'r') as f:
+            assert len(f.readlines()) == 1000
+
+        logger.debug("Asynchronous Logging test #1001")
+        logger.close()
+        with open(logfile, 'r') as f:
+            lines = f.readlines()
+
+        assert len(lines) == 1001
+        assert lines[-1].endswith("| Asynchronous Logging test #1001\n")
+
+    def test_rotation(self, tmp_path):
+        logfile = str(tmp_path / "rotation.log")
+        limit = 4096
+        logger = Logger("Rotation Test Logger", logfile, loglevel=5, buffer_size=0, max_logfile_sz=limit / 1024 / 1024, backup_count=2)
+        for i in range(1, 1001):
+            logger.info(f"Rotation Logging test #{i}")
+
+        logger.close()
+        assert sorted(os.listdir(str(tmp_path))) == ["rotation.log", "rotation.log.1", "rotation.log.2"]
+        for name in os.listdir(str(tmp_path)):
+            assert os.path.getsize(str(tmp_path / name)) <= limit
+
+        with open(logfile, 'r') as f:
+            assert f.readlines()[-1].endswith("| Rotation Logging test #1000\n")
+
+    def test_shared_logfile_rotation(self, tmp_path):
+        logfile = str(tmp_path / "shared.log")
+        limit = 4096
+        first = Logger("Shared Rotation Test Logger", logfile, loglevel=5, buffer_size=0, max_logfile_sz=limit / 1024 / 1024, backup_count=50)
+        second = Logger("Shared Rotation Test Logger", logfile, loglevel=5, buffer_size=0, max_logfile_sz=limit / 1024 / 1024, backup_count=50)
+        for i in range(1, 401):
+            first.info(f"Shared Rotation test #{i}")
+            second.info(f"Shared Rotation test #{i + 400}")
+
+        first.close()
+        second.close()
+        lines = []
+        for name in os.listdir(str(tmp_path)):
+            assert os.path.getsize(str(tmp_path / name)) <= limit
+            with open(str(tmp_path / name), 'r') as f:
+                lines.extend(f.readlines())
+
+        assert len(lines) == 800
+        assert len(os.listdir(str(tmp_path))) > 2
+
+    def test_timestamp_rotation(self, tmp_path):
+        logfile = str(tmp_path / "rotation.log")
+        logger = Logger("Rotation Test Logger", logfile, loglevel=5, buffer_size=1024, max_logfile_sz=4096 / 1024 / 1024, backup_count=3, rotation="timestamp")
+        for i in range(1, 1001):
+            logger.info(f"Rotation Logging test #{i}")
+
+        logger.close()
+        assert len(os.listdir(str(tmp_path))) == 4
+
+    def test_logfile_size_tracking(self, tmp_path):
+        logfile = str(tmp_path / "size.log")
+        with open(logfile, 'w') as f:
+            f.write("Existing line\n")
+
+        logger = Logger("Size Tracking Test Logger", logfile, buffer_size=0, size_check_interval=0)
+        for i in range(1, 11):
+            logger.error(f"Size Tracking test #{i}")
+
+        assert logger.getLoggerInfo()["stats"]["logfile_size"] == os.path.getsize(logfile)
+
+        with open(logfile, 'w') as f:
+            pass  # Truncated by another program.
+
+        logger.error("Size Tracking test #11")
+        assert logger.getLoggerInfo()["stats"]["logfile_size"] == os.path.getsize(logfile)
+        logger.close()
+
+    def test_autoforget_all_levels(self, tmp_path):
+        logger = Logger("Autoforget Ring Buffer Test Logger", str(tmp_path / "ring.log"), loglevel=5, logsize=3, autoforget=True)
+        logger.debug("Ring Buffer test #1")
+        logger.info("Ring Buffer test #2")
+        logger.warning("Ring Buffer test #3")
+        logger.error("Ring Buffer test #4")
+        logger.critical("Ring Buffer test #5")
+
+        assert logger.getLoggerInfo()["stats"]["log_size"] == 3
+        assert [log["type"] for log in logger.getAllLogs()] == ["warning", "error", "critical"]
+        logger.close()
+
+    def test_log_records(self, tmp_path):
+        logger = Logger("Log Record Test Logger", str(tmp_path / "records.log"), loglevel=5, memory=True, mode="overwrite")
+        logger.error("Log Record test")
+
+        log = logger.latest_log
+        assert set(log.keys()) == {"timestamp", "type", "msg", "caller", "created"}
+        assert dict(log) == dict(logger.getAllLogs()[-1])
+        assert log["type"] == "error"
+        assert log["caller"] == "test_log_records"
+        assert log.get("missing") is None
+        assert not hasattr(log, "__dict__")
+
+    def test_compiled_log_format(self, tmp_path):
+        logger = Logger("Log Format Test Logger", str(tmp_path / "format.log"), session_id="ABCD1234", timestamp="%Y")
+        logger.warning("Log Format test")
+        log = logger.latest_log
+        assert logger._format_log(log) == f":WARNING: [ABCD1234] ({time.strftime('%Y')}) test_compiled_log_format() | Log Format test\n"
+
+        logger.log_format = "{{{type:<8}}} {session_id!r} {caller:>30} {message}"
+        assert logger._format_log(log) == "{WARNING } 'ABCD1234'     test_compiled_log_format() Log Format test\n"
+
+        logger.log_format = "{message}"
+        assert logger._format_log(log) == "Log Format test\n"
+
+        with pytest.raises(ValueError):
+            logger.log_format = "{message} {unknown}"
+
+        logger.close()
+
+    def test_cached_timestamps(self, tmp_path):
+        logger = Logger("Timestamp Test Logger", str(tmp_path / "timestamp.log"), timestamp="%Y-%m-%d %H:%M:%S.%3f (%%f) %f")
+        logger.error("Timestamp test")
+        log = logger.latest_log
+        created = log["created"]
+        second, microseconds = divmod(round(created * 1000000), 1000000)
+        assert log["timestamp"] == "{0}.{1:03d} (%f) {2:06d}".format(
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second)),
+            microseconds // 1000,
+            microseconds
+        )
+
+        logger.timestamp_format = None
+        assert log["timestamp"] == time.asctime(time.localtime(created))
+        logger.close()
+
+        timestamper = Timestamper("%S.%3f")
+        for milliseconds in range(1000):
+            assert timestamper(1600000000 + milliseconds / 1000) == "40.{0:03d}".format(milliseconds)
+
+        assert timestamper(1600000000.9999) == "41.000"
+
+    def test_caller_capture(self, tmp_path):
+        logger = Logger("Caller Capture Test Logger", str(tmp_path / "caller.log"), log_format="{type} {message}")
+        logger.error("Caller Capture test")
+        assert logger.latest_log["caller"] is None
+
+        logger.log_format = "{module}:{lineno} {caller} {message}"
+        logger.error("Caller Capture test"); lineno = sys._getframe().f_lineno  # noqa: E702
+        log = logger.latest_log
+        assert (log["caller"], log["module"], log["lineno"], log["filename"]) == ("test_caller_capture", __name__, lineno, __file__)
+        assert logger._format_log(log) == f"{__name__}:{lineno} test_caller_capture() Caller Capture test\n"
+
+        logger.caller = "name"
+        logger.error("Caller Capture test")
+        assert logger.latest_log["caller"] == "test_caller_capture"
+        assert "lineno" not in logger.latest_log
+
+        # A caller that is not captured is rendered as an empty string.
+        logger.caller = "none"
+        logger.log_format = "[{caller}] [{caller:>8}] {message}"
+        logger.error("Caller Capture test")
+        assert logger._format_log(logger.latest_log) == "[] [        ] Caller Capture test\n"
+        logger.close()
+
+    def test_deferred_messages(self, tmp_path):
+        logger = Logger("Deferred Message Test Logger", str(tmp_path / "deferred.log"), loglevel=3)
+        assert logger.isEnabledFor("error") and logger.isEnabledFor(3)
+        assert not logger.isEnabledFor("debug") and not logger.isEnabledFor(4)
+        for level in ("bogus", 0, 6, None):
+            with pytest.raises(ValueError):
+                logger.isEnabledFor(level)
+
+        def expensive():
+            raise AssertionError("A filtered log must not build its message.")
+
+        logger.debug(expensive)
+        logger.info("{0}", expensive)
+        assert logger.latest_log is None
+
+        logger.warning("Deferred Message test #{0} ({1!r})", 1, "args")
+        assert logger.latest_log["msg"] == "Deferred Message test #1 ('args')"
+        logger.error(lambda n: f"Deferred Message test #{n}", 2)
+        assert logger.latest_log["msg"] == "Deferred Message test #2"
+        logger.error("Deferred Message test #%d (%s)", 3, "printf")
+        assert logger.latest_log["msg"] == "Deferred Message test #3 (printf)"
+        with pytest.raises(TypeError):
+            logger.error("Deferred Message test without fields", 4)
+
+        logger.critical("Literal {braces} without args")
+        assert logger.latest_log["msg"] == "Literal {braces} without args"
+        logger.close()
+
+    def test_runtime_loglevel(self, tmp_path):
+        logger = Logger("Log Level Test Logger", str(tmp_path / "loglevel.log"), loglevel=2)
+        logger.warning("Log Level test #1")
+        assert logger.latest_log is None
+        assert logger.debug is logger.info is logger.warning
+
+        logger.loglevel = 5
+        logger.debug("Log Level test #2")
+        assert logger.latest_log["msg"] == "Log Level test #2"
+
+        logger.loglevel = 1
+        logger.error("Log Level test #3")
+        assert logger.latest_log["msg"] == "Log Level test #2"
+        assert logger.getLoggerInfo()["loglevel"] == 1
+
+        with pytest.raises(ValueError):
+            logger.loglevel = 6
+
+        logger.close()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+    def test_multiprocess_logging(self, tmp_path):
+        logfile = str(tmp_path / "shared.log")
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_shared_logfile_worker, args=(logfile, worker)) for worker in range(4)]
+        for process in workers:
+            process.start()
+
+        for process in workers:
+            process.join()
+            assert process.exitcode == 0
+
+        lines = []
+        for name in os.listdir(str(tmp_path)):
+            if name != "shared.log.lock":
+                with open(str(tmp_path / name), 'r') as f:
+                    lines.extend(f.readlines())
+
+                assert os.path.getsize(str(tmp_path / name)) <= 8192
+
+        assert len(lines) == 2000
+        for worker in range(4):
+            assert sum(f"| Worker #{worker} Logging test #" in line for line in lines) == 500
+
+    @pytest.mark.skipif(not hasattr(__import__("socket"), "AF_UNIX"), reason="requires Unix domain sockets")
+    def test_collector(self, tmp_path):
+        socket_path = str(tmp_path / "collector.sock")
+        logfile = str(tmp_path / "collected.log")
+        collector = Collector(socket_path, logfile, log_format="{session_id} {type} {caller} {message}")
+        server = threading.Thread(target=collector.serveForever, kwargs={"stream": None})
+        server.start()
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+
+        clients = [Logger(f"Client #{i}", "unused.log", session_id=f"CLIENT{i}", collector=socket_path, buffer_size=256) for i in range(2)]
+        for i in range(1, 101):
+            for client in clients:
+                client.error("Collector test #{0}", i)
+
+        for client in clients:
+            client.close()
+
+        while sum(stats["records"] for stats in collector.getStats()) < 200:
+            time.sleep(0.01)
+
+        collector.shutdown()
+        server.join()
+        assert not os.path.exists("unused.log")
+        assert sorted((stats["session_id"], stats["records"], stats["errors"]) for stats in collector.getStats()) == [("CLIENT0", 100, 0), ("CLIENT1", 100, 0)]
+        with open(logfile, 'r') as f:
+            lines = f.readlines()
+
+        assert len(lines) == 200
+        assert "CLIENT1 ERROR test_collector() Collector test #100\n" in lines
+
+    def test_collector_unavailable(self, tmp_path):
+        socket_path = str(tmp_path / "collector.sock")
+        logfile = str(tmp_path / "collected.log")
+        client = Logger("Client", "unused.log", collector=socket_path, buffer_size=256)
+        for i in range(1, 11):
+            client.error("Unavailable Collector test #{0}", i)  # Kept in the buffer instead of raising.
+
+        stats = client.getLoggerInfo()["stats"]
+        assert stats["write_errors"] >= 1 and stats["dropped_bytes"] == 0
+        with pytest.raises(OSError):
+            client.flush()
+
+        collector = Collector(socket_path, logfile, log_format="{message}")
+        server = threading.Thread(target=collector.serveForever, kwargs={"stream": None})
+        server.start()
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+
+        client.flush()
+        client.close()
+        while sum(stats["records"] for stats in collector.getStats()) < 10:
+            time.sleep(0.01)
+
+        collector.shutdown()
+        server.join()
+        with open(logfile, 'r') as f:
+            assert f.readlines() == [f"Unavailable Collector test #{i}\n" for i in range(1, 11)]
+
+        client = Logger("Client", "unused.log", collector=socket_path)
+        client.warning("Unavailable Collector test #11")
+        with pytest.raises(OSError):
+            client.close()
+
+        assert client.getLoggerInfo()["stats"]["dropped_bytes"] > 0
+
+    def test_log_many(self, tmp_path):
+        logfile = str(tmp_path / "bulk.log")
+        logger = Logger("Bulk Logging Test Logger", logfile, loglevel=4, buffer_size=0)
+        stored = logger.log_many([("info", "Bulk Logging test #{0}", i) for i in range(1, 101)] + [(5, "Filtered out"), (2, lambda: "Bulk Logging test #101")])
+        assert stored == 101
+        assert logger.getLoggerInfo()["stats"]["log_size"] == 101
+        assert logger.latest_log["msg"] == "Bulk Logging test #101"
+        assert logger.latest_log["caller"] == "test_log_many"
+
+        copy = Logger("Bulk Logging Copy Test Logger", str(tmp_path / "copy.log"), loglevel=5)
+        assert copy.log_many(logger.getAllLogs()) == 101
+        assert [dict(log) for log in copy.getAllLogs()] == [dict(log) for log in logger.getAllLogs()]
+
+        with open(logfile, 'r') as f:
+            lines = f.readlines()
+
+        assert len(lines) == 101
+        assert lines[0].endswith("test_log_many() | Bulk Logging test #1\n")
+
+        with pytest.raises(ValueError):
+            logger.log_many([("verbose", "Unknown level")])
+
+        logger.close()
+        copy.close()
+
+    def test_structured_output(self, tmp_path):
+        from simplelogger.reader import readLogs
+
+        for output_format in ("jsonl", "binary"):
+            logfile = str(tmp_path / f"structured.{output_format}")
+            logger = Logger("Test Logger (Structured Output)", logfile, loglevel=5, output_format=output_format, caller="full")
+            logger.info("Structured {0} #{1}", output_format, 1)
+            logger.debug('Quotes " and braces {} and ünïcödé')
+            logger.warning("Structured extra fields", extra={"job": 42, "tags": ["a", "b"]})
+            assert logger.getAllLogs()[-1]["extra"] == {"job": 42, "tags": ["a", "b"]} and "extra" not in logger.getAllLogs()[0]
+            logger.close()
+
+            logs = list(readLogs(logfile))
+            assert [log["msg"] for log in logs] == [f"Structured {output_format} #1", 'Quotes " and braces {} and ünïcödé', "Structured extra fields"]
+            assert [log["level"] for log in logs] == [4, 5, 3]
+            assert logs[2]["extra"] == {"job": 42, "tags": ["a", "b"]} and logs[2]["lineno"] > 0 and "extra" not in logs[0]
+            assert logs[0]["session_id"] == logger.getLoggerInfo()["session_id"]
+            assert logs[0]["caller"] == "test_structured_output"
+            assert logs[0]["module"] == __name__ and logs[0]["lineno"] > 0
+            assert abs(logs[0]["created"] - time.time()) < 60
+
+        with pytest.raises(ValueError):
+            Logger("Test Logger (Structured Output)", str(tmp_path / "invalid.log"), output_format="xml")
+
+    def test_segment_compression(self, tmp_path):
+        from simplelogger.reader import readLogs
+
+        for compression, suffix in (("gzip", ".gz"), ("lzma", ".xz"), ("bz2", ".bz2")):
+            logfile = str(tmp_path / f"compressed_{compression}.log")
+            logger = Logger(
+                "Test Logger (Compression)", logfile, output_format="jsonl", max_logfile_sz=2048 / 1024 / 1024,
+                backup_count=3, compression=compression, buffer_size=0
+            )
+            for i in range(1, 201):
+                logger.error("Compression test #{0}", i)
+
+            logger.close()
+            segments = sorted(os.listdir(tmp_path))
+            segments = [segment for segment in segments if segment.startswith(f"compressed_{compression}.log.")]
+            assert segments == [f"compressed_{compression}.log.{i}{suffix}" for i in (1, 2, 3)]
+
+            # The segments hold the logs right before the logfile, newest segment first.
+            msgs = []
+            for segment in (f"{logfile}.3{suffix}", f"{logfile}.2{suffix}", f"{logfile}.1{suffix}", logfile):
+                msgs.extend(log["msg"] for log in readLogs(segment))
+
+            assert msgs[-1] == "Compression test #200"
+            assert msgs == [f"Compression test #{i}" for i in range(201 - len(msgs), 201)]
+
+        sink = FileSink(str(tmp_path / "unclosed.log"), 0, max_bytes=1024, compression="gzip")
+        for i in range(1, 101):
+            sink.write(f"Unclosed Compression test #{i}\n")
+
+        sink.wait()
+        assert not any(thread.name == "simplelogger-compressor" for thread in threading.enumerate())
+        unclosed = weakref.ref(sink)
+        del sink
+        gc.collect()
+        assert unclosed() is None
+        assert os.path.exists(str(tmp_path / "unclosed.log.1.gz"))
+
+        logfile = str(tmp_path / "retention.log")
+        logger = Logger("Test Logger (Retention)", logfile, max_logfile_sz=1024 / 1024 / 1024, backup_count=100, max_backup_sz=4096 / 1024 / 1024, rotation="timestamp", buffer_size=0)
+        for i in range(1, 501):
+            logger.error("Retention test #{0}", i)
+
+        logger.close()
+        segments = [str(tmp_path / segment) for segment in os.listdir(tmp_path) if segment.startswith("retention.log.")]
+        assert 0 < sum(map(os.path.getsize, segments)) <= 4096
+
+    def test_logfile_index(self, tmp_path, monkeypatch):
+        from simplelogger import index
+        from simplelogger.index import findBlocks
+        from simplelogger.index import queryLogs
+
+        logfile = str(tmp_path / "indexed.log")
+        for session_id in ("AAAA1111", "BBBB2222"):
+            logger = Logger("Test Logger (Index)", logfile, output_format="jsonl", index=True, session_id=session_id, loglevel=5, buffer_size=1024)
+            for i in range(1, 1001):
+                logger.info("Index test #{0}", i)
+                if i % 100 == 0:
+                    logger.error("Index error #{0}", i)
+
+            logger.close()
+
+        errors = list(queryLogs(logfile, "error", session_id="BBBB2222"))
+        assert [log["msg"] for log in errors] == [f"Index error #{i}" for i in range(100, 1001, 100)]
+        assert all(log["session_id"] == "BBBB2222" for log in errors)
+        assert len(list(queryLogs(logfile, "error", since=time.time() - 3600))) == 20
+        assert list(queryLogs(logfile, "error", until=time.time() - 3600)) == []
+
+        # Only the blocks that can hold errors of the session are read.
+        assert sum(length for _, length in findBlocks(logfile, 2, "BBBB2222")) < os.path.getsize(logfile) / 4
+
+        # Regions are read a line or a window at a time, and adjacent blocks are only merged up to MAX_REGION bytes.
+        monkeypatch.setattr(index, "MAX_REGION", 4096)
+        monkeypatch.setattr(index, "READ_SIZE", 64)
+        assert all(length <= 4096 for _, length in findBlocks(logfile)) and len(findBlocks(logfile)) > 1
+        assert len(list(queryLogs(logfile))) == 2020
+
+        binaryfile = str(tmp_path / "unindexed.bin")
+        logger = Logger("Test Logger (Binary Query)", binaryfile, output_format="binary", loglevel=5)
+        logger.info("Binary query test #1")
+        logger.error("Binary query error " + "x" * 1000)
+        logger.info("Binary query test #2")
+        logger.close()
+        assert [log["msg"] for log in queryLogs(binaryfile)] == ["Binary query test #1", "Binary query error " + "x" * 1000, "Binary query test #2"]
+        assert [log["level"] for log in queryLogs(binaryfile, "error")] == [2]
+        monkeypatch.undo()
+
+        # Lines in the `text` output format are filtered by their {type} and {session_id}.
+        textfile = str(tmp_path / "indexed_text.log")
+        logger = Logger("Test Logger (Text Index)", textfile, index=True, session_id="CCCC3333", loglevel=5)
+        for i in range(1, 201):
+            logger.info("Text index test #{0}", i)
+
+        logger.error("Text index error\nwith a second line")
+        logger.close()
+        lines = list(queryLogs(textfile, "error"))
+        assert len(lines) == 2 and lines[0].startswith(":ERROR: [CCCC3333]") and lines[1] == "with a second line\n"
+        assert list(queryLogs(textfile, "error", session_id="DDDD4444")) == []
+        assert list(queryLogs(textfile, "error", since=time.time() - 3600)) == lines
+        assert list(queryLogs(textfile, "error", until=time.time() - 3600)) == []
+        # Without a {timestamp}, the index still filters whole blocks by time.
+        assert len(list(queryLogs(textfile, "error", since=time.time() - 3600, log_format=":{type}: [{session_id}] {message}"))) == 2
+        assert list(queryLogs(textfile, "error", until=time.time() - 3600, log_format=":{type}: [{session_id}] {message}")) == []
+
+    def test_query_command(self, tmp_path, capsys):
+        from simplelogger.__main__ import main
+
+        logfile = str(tmp_path / "default.log")
+        logger = Logger("Test Logger (Query Command)", logfile, session_id="ABCD1234", loglevel=5)
+        logger.info("Query command test")
+        logger.error("Query command error")
+        logger.close()
+        with open(logfile, 'a') as f:
+            f.write(":ERROR: [ABCD1234] ({0}) test_query_command() | Old query command error\n".format(time.asctime(time.localtime(time.time() - 7200))))
+
+        assert main(["query", logfile, "--level", "error", "--session", "ABCD1234", "--last", "3600"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 1 and lines[0].endswith("| Query command error")
+        assert main(["query", logfile, "--last", "3600", "--log-format", ":{type}: [{session_id}] {message}"]) == 1
+        assert "no {timestamp}" in capsys.readouterr().err
+
+        millisecond = str(tmp_path / "millisecond.log")
+        logger = Logger("Test Logger (Query Command)", millisecond, timestamp="%H:%M:%S.%3f %d/%m/%Y")
+        logger.error("Query command error")
+        created = logger.latest_log["created"]
+        logger.close()
+        assert main(["query", millisecond, "--since", str(created - 0.5), "--timestamp", "%H:%M:%S.%3f %d/%m/%Y"]) == 0
+        assert capsys.readouterr().out.endswith("| Query command error\n")
+        assert main(["query", millisecond, "--until", str(created - 0.5), "--timestamp", "%H:%M:%S.%3f %d/%m/%Y"]) == 0
+        assert capsys.readouterr().out == ""
+        assert main(["query", millisecond, "--since", "0"]) == 1
+        assert "does not match format" in capsys.readouterr().err
+
+    def test_query(self, tmp_path):
+        logger = Logger("Test Logger (Query)", str(tmp_path / "query.log"), loglevel=5, autoforget=True, logsize=500)
+        for i in range(1, 1001):
+            logger.info("Query test #{0}", i)
+            if i % 10 == 0:
+                logger.error("Query error #{0}", i)
+
+        errors = logger.query(loglevel="error", limit=5)
+        assert [log["msg"] for log in errors] == [f"Query error #{i}" for i in (1000, 990, 980, 970, 960)]
+        assert [log["msg"] for log in logger.query(level="error", limit=2, offset=1, newest_first=False)] == ["Query error #560", "Query error #570"]
+        assert len(logger.query(level=["info", "error"])) == 500
+        assert [log["msg"] for log in logger.query(level=4, contains="#99")] == ["Query test #999", "Query test #998", "Query test #997", "Query test #996", "Query test #995", "Query test #994", "Query test #993", "Query test #992", "Query test #991", "Query test #990"]
+        assert logger.query(caller="test_query", until=time.time() - 3600) == []
+        assert logger.query(loglevel=1) == []
+        logger.close()
+
+    def test_follow(self, tmp_path, monkeypatch):
+        from simplelogger.reader import follow
+
+        logfile = str(tmp_path / "followed.log")
+        logger = Logger("Test Logger (Follow)", logfile, output_format="binary", buffer_size=0, max_logfile_sz=4096 / 1024 / 1024, backup_count=5)
+        logger.error("Written before following")
+        followed = []
+
+        def reader():
+            for log in follow(logfile, timeout=1.0, max_interval=0.05):
+                followed.append(log["msg"])
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        time.sleep(0.2)
+        for i in range(1, 201):  # About 8 KiB; the logfile is rotated while it is followed.
+            logger.error("Follow test #{0}", i)
+            if i % 50 == 0:
+                time.sleep(0.1)
+
+        logger.close()
+        thread.join()
+        assert followed == [f"Follow test #{i}" for i in range(1, 201)]
+        assert os.path.exists(logfile + ".1")
+
+        # A truncated logfile is followed from its start again.
+        with open(logfile, 'w') as f:
+            f.write("first line\n")
+
+        lines = follow(logfile, 0, timeout=1.0, max_interval=0.05)
+        assert next(lines) == "first line\n"
+        with open(logfile, 'w') as f:
+            f.write("truncated\n")  # Shorter than what was read; a longer rewrite between two polls looks like an append.
+
+        assert next(lines) == "truncated\n"
+        lines.close()
+
+        # What is written to the old file between the last read and the rotation check is not lost.
+        with open(logfile, 'w') as f:
+            f.write("old\n")
+
+        lines = follow(logfile, 0, timeout=1.0, max_interval=0.05)
+        assert next(lines) == "old\n"
+        stat = os.stat
+
+        def rotate(path, *args, **kwargs):
+            monkeypatch.setattr(os, "stat", stat)
+            with open(logfile, 'a') as f:
+                f.write("late\nunfinished")
+
+            os.replace(logfile, logfile + ".old")
+            with open(logfile, 'w') as f:
+                f.write("new\n")
+
+            return stat(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, "stat", rotate)  # Called by follow() once the old file reads empty.
+        assert [next(lines), next(lines), next(lines)] == ["late\n", "unfinished", "new\n"]
+        lines.close()
+
+    def test_benchmarks(self):
+        from simplelogger import bench
+
+        results = bench.benchLogger(200, ["append", "filtered"], message_sizes=(16,), thread_counts=(1, 2))
+        assert set(results) == {"append/msg=16/threads=1", "append/msg=16/threads=2", "filtered/msg=16/threads=1", "filtered/msg=16/threads=2"}
+        assert all(result["calls_per_sec"] > 0 and 0 < result["p50_us"] <= result["p99_us"] for result in results.values())
+
+        baseline = {"logger": {name: dict(result, calls_per_sec=result["calls_per_sec"] * 10) for name, result in results.items()}}
+        assert len(bench.compare({"logger": results}, baseline)) == 4
+        assert bench.compare({"logger": results}, {"logger": results}) == []
+
+    def test_metrics(self, tmp_path):
+        logger = Logger("Test Logger (Metrics)", str(tmp_path / "metrics.log"), loglevel=3, metrics=True, buffer_size=1024, max_logfile_sz=4096 / 1024 / 1024)
+        for i in range(1, 201):
+            logger.warning("Metrics test #{0}", i)
+            logger.debug("Filtered #{0}", i)
+
+        logger.log_many([(2, "Batch error"), (4, "Filtered info")])
+        metrics = logger.getMetrics()
+        assert metrics["emitted"] == {"critical": 0, "error": 1, "warning": 200, "info": 0, "debug": 0}
+        assert metrics["filtered"] == {"critical": 0, "error": 0, "warning": 0, "info": 1, "debug": 200}
+        assert metrics["latency_us"]["format"]["count"] == 201
+        assert metrics["latency_us"]["write"]["count"] == 201
+        assert 0 < metrics["latency_us"]["format"]["p50"] <= metrics["latency_us"]["format"]["p99"] <= metrics["latency_us"]["format"]["max"]
+        assert metrics["flushes"] > 0 and metrics["rotations"] > 0 and metrics["bytes_written"] > 4096
+        assert logger.getLoggerInfo()["stats"]["metrics"]["emitted"]["warning"] == 200
+
+        assert logger.resetMetrics()["emitted"]["warning"] == 200
+        metrics = logger.getMetrics()
+        assert metrics["emitted"]["warning"] == 0 and metrics["bytes_written"] == 0 and metrics["latency_us"]["write"]["count"] == 0
+        for i in range(10):
+            logger.debug("Metrics test #{0}", i)  # Still counted by the stub installed before the reset.
+
+        assert logger.getMetrics()["filtered"]["debug"] == 10
+        logger.close()
+
+        with pytest.raises(PermissionError):
+            Logger("Test Logger (No Metrics)", str(tmp_path / "no_metrics.log")).getMetrics()
+
+    def test_rate_limiting(self, tmp_path):
+        logger = Logger("Test Logger (Rate Limit)", str(tmp_path / "limited.log"), loglevel=5, rate_limit=1, rate_burst=5, summary_interval=0.1, sample_rates={"debug": 0})
+
+        def handler():
+            for i in range(1, 106):
+                logger.warning("Rate limit test #{0}", i)
+
+        handler()
+        for i in range(1, 11):
+            logger.info("Another call site #{0}", i)  # Limited separately from handler().
+            logger.debug("Sampled out #{0}", i)
+
+        time.sleep(0.15)
+        handler()  # Still throttled, but the summary is due.
+        msgs = [log["msg"] for log in logger.getAllLogs()]
+        assert msgs[:5] == [f"Rate limit test #{i}" for i in range(1, 6)]
+        assert msgs[5:10] == [f"Another call site #{i}" for i in range(1, 6)]
+        assert msgs[10:] == ["Suppressed 101 records from handler()"]  # Then the other 104 calls are suppressed too.
+        assert logger.latest_log["caller"] == "handler"
+
+        stats = logger.getLoggerInfo()["stats"]
+        assert stats["suppressed_logs"] == 210 and stats["sampled_out_logs"] == 10
+        logger.close()
+        assert [log["msg"] for log in logger.getAllLogs()[-2:]] == ["Suppressed 104 records from handler()", "Suppressed 5 records from test_rate_limiting()"]
+
+    def test_coalescing(self, tmp_path):
+        logfile = tmp_path / "coalesced.log"
+        logger = Logger("Test Logger (Coalesce)", str(logfile), loglevel=5, coalesce=60, log_format="{type} {caller} | {message}")
+
+        def retry():
+            for _ in range(5000):
+                logger.error("Connection refused")
+
+        retry()
+        assert logger.latest_log["count"] == 5000 and logger.latest_log["last_created"] >= logger.latest_log["created"]
+        logger.error("Connection refused")  # Identical, but from another function.
+        retry()
+        logger.info("Connected")
+        logs = logger.getAllLogs()
+        assert [(log["msg"], log["caller"], log.count) for log in logs] == [
+            ("Connection refused", "retry", 5000),
+            ("Connection refused", "test_coalescing", 1),
+            ("Connection refused", "retry", 5000),
+            ("Connected", "test_coalescing", 1)
+        ]
+        assert "count" in logs[0] and "count" not in logs[1]
+        logger.close()
+        assert logfile.read_text().splitlines() == [
+            "ERROR retry() | Connection refused",
+            "ERROR retry() | Last message repeated 4,999 times",
+            "ERROR test_coalescing() | Connection refused",
+            "ERROR retry() | Connection refused",
+            "ERROR retry() | Last message repeated 4,999 times",
+            "INFO test_coalescing() | Connected"
+        ]
+
+    def test_idle_coalescing(self, tmp_path):
+        logfile = tmp_path / "idle_coalesced.log"
+        logger = Logger("Test Logger (Idle Coalesce)", str(logfile), coalesce=0.2, flush_interval=0.1, log_format="{type} {caller} | {message}")
+        for _ in range(3):
+            logger.error("Connection refused")
+
+        time.sleep(0.6)  # No more logs are made; the summary is written once the window is over.
+        assert logfile.read_text().splitlines() == [
+            "ERROR test_idle_coalescing() | Connection refused",
+            "ERROR test_idle_coalescing() | Last message repeated 2 times"
+        ]
+        logger.error("Connection refused")
+        logger.close()
+        assert logfile.read_text().splitlines()[2:] == ["ERROR test_idle_coalescing() | Connection refused"]
+
+    def test_memory_spill(self, tmp_path):
+        logfile = tmp_path / "spilled.log"
+        logger = Logger("Test Logger (Spill)", str(logfile), mode="overwrite", memory=True, loglevel=5, spill_logsize=100, log_format="{message}")
+        for i in range(1000):
+            logger.info("Spill test #{0}", i)
+
+        assert 50 <= len(logger.getAllLogs()) <= 100
+        assert logger.getAllLogs()[-1]["msg"] == "Spill test #999" and logger.latest_log["msg"] == "Spill test #999"
+        stats = logger.getLoggerInfo()["stats"]
+        assert stats["spilled_logs"] + stats["log_size"] == 1000 and stats["spill_size"] > 0
+
+        logger.dumpLogs()
+        logger.dumpLogs()  # The logfile is overwritten, not appended to.
+        assert logfile.read_text().splitlines() == [f"Spill test #{i}" for i in range(1000)]
+
+        logger.flushLogs()
+        assert logger.getLoggerInfo()["stats"]["spilled_logs"] == 0
+        sized = Logger("Test Logger (Spill Size)", str(tmp_path / "sized.log"), mode="overwrite", memory=True, spill_sz=0.01)
+        sized.warning("x" * 1000)
+        for _ in range(100):
+            sized.warning("x" * 1000)
+
+        assert sized.getLoggerInfo()["stats"]["spilled_logs"] > 0
+        logger.close()
+        sized.close()
+
+    def test_console_output(self, tmp_path, capsys):
+        logger = Logger("Test Logger (Console)", str(tmp_path / "console.log"), loglevel=5, show_output=True, console_flush="interval", flush_interval=0.1)
+        logger.info("Console test")
+        logger.debug("Console debug test")
+        logger.warning("Console warning test")
+        logger.critical("Console critical test")
+        assert capsys.readouterr() == ("", "")  # Buffered, as the output is not a terminal.
+
+        time.sleep(0.5)  # Written out by the flusher thread once `flush_interval` passes.
+        out, err = capsys.readouterr()
+        assert out == "[i] Console test\n[DEBUG] test_console_output(): Console debug test\n"  # No colors either.
+        assert err == "[!] Console warning test\n[CRITICAL] Console critical test\n"
+
+        lined = Logger("Test Logger (Console Lines)", str(tmp_path / "console.log"), show_output=True, console_flush="line")
+        lined.error("Console error test")
+        assert capsys.readouterr().err == "[E] Console error test\n"
+        logger.close()
+        lined.close()
+
+    def test_concurrent_logging(self, tmp_path):
+        logger = Logger("Test Logger (Threads)", str(tmp_path / "threads.log"), mode="overwrite", memory=True, loglevel=5)
+
+        def worker():
+            for _ in range(5000):
+                logger.info("I")
+                logger.error("E")
+
+        workers = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in workers:
+            thread.start()
+
+        for thread in workers:
+            thread.join()
+
+        logs = logger.getAllLogs()
+        assert len(logs) == 80000
+        assert all(log["msg"] == ("I" if log["type"] == "info" else "E") for log in logs)
+        logger.close()
+
+    def test_concurrent_query(self, tmp_path):
+        logger = Logger("Test Logger (Query Threads)", str(tmp_path / "query_threads.log"), autoforget=True, logsize=1000, loglevel=5)
+        running = True
+
+        def worker():
+            while running:
+                logger.info("I")
+                logger.error("E")
+
+        workers = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in workers:
+            thread.start()
+
+        try:
+            while len(logger.getAllLogs()) < 1000:
+                time.sleep(0.001)
+
+            for _ in range(50):
+                errors = logger.query(level="error")
+                assert all(log["type"] == "error" and log["msg"] == "E" for log in errors)
+                assert len(logger.query()) == 1000  # No log is missing or returned twice.
+
+        finally:
+            running = False
+            for thread in workers:
+                thread.join()
+
+        logger.close()
+
+    def test_idle_flush(self, tmp_path):
+        logfile = tmp_path / "idle.log"
+        logger = Logger("Test Logger (Idle)", str(logfile), loglevel=5, flush_interval=0.1, log_format="{message}")
+        logger.info("Idle test")
+        assert not logfile.exists() or logfile.read_text() == ""  # Still buffered.
+
+        time.sleep(0.5)  # Nothing else is logged; the flusher thread writes the buffer out.
+        assert logfile.read_text() == "Idle test\n"
+
+        logger.debug("Buffered test")
+        logger.error("Error test")  # Written out right away, with the logs before it.
+        assert logfile.read_text() == "Idle test\nBuffered test\nError test\n"
+        logger.close()
@@ -22,13 +22,201 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import os
 import sys
+import json
+import time
+import signal
+import argparse
 
 from . import info
+from .formatting import DEFAULT_LOG_FORMAT
+
+
+def collect(args) -> int:
+    """
+    Run a collector until it is interrupted.
+
+    :returns int: The exit code.
+    """
+
+    from .collector import Collector
+
+    collector = Collector(
+        args.socket,
+        args.logfile,
+        log_format=args.log_format,
+        output_format=args.output_format,
+        timestamp=args.timestamp,
+        max_logfile_sz=args.max_logfile_sz,
+        backup_count=args.backup_count,
+        rotation=args.rotation,
+        compression=args.compression,
+        max_backup_sz=args.max_backup_sz,
+        index=args.index
+    )
+    signal.signal(signal.SIGTERM, lambda signum, frame: collector.shutdown())
+    try:
+        collector.serveForever(args.stats_interval)
+
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def query(args) -> int:
+    """
+    Print the logs of a logfile that match a query.
+
+    :returns int: The exit code.
+    """
+
+    from .index import queryLogs
+
+    since = args.since
+    if args.last is not None:
+        since = time.time() - args.last if since is None else max(since, time.time() - args.last)
+
+    loglevel = int(args.level) if args.level.isdigit() else args.level.lower()
+    try:
+        for log in queryLogs(args.logfile, loglevel, args.session, since, args.until, log_format=args.log_format, timestamp_format=args.timestamp):
+            sys.stdout.write(log if type(log) is str else json.dumps(log, ensure_ascii=False) + '\n')
+
+    except BrokenPipeError:
+        # e.g. piped to `head`. Python would report the pipe again when it flushes stdout at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+    except (OSError, ValueError) as e:
+        print("Error: {0}".format(e), file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def tail(args) -> int:
+    """
+    Print the logs appended to a logfile until it is interrupted.
+
+    :returns int: The exit code.
+    """
+
+    from .reader import follow
+
+    offset = 0 if args.from_start else args.offset
+    try:
+        for log in follow(args.logfile, offset, max_interval=args.max_interval):
+            sys.stdout.write(log if type(log) is str else json.dumps(log, ensure_ascii=False) + '\n')
+            sys.stdout.flush()
+
+    except ValueError as e:
+        print("Error: {0}".format(e), file=sys.stderr)
+        return 1
+
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+    return 0
+
+
+def bench(args) -> int:
+    """
+    Run the benchmarks, and compare them with a baseline.
+
+    :returns int: The exit code; 1 if a measurement regressed.
+    """
+
+    from . import bench as benchmarks
+
+    results = benchmarks.runAll(args.count, args.scenario)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=4)
+        sys.stdout.write('\n')
+
+    else:
+        benchmarks.report(results)
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as f:
+            regressions = benchmarks.compare(results, json.load(f), args.tolerance)
+
+        for regression in regressions:
+            print("Regression: {0}".format(regression), file=sys.stderr)
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+def main(argv: list = None) -> int:
+    """
+    The command-line interface of the package.
+
+    argv: list, The command-line arguments. (Default: `sys.argv[1:]`)
+
+    :returns int: The exit code.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m simplelogger", description=info.title)
+    commands = parser.add_subparsers(dest="command")
+
+    parser_collect = commands.add_parser("collect", help="Write the logs sent by Logger(collector=...) objects to one logfile.")
+    parser_collect.add_argument("--socket", required=True, help="The path of the Unix domain socket to listen on.")
+    parser_collect.add_argument("--logfile", required=True, help="The path where to write the logs.")
+    parser_collect.add_argument("--log-format", default=DEFAULT_LOG_FORMAT, help="The format of the logs.")
+    parser_collect.add_argument("--output-format", choices=("text", "jsonl", "binary"), default="text", help="How the logs are written.")
+    parser_collect.add_argument("--timestamp", default=None, help="A strftime-compatible format of the timestamps.")
+    parser_collect.add_argument("--max-logfile-sz", type=float, default=10.0, help="The maximum size of the logfile in MB before it is rotated.")
+    parser_collect.add_argument("--backup-count", type=int, default=1, help="The number of rotated logfiles to keep.")
+    parser_collect.add_argument("--rotation", choices=("numbered", "timestamp"), default="numbered", help="How rotated logfiles are named.")
+    parser_collect.add_argument("--compression", choices=("gzip", "lzma", "bz2"), default=None, help="Compress rotated logfiles.")
+    parser_collect.add_argument("--max-backup-sz", type=float, default=None, help="The maximum size of all rotated logfiles together in MB.")
+    parser_collect.add_argument("--index", action="store_true", help="Write a sidecar index of the logfile.")
+    parser_collect.add_argument("--stats-interval", type=float, default=None, help="Report the counters of each client every N seconds.")
+    parser_collect.set_defaults(function=collect)
+
+    parser_query = commands.add_parser("query", help="Print the logs of a logfile that match a query, using its index if it has one.")
+    parser_query.add_argument("logfile", help="The path of the logfile.")
+    parser_query.add_argument("--level", default="debug", help="The lowest level to print, as a name or code. (e.g. `error` for errors and critical errors)")
+    parser_query.add_argument("--session", default=None, help="Only print the logs of this Session ID.")
+    parser_query.add_argument("--since", type=float, default=None, help="Only print the logs made at or after this epoch time.")
+    parser_query.add_argument("--until", type=float, default=None, help="Only print the logs made at or before this epoch time.")
+    parser_query.add_argument("--last", type=float, default=None, help="Only print the logs made in the last N seconds.")
+    parser_query.add_argument("--log-format", default=DEFAULT_LOG_FORMAT, help="The format of the lines of a logfile in the `text` output format.")
+    parser_query.add_argument("--timestamp", default=None, help="The strftime format of the timestamps of a logfile in the `text` output format. (Default: `time.asctime()`)")
+    parser_query.set_defaults(function=query)
+
+    parser_tail = commands.add_parser("tail", help="Print the logs appended to a logfile, following it across rotations.")
+    parser_tail.add_argument("logfile", help="The path of the logfile.")
+    parser_tail.add_argument("--offset", type=int, default=None, help="Start at this byte offset instead of at the end of the logfile.")
+    parser_tail.add_argument("--from-start", action="store_true", help="Start at the beginning of the logfile.")
+    parser_tail.add_argument("--max-interval", type=float, default=1.0, help="The longest wait in seconds between polls of an idle logfile.")
+    parser_tail.set_defaults(function=tail)
+
+    parser_bench = commands.add_parser("bench", help="Measure the throughput and latency of the logger in every mode.")
+    parser_bench.add_argument("--count", type=int, default=20000, help="The number of calls per measurement.")
+    parser_bench.add_argument("--scenario", action="append", choices=("append", "overwrite", "memory", "autoforget", "filtered", "show_output", "near_max_logfile_sz", "asynchronous", "metrics"), help="Only run this scenario. (Can be repeated.)")
+    parser_bench.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    parser_bench.add_argument("--output", default=None, help="Also save the results as JSON to this file.")
+    parser_bench.add_argument("--baseline", default=None, help="Compare with the JSON results of an earlier run, and exit with 1 on regressions.")
+    parser_bench.add_argument("--tolerance", type=float, default=0.2, help="How much slower than the baseline a measurement can be. (Default: 0.2; 20%%)")
+    parser_bench.set_defaults(function=bench)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        print(info.title)
+        print()
+        print("Name:   ", info.name)
+        print("Version:", '.'.join(map(str, info.version)))
+        return 0
+
+    return args.function(args)
+
 
 if __name__ == "__main__":
-    print(info.title)
-    print()
-    print("Name:   ", info.name)
-    print("Version:", '.'.join(map(str, info.version)))
-    sys.exit(0)
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+The benchmarks of the package. Run them with `python -m simplelogger bench`.
+
+`benchLogger()` measures the throughput and the per-call latency of the
+level methods in every mode of the logger, and the other functions measure
+the parts it is built from. The results can be saved as JSON and compared
+with a baseline to catch regressions.
+"""
+
+import os
+import sys
+import time
+import platform
+import tempfile
+import threading
+import contextlib
+
+from . import info
+from .logger import Logger
+from .records import LogRecord
+from .formatting import LogFormat
+from .formatting import Timestamper
+
+DEFAULT_FORMAT = ":{type}: [{session_id}] ({timestamp}) {caller} | {message}"
+MINIMAL_FORMAT = "{message}"
+
+# The Logger() arguments of each scenario of `benchLogger()`, and the level method it calls.
+SCENARIOS = {
+    "append": ({}, "warning"),
+    "overwrite": ({"mode": "overwrite"}, "warning"),
+    "memory": ({"mode": "overwrite", "memory": True}, "warning"),
+    "autoforget": ({"autoforget": True, "logsize": 1000}, "warning"),
+    "filtered": ({"loglevel": 3}, "debug"),
+    "show_output": ({"show_output": True}, "warning"),
+    "near_max_logfile_sz": ({"max_logfile_sz": 256 / 1024, "backup_count": 1}, "warning"),  # Rotated every few thousand logs.
+    "asynchronous": ({"asynchronous": True}, "warning"),
+    "metrics": ({"metrics": True}, "warning"),
+}
+MESSAGE_SIZES = (16, 256, 4096)
+THREAD_COUNTS = (1, 4)
+
+
+def _rate(function, count: int) -> float:
+    """
+    Call <function> <count> times.
+
+    :returns float: The number of calls per second.
+    """
+
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+
+    return count / (time.perf_counter() - start)
+
+
+def _percentile(values: list, percentile: float) -> float:
+    """
+    Return the <percentile> of the sorted <values>.
+
+    :returns float:
+    """
+
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+def benchLogger(count: int = 20000, scenarios=None, message_sizes=MESSAGE_SIZES, thread_counts=THREAD_COUNTS) -> dict:
+    """
+    Measure the calls per second and the per-call latency of the level methods in every scenario of `SCENARIOS`.
+    The calls are split evenly between the threads, and the console output of `show_output` is discarded.
+
+    count         : int,  The number of calls per measurement.
+    scenarios     : list, The names of the scenarios to run. (Default: None; all of them)
+    message_sizes : list, The lengths of the messages in characters.
+    thread_counts : list, The numbers of threads that log at the same time.
+
+    :returns dict: {"<scenario>/msg=<size>/threads=<threads>": {"calls_per_sec": float, "p50_us": float, "p99_us": float}}
+    """
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        for scenario in (SCENARIOS if scenarios is None else scenarios):
+            kwargs, method = SCENARIOS[scenario]
+            for size in message_sizes:
+                msg = ("Benchmark message " * (size // 18 + 1))[:size]
+                for threads in thread_counts:
+                    logfile = os.path.join(directory, "{0}-{1}-{2}.log".format(scenario, size, threads))
+                    with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+                        logger = Logger("Benchmark Logger", logfile, **kwargs)
+                        function = getattr(logger, method)
+                        latencies = []
+                        barrier = threading.Barrier(threads + 1)
+
+                        def worker():
+                            clock = time.perf_counter
+                            timings = []
+                            barrier.wait()
+                            for _ in range(count // threads):
+                                start = clock()
+                                function(msg)
+                                timings.append(clock() - start)
+
+                            latencies.extend(timings)
+
+                        workers = [threading.Thread(target=worker) for _ in range(threads)]
+                        for thread in workers:
+                            thread.start()
+
+                        barrier.wait()
+                        start = time.perf_counter()
+                        for thread in workers:
+                            thread.join()
+
+                        logger.close()  # Includes draining the writer thread in asynchronous mode.
+                        elapsed = time.perf_counter() - start
+
+                    latencies.sort()
+                    results["{0}/msg={1}/threads={2}".format(scenario, size, threads)] = {
+                        "calls_per_sec": len(latencies) / elapsed,
+                        "p50_us": _percentile(latencies, 50) * 1000000,
+                        "p99_us": _percentile(latencies, 99) * 1000000,
+                    }
+
+    return results
+
+
+def benchFormat(count: int = 200000) -> dict:
+    """
+    Compare the records per second of the old `str.format` based `_format_log()` with the compiled renderer.
+
+    count: int, The number of records to render per measurement.
+
+    :returns dict: {format: {"str.format": records/sec, "compiled": records/sec}}
+    """
+
+    results = {}
+    timestamper = Timestamper()
+    for log_format in (DEFAULT_FORMAT, MINIMAL_FORMAT):
+        record = LogRecord(4, time.time(), "Benchmark message", "benchFormat", timestamper)
+
+        def legacy():
+            # What `_format_log()` did for every record, including rendering the timestamp.
+            log = {"timestamp": time.asctime(), "type": "info", "msg": record.msg, "caller": record.caller}
+            return "{0}\n".format(log_format.format(
+                session_id="ABCD1234",
+                type=log["type"].upper(),
+                timestamp=log["timestamp"],
+                message=log["msg"],
+                caller=f"{log['caller']}()"
+            ))
+
+        render = LogFormat(log_format, "ABCD1234", timestamper).render
+        results[log_format] = {
+            "str.format": _rate(legacy, count),
+            "compiled": _rate(lambda: render(record), count)
+        }
+
+    return results
+
+
+def benchTimestamp(count: int = 200000) -> dict:
+    """
+    Compare the timestamps per second of `time.asctime()` and `time.strftime()` with the cached Timestamper.
+
+    count: int, The number of timestamps to render per measurement.
+
+    :returns dict: {format: {"uncached": timestamps/sec, "cached": timestamps/sec}}
+    """
+
+    results = {}
+    for timestamp_format in (None, "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%3f"):
+        timestamper = Timestamper(timestamp_format)
+        if timestamp_format is None:
+            uncached = time.asctime
+
+        elif "%3f" in timestamp_format:
+            def uncached():
+                now = time.time()
+                return time.strftime(timestamp_format.replace("%3f", "{0:03d}"), time.localtime(now)).format(int(now % 1 * 1000))
+
+        else:
+            uncached = lambda: time.strftime(timestamp_format)  # noqa: E731
+
+        results[str(timestamp_format)] = {
+            "uncached": _rate(uncached, count),
+            "cached": _rate(lambda: timestamper(time.time()), count)
+        }
+
+    return results
+
+
+def benchDisabled(count: int = 1000000) -> dict:
+    """
+    Compare the calls per second of a filtered-out `debug()` that runs the level check of the method with the no-op it is replaced with.
+
+    count: int, The number of calls per measurement.
+
+    :returns dict: {"level check": calls/sec, "no-op": calls/sec}
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        logger = Logger("Benchmark Logger", os.path.join(directory, "bench.log"), loglevel=3)
+        results = {"no-op": _rate(lambda: logger.debug("Benchmark message"), count)}
+        del logger.debug  # Fall back to the method of the class, which still checks the level.
+        results["level check"] = _rate(lambda: logger.debug("Benchmark message"), count)
+        logger.close()
+
+    return results
+
+
+def runAll(count: int = 20000, scenarios=None) -> dict:
+    """
+    Run every benchmark.
+
+    count     : int,  The number of calls per measurement of `benchLogger()`. The other benchmarks use ten times as many.
+    scenarios : list, The scenarios of `benchLogger()` to run. (Default: None; all of them)
+
+    :returns dict: The results, with the details of the environment under `meta`.
+    """
+
+    return {
+        "meta": {
+            "version": '.'.join(map(str, info.version)),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.time(),
+            "count": count,
+        },
+        "logger": benchLogger(count, scenarios),
+        "format": benchFormat(count * 10),
+        "timestamp": benchTimestamp(count * 10),
+        "disabled": benchDisabled(count * 50),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    """
+    Find the `benchLogger()` measurements of <results> that are slower than in <baseline>.
+
+    results   : dict,  The results of `runAll()`.
+    baseline  : dict,  The results of an earlier `runAll()`.
+    tolerance : float, How much slower a measurement can be before it is a regression. (0.2 is 20%)
+
+    :returns list: A description of each regression.
+    """
+
+    regressions = []
+    for name, result in results["logger"].items():
+        base = baseline.get("logger", {}).get(name)
+        if base is None:
+            continue
+
+        if result["calls_per_sec"] < base["calls_per_sec"] * (1 - tolerance):
+            regressions.append("{0}: {1:,.0f} calls/sec, baseline {2:,.0f}".format(name, result["calls_per_sec"], base["calls_per_sec"]))
+
+        if result["p50_us"] > base["p50_us"] * (1 + tolerance):
+            regressions.append("{0}: p50 {1:.2f} us, baseline {2:.2f} us".format(name, result["p50_us"], base["p50_us"]))
+
+    return regressions
+
+
+def report(results: dict, stream=sys.stdout) -> None:
+    """
+    Print <results> as a table.
+
+    :returns void:
+    """
+
+    stream.write("{0:<44}{1:>14}{2:>12}{3:>12}\n".format("logger", "calls/sec", "p50 (us)", "p99 (us)"))
+    for name, result in results["logger"].items():
+        stream.write("{0:<44}{1:>14,.0f}{2:>12.2f}{3:>12.2f}\n".format(name, result["calls_per_sec"], result["p50_us"], result["p99_us"]))
+
+    for log_format, rates in results["format"].items():
+        stream.write("format {0!r}:\n".format(log_format))
+        for name, rate in rates.items():
+            stream.write("    {0:<12}{1:>12,.0f} records/sec\n".format(name, rate))
+
+    for timestamp_format, rates in results["timestamp"].items():
+        stream.write("timestamp {0}:\n".format(timestamp_format))
+        for name, rate in rates.items():
+            stream.write("    {0:<12}{1:>12,.0f} timestamps/sec\n".format(name, rate))
+
+    stream.write("disabled debug():\n")
+    for name, rate in results["disabled"].items():
+        stream.write("    {0:<12}{1:>12,.0f} calls/sec\n".format(name, rate))
+
+
+if __name__ == "__main__":
+    report(runAll())
@@ -0,0 +1,449 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+A collector process that writes the logs of many Logger() objects to one logfile.
+
+Clients connect to a Unix domain socket and send frames: a 4-byte big-endian
+length followed by a UTF-8 JSON payload. The first frame is a hello object
+(`name`, `session_id`, `logfile`); every following frame is a batch, a list of
+`[level, created, caller, msg]` records with an optional `[module, filename, lineno]`.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import selectors
+
+from .sinks import FileSink
+from .records import LogRecord
+from .formatting import LogFormat
+from .formatting import Timestamper
+from .formatting import BinaryFormat
+from .formatting import JSONLinesFormat
+from .formatting import OUTPUT_FORMATS
+from .formatting import levelBit
+from .formatting import sessionBit
+
+HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024  # Larger frames are treated as a protocol error.
+READ_SIZE = 256 * 1024  # The most bytes read from one client before serving the others.
+
+
+def encodeFrame(payload: bytes) -> bytes:
+    """
+    Prefix <payload> with its length.
+
+    payload: bytes, The payload of the frame.
+
+    :returns bytes: The frame.
+    """
+
+    return HEADER.pack(len(payload)) + payload
+
+
+class SocketSink(FileSink):
+    """
+    A sink that sends logs to a collector instead of writing them to a file.
+
+    Records are encoded as they are logged and buffered like a FileSink buffers
+    lines; each flush of the buffer is sent as one length-prefixed batch. While
+    the collector is unavailable, the batch stays in the buffer and is retried.
+    """
+
+    def __init__(self, path: str, buffer_size: int, flush_interval: float, hello: dict):
+        """
+        The initialization method of the SocketSink() class.
+
+        path           : str,     The path of the Unix domain socket of the collector.
+        buffer_size    : int,     The number of encoded bytes to buffer before sending a batch.
+        flush_interval : float,   The maximum number of seconds a record stays in the buffer.
+        hello          : dict,    Sent to the collector whenever the sink connects.
+        """
+
+        super().__init__(path, buffer_size, flush_interval)
+        self.hello = hello
+        self._socket = None
+
+    def _connect(self) -> None:
+        """
+        Connect to the collector and introduce this client.
+
+        :returns void:
+        """
+
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(self.path)
+            client.sendall(encodeFrame(json.dumps(self.hello).encode("utf-8")))
+
+        except OSError:
+            client.close()
+            raise
+
+        self._socket = client
+
+    def _disconnect(self) -> None:
+        """
+        Close the connection to the collector.
+
+        :returns void:
+        """
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def writeRecord(self, record: LogRecord) -> None:
+        """
+        Encode <record> and add it to the buffer.
+
+        record: LogRecord, The log to send.
+
+        :returns void:
+        """
+
+        fields = [record.level, record.created, record.caller, record.msg]
+        if record.site is not None or record.extra is not None:
+            fields.append(record.site)
+
+        if record.extra is not None:
+            fields.append(record.extra)
+
+        self._put(json.dumps(fields, separators=(',', ':'), default=str).encode("utf-8") + b',')
+
+    def _write(self, data: bytes, block: list = None) -> None:
+        """
+        Send the buffered records as one batch, reconnecting once if the collector went away.
+
+        data  : bytes, The encoded records, each followed by a comma.
+        block : list,  Unused; the collector indexes the logfile.
+
+        :returns void:
+        """
+
+        frame = encodeFrame(b'[' + data[:-1] + b']')
+        for attempt in range(2):
+            if self._socket is None:
+                self._connect()
+
+            try:
+                self._socket.sendall(frame)  # Blocks while the collector is behind.
+                return
+
+            except OSError:
+                self._disconnect()
+                if attempt:
+                    raise
+
+    def truncate(self) -> None:
+        raise ValueError("The logfile of a collector cannot be truncated by its clients.")
+
+    def close(self) -> None:
+        """
+        Send the buffered records and disconnect from the collector.
+
+        :returns void:
+        """
+
+        with self._lock:
+            try:
+                super().close()
+
+            finally:
+                self._disconnect()
+
+
+class _Client():
+    """
+    The state of a connection to the collector.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.buffer = bytearray()
+        self.session_bit = None  # The bit of the session in the index; set once the hello frame is received.
+        self.output = None  # The renderer of the logs of the client; set once the hello frame is received.
+        self.stats = {
+            "name": None,
+            "session_id": None,
+            "logfile": None,
+            "connected": time.time(),
+            "disconnected": None,
+            "records": 0,
+            "batches": 0,
+            "bytes_received": 0,
+            "bytes_written": 0,
+            "errors": 0,
+        }
+
+
+class Collector():
+    """
+    Receive logs from clients over a Unix domain socket and write them to one logfile.
+    """
+
+    def __init__(self, socket_path: str, logfile: str, **kwargs):
+        """
+        The initialization method of the Collector() class.
+
+        socket_path    : str,     The path of the Unix domain socket to listen on.
+        logfile        : str,     The path where to write the logs.
+        kwargs         : dict,    The keyword arguments.
+
+        Available kwargs:
+        log_format     : str,     The format of the logs. (See the `log_format` argument of `Logger()`.)
+        output_format  : str,     `text`, `jsonl` or `binary`. (See the `output_format` argument of `Logger()`.) (Default: `text`)
+        timestamp      : str,     A strftime-compatible format to use. If None, `time.asctime()` is used instead.
+        max_logfile_sz : float,   The maximum size of the logfile in MB before it is rotated. Set to `None` to disable limit. (Default: 10)
+        backup_count   : int,     The number of rotated logfiles to keep. (Default: 1)
+        rotation       : str,     `numbered` or `timestamp`. (Default: `numbered`)
+        compression    : str,     Compress rotated logfiles with `gzip`, `lzma` or `bz2`. (Default: None)
+        max_backup_sz  : float,   The maximum size of all rotated logfiles together in MB. (Default: None)
+        index          : bool,    If True, write a sidecar index of the logfile. (See the `index` argument of `Logger()`.) (Default: False)
+        buffer_size    : int,     The number of bytes to buffer before writing them to the logfile. (Default: 65536)
+        flush_interval : float,   The maximum number of seconds a log stays in the buffer. (Default: 1.0)
+        """
+
+        self.socket_path = str(socket_path)
+        self.logfile = str(logfile)
+        self.log_format = str(kwargs.get("log_format", ":{type}: [{session_id}] ({timestamp}) {caller} | {message}"))
+        self.timestamper = Timestamper(None if kwargs.get("timestamp", None) is None else str(kwargs.get("timestamp")))
+        LogFormat(self.log_format, "", self.timestamper)  # Raise a ValueError now if the format is invalid.
+        self.output_format = str(kwargs.get("output_format", "text"))
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError("output_format must be `text`, `jsonl` or `binary`.")
+
+        max_logfile_sz = None if kwargs.get("max_logfile_sz", 10.0) is None else float(kwargs.get("max_logfile_sz", 10.0))
+        self.flush_interval = None if kwargs.get("flush_interval", 1.0) is None else float(kwargs.get("flush_interval", 1.0))
+        self.sink = FileSink(
+            self.logfile,
+            int(kwargs.get("buffer_size", 65536)),
+            self.flush_interval,
+            max_bytes=None if max_logfile_sz is None else int(max_logfile_sz * 1024 * 1024),
+            backup_count=int(kwargs.get("backup_count", 1)),
+            rotation=str(kwargs.get("rotation", "numbered")),
+            compression=kwargs.get("compression", None),
+            max_backup_bytes=None if kwargs.get("max_backup_sz", None) is None else int(float(kwargs.get("max_backup_sz")) * 1024 * 1024),
+            index=kwargs.get("index", False)
+        )
+
+        self.__clients = {}
+        self.__finished = []  # The stats of disconnected clients.
+        self.__running = False
+
+    def getStats(self) -> list:
+        """
+        Return the counters of every client, connected or not.
+
+        :returns list: A list of dictionaries.
+        """
+
+        return [dict(stats) for stats in self.__finished] + [dict(client.stats) for client in self.__clients.values()]
+
+    def __report(self, stats: dict, stream) -> None:
+        """
+        Print the counters of a client to <stream>.
+
+        :returns void:
+        """
+
+        if stream is not None:
+            stream.write("{0} [{1}]: {2} records in {3} batches, {4} bytes received, {5} bytes written, {6} errors{7}\n".format(
+                stats["name"], stats["session_id"], stats["records"], stats["batches"], stats["bytes_received"],
+                stats["bytes_written"], stats["errors"], '' if stats["disconnected"] is None else " (disconnected)"
+            ))
+            stream.flush()
+
+    def __handleFrame(self, client: _Client, payload: bytes) -> None:
+        """
+        Handle a complete frame sent by <client>.
+
+        :returns void:
+        """
+
+        message = json.loads(payload.decode("utf-8"))
+        if client.output is None:
+            client.stats["name"] = message.get("name")
+            client.stats["session_id"] = message.get("session_id")
+            client.stats["logfile"] = message.get("logfile")
+            session_id = str(message.get("session_id"))
+            client.session_bit = sessionBit(session_id)
+            if self.output_format == "jsonl":
+                client.output = JSONLinesFormat(session_id)
+
+            elif self.output_format == "binary":
+                client.output = BinaryFormat(session_id)
+
+            else:
+                client.output = LogFormat(self.log_format, session_id, self.timestamper)
+
+            return
+
+        if not message:
+            return
+
+        timestamper = self.timestamper
+        data = client.output.renderMany([
+            LogRecord(
+                fields[0], fields[1], fields[3], fields[2], timestamper,
+                tuple(fields[4]) if len(fields) > 4 and fields[4] is not None else None,
+                extra=fields[5] if len(fields) > 5 else None
+            )
+            for fields in message
+        ])
+        index = None
+        if self.sink.index:
+            levels = 0
+            for level in set(fields[0] for fields in message):
+                levels |= levelBit(level)
+
+            index = (min(fields[1] for fields in message), max(fields[1] for fields in message), levels, client.session_bit)
+
+        self.sink.write(data, index)
+        client.stats["records"] += len(message)
+        client.stats["batches"] += 1
+        client.stats["bytes_written"] += len(data)
+
+    def __read(self, client: _Client) -> bool:
+        """
+        Read from <client> and handle its complete frames.
+
+        :returns bool: False if the client disconnected or broke the protocol.
+        """
+
+        try:
+            data = client.connection.recv(READ_SIZE)
+
+        except OSError:
+            return False
+
+        if not data:
+            return False
+
+        client.stats["bytes_received"] += len(data)
+        buffer = client.buffer
+        buffer += data
+        position = 0
+        while len(buffer) - position >= HEADER.size:
+            length = HEADER.unpack_from(buffer, position)[0]
+            if length > MAX_FRAME_SIZE:
+                client.stats["errors"] += 1
+                return False
+
+            end = position + HEADER.size + length
+            if len(buffer) < end:
+                break
+
+            try:
+                self.__handleFrame(client, bytes(buffer[position + HEADER.size:end]))
+
+            except (ValueError, TypeError, IndexError, AttributeError):
+                client.stats["errors"] += 1
+                return False
+
+            position = end
+
+        del buffer[:position]
+        return True
+
+    def serveForever(self, stats_interval: float = None, stream=sys.stderr) -> None:
+        """
+        Accept clients and write their logs until `shutdown()` is called.
+
+        stats_interval : float, The number of seconds between reports of the client counters to <stream>. (Default: None; only on disconnect)
+        stream         : file,  Where to report the counters. (None to disable)
+
+        :returns void:
+        """
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)  # Left behind by a collector that did not shut down cleanly.
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(128)
+        server.setblocking(False)
+
+        selector = selectors.DefaultSelector()
+        selector.register(server, selectors.EVENT_READ)
+        next_report = None if stats_interval is None else time.monotonic() + stats_interval
+        timeout = 0.5 if self.flush_interval is None else min(0.5, self.flush_interval)
+        self.__running = True
+        try:
+            while self.__running:
+                events = selector.select(timeout)
+                if not events:
+                    self.sink.flush()  # Idle; don't keep logs in the buffer.
+
+                for key, _ in events:
+                    if key.fileobj is server:
+                        try:
+                            connection, _ = server.accept()
+
+                        except OSError:
+                            continue
+
+                        connection.setblocking(True)
+                        self.__clients[connection] = _Client(connection)
+                        selector.register(connection, selectors.EVENT_READ)
+                        continue
+
+                    client = self.__clients[key.fileobj]
+                    if not self.__read(client):
+                        selector.unregister(client.connection)
+                        client.connection.close()
+                        del self.__clients[client.connection]
+                        client.stats["disconnected"] = time.time()
+                        self.__finished.append(client.stats)
+                        self.__report(client.stats, stream)
+
+                if next_report is not None and time.monotonic() >= next_report:
+                    next_report = time.monotonic() + stats_interval
+                    for client in self.__clients.values():
+                        self.__report(client.stats, stream)
+
+        finally:
+            for client in self.__clients.values():
+                client.connection.close()
+                client.stats["disconnected"] = time.time()
+                self.__finished.append(client.stats)
+
+            self.__clients.clear()
+            selector.close()
+            server.close()
+            os.remove(self.socket_path)
+            self.sink.close()
+
+    def shutdown(self) -> None:
+        """
+        Stop `serveForever()` after its current iteration.
+
+        :returns void:
+        """
+
+        self.__running = False
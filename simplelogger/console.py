@@ -0,0 +1,288 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import os
+import sys
+import time
+import threading
+
+from .sinks import _flusher
+from .sinks import _open_sinks
+
+# Try to import an optional package
+try:
+    import colorama
+    from colorama import Fore as cm_fore
+    from colorama import Back as cm_back
+    COLORAMA_SUPPORT = True
+
+except ImportError:
+    COLORAMA_SUPPORT = False
+
+STDERR_LEVEL = 3  # Logs of this level code or lower (warnings and more severe) go to stderr.
+FLUSH_POLICIES = ("auto", "line", "interval")
+
+
+def consoleStyles(colors: bool) -> tuple:
+    """
+    Render the parts of a console line that only depend on the level.
+
+    colors: bool, If True, include the colors. Requires colorama.
+
+    :returns tuple: (prefix, infix, suffix) of each level code. Debug lines are
+                    `prefix + caller + infix + msg + suffix`, the others `prefix + msg + suffix`.
+    """
+
+    if not colors:
+        return (
+            None,
+            ("[CRITICAL] ", None, "\n"),
+            ("[E] ", None, "\n"),
+            ("[!] ", None, "\n"),
+            ("[i] ", None, "\n"),
+            ("[DEBUG] ", "(): ", "\n")
+        )
+
+    reset = cm_fore.RESET
+    return (
+        None,
+        (reset + cm_back.LIGHTRED_EX + '[' + cm_fore.BLACK + "CRITICAL" + reset + "] ", None, cm_back.RESET + "\n"),
+        (reset + '[' + cm_fore.LIGHTRED_EX + 'E' + reset + "] " + cm_fore.LIGHTRED_EX, None, reset + "\n"),
+        (reset + '[' + cm_fore.LIGHTYELLOW_EX + '!' + reset + "] " + cm_fore.LIGHTYELLOW_EX, None, reset + "\n"),
+        (reset + '[' + cm_fore.LIGHTGREEN_EX + 'i' + reset + "] " + cm_fore.LIGHTGREEN_EX, None, reset + "\n"),
+        (reset + '[' + cm_fore.LIGHTBLACK_EX + "DEBUG" + reset + "] ", "(): " + cm_fore.LIGHTBLACK_EX, reset + "\n")
+    )
+
+
+class _ConsoleStream():
+    """
+    The state of one of the streams of a ConsoleSink.
+    """
+
+    __slots__ = ("text", "binary", "encoding", "errors", "styles", "line", "buffer", "buffered", "deadline")
+
+    def __init__(self, text, colors, flush_policy: str):
+        isatty = getattr(text, "isatty", None)
+        isatty = bool(isatty and isatty())
+        self.text = text
+        self.binary = getattr(text, "buffer", None)  # Written to directly; None for streams without one, such as io.StringIO.
+        self.encoding = getattr(text, "encoding", None) or "utf-8"
+        self.errors = getattr(text, "errors", None) or "replace"
+        self.styles = consoleStyles(isatty and _enableColors() if colors is None else colors)
+        self.line = flush_policy == "line" or (flush_policy == "auto" and isatty)
+        self.buffer = []
+        self.buffered = 0
+        self.deadline = None
+
+
+def _enableColors() -> bool:
+    """
+    Check if colors can be shown, enabling them in the Windows console if needed.
+
+    :returns bool:
+    """
+
+    if not COLORAMA_SUPPORT:
+        return False
+
+    if os.name != "nt":
+        return True
+
+    # Writes go around the stream wrapper of `colorama.init()`, so the console itself must handle the color codes.
+    fix = getattr(colorama, "just_fix_windows_console", None)
+    if fix is None:
+        return False
+
+    fix()
+    return True
+
+
+def _sameFile(a, b) -> bool:
+    """
+    Check if the streams <a> and <b> write to the same file, e.g. a terminal or `2>&1`.
+
+    :returns bool:
+    """
+
+    if a is b:
+        return True
+
+    try:
+        first = os.fstat(a.fileno())
+        second = os.fstat(b.fileno())
+
+    except (AttributeError, OSError, ValueError):
+        return False  # Streams without a file descriptor, such as io.StringIO.
+
+    return (first.st_dev, first.st_ino) == (second.st_dev, second.st_ino)
+
+
+class ConsoleSink():
+    """
+    A sink that prints logs to the console. Warnings and more severe logs go
+    to stderr, the others to stdout. The level prefixes are rendered once,
+    and lines are encoded and buffered by the sink and written to the binary
+    buffer of the stream. Colors are only used when the stream is a terminal
+    and colorama is installed.
+    """
+
+    def __init__(self, flush_policy: str = "auto", buffer_size: int = io.DEFAULT_BUFFER_SIZE, flush_interval: float = 1.0, **kwargs):
+        """
+        The initialization method of the ConsoleSink() class.
+
+        flush_policy   : str,   When to write the buffered lines out:
+            auto       :        `line` for terminals, `interval` for everything else.
+            line       :        After every log.
+            interval   :        When <buffer_size> bytes are buffered or the oldest line is <flush_interval> seconds old,
+                                and on `flush()`.
+        buffer_size    : int,   The number of bytes to buffer with the `interval` policy.
+        flush_interval : float, The maximum number of seconds a line stays in the buffer with the `interval` policy. (None to disable)
+        kwargs         : dict,  The keyword arguments.
+
+        Available kwargs:
+        colors         : bool,  Force colors on or off. (Default: None; only for terminals, when colorama is installed)
+        stdout         : file,  The stream of info and debug logs. (Default: `sys.stdout`)
+        stderr         : file,  The stream of warnings and more severe logs. (Default: `sys.stderr`)
+        """
+
+        if flush_policy not in FLUSH_POLICIES:
+            raise ValueError("flush_policy must be `auto`, `line` or `interval`.")
+
+        colors = kwargs.get("colors", None)
+        if colors is not None and type(colors) is not bool:
+            raise ValueError("colors must be a boolean or None.")
+
+        if colors and not COLORAMA_SUPPORT:
+            raise ValueError("colors require colorama.")
+
+        self.flush_policy = flush_policy
+        self.buffer_size = int(buffer_size)
+        self.flush_interval = None if flush_interval is None else float(flush_interval)
+        self._streams = (
+            _ConsoleStream(kwargs.get("stdout", None) or sys.stdout, colors, flush_policy),
+            _ConsoleStream(kwargs.get("stderr", None) or sys.stderr, colors, flush_policy)
+        )
+        self._shared = _sameFile(self._streams[0].text, self._streams[1].text)
+        self._last = None  # The stream written to last, if both go to the same file.
+        self._lock = threading.Lock()
+        _open_sinks.add(self)
+
+    def write(self, log) -> None:
+        """
+        Print <log>.
+
+        log: LogRecord, The log to print.
+
+        :returns void:
+        """
+
+        level = log.level
+        stream = self._streams[level <= STDERR_LEVEL]
+        prefix, infix, suffix = stream.styles[level]
+        msg = log.msg if type(log.msg) is str else str(log.msg)
+        line = prefix + msg + suffix if infix is None else prefix + str(log.caller) + infix + msg + suffix
+        if stream.binary is not None:
+            line = line.encode(stream.encoding, stream.errors)
+
+        with self._lock:
+            if self._shared and self._last is not stream:
+                if self._last is not None:
+                    self._flush(self._last)  # Keep the order of the lines in the file.
+
+                self._last = stream
+
+            stream.buffer.append(line)
+            stream.buffered += len(line)
+            if stream.line or stream.buffered >= self.buffer_size:
+                self._flush(stream)
+
+            elif stream.deadline is None:
+                if self.flush_interval is not None:
+                    stream.deadline = time.monotonic() + self.flush_interval
+                    _flusher.schedule(self, stream.deadline)
+
+            elif time.monotonic() >= stream.deadline:
+                self._flush(stream)
+
+    def _flushDue(self) -> None:
+        """
+        Write out the buffered lines whose flush deadline has passed. Called by the flusher thread.
+
+        :returns void:
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            for stream in self._streams:
+                if stream.deadline is not None:
+                    if now >= stream.deadline:
+                        self._flush(stream)
+
+                    else:
+                        _flusher.schedule(self, stream.deadline)
+
+    def _flush(self, stream: _ConsoleStream) -> None:
+        """
+        Write the buffered lines of <stream> out. The caller must hold `self._lock`.
+
+        :returns void:
+        """
+
+        if not stream.buffer:
+            return
+
+        lines = stream.buffer
+        stream.buffer = []
+        stream.buffered = 0
+        stream.deadline = None
+        if stream.binary is None:
+            stream.text.write(''.join(lines))
+            stream.text.flush()
+
+        else:
+            stream.text.flush()  # Text written to the stream before, e.g. with print(), goes first.
+            stream.binary.write(b''.join(lines))
+            stream.binary.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered lines out.
+
+        :returns void:
+        """
+
+        with self._lock:
+            for stream in self._streams:
+                self._flush(stream)
+
+    def close(self) -> None:
+        """
+        Write the buffered lines out. The streams themselves are left open.
+
+        :returns void:
+        """
+
+        self.flush()
+        _open_sinks.discard(self)
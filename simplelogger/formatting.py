@@ -0,0 +1,451 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import re
+import json
+import time
+import zlib
+import struct
+import datetime
+
+from string import Formatter
+
+from .records import LEVEL_NAMES
+
+# The placeholders that can be used in `log_format`, and how the renderer gets their values from a log <r>.
+FIELDS = {
+    "session_id": None,  # Constant; baked into the templates.
+    "type": None,  # Baked into one template per level.
+    "timestamp": "ts(r.created)",
+    "message": "r.msg",
+    "caller": "r.caller",
+    "module": "r.module",
+    "filename": "r.filename",
+    "lineno": "r.lineno",
+}
+
+DEFAULT_LOG_FORMAT = ":{type}: [{session_id}] ({timestamp}) {caller} | {message}"
+
+# The placeholders that need the call site of a log.
+SITE_FIELDS = ("module", "filename", "lineno")
+
+# The `output_format` values, and the encodings of the binary format.
+OUTPUT_FORMATS = ("text", "jsonl", "binary")
+BINARY_MAGIC = b"SL"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<2sBI")  # Magic, schema version, and the number of bytes after the header.
+BINARY_RECORD = struct.Struct("<BBdIII")  # Level, flags, created, and the lengths of session_id, caller and msg.
+BINARY_SITE = struct.Struct("<III")  # The lengths of module and filename, and lineno.
+BINARY_CALLER = 1  # Flag: the caller was captured. (An empty caller is None otherwise.)
+BINARY_HAS_SITE = 2  # Flag: the record continues with the call site.
+BINARY_HAS_EXTRA = 4  # Flag: the record ends with the extra fields.
+BINARY_EXTRA = struct.Struct("<I")  # The length of the JSON object of the extra fields.
+
+# The sidecar index (`<logfile>.idx`): a header, then one entry for every block of logs written to the logfile.
+INDEX_MAGIC = b"SLIX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sB")  # Magic and version.
+INDEX_ENTRY = struct.Struct("<QIddBQ")  # Offset, length, first and last created, level mask and session mask of a block.
+
+
+def textPattern(log_format: str):
+    """
+    Build a regular expression that matches the start of the lines that <log_format> renders,
+    with the groups `type`, `session_id` and `timestamp` when the format has those placeholders.
+
+    log_format: str, The format of the lines.
+
+    :returns re.Pattern:
+    """
+
+    parts = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(log_format):
+        parts.append(re.escape(literal))
+        if field_name is None:
+            continue
+
+        if field_name == "type":
+            parts.append(r"\s*(?P<type>[A-Z]+)\s*" if "(?P<type>" not in ''.join(parts) else r"\s*[A-Z]+\s*")
+
+        elif field_name == "session_id" and "(?P<session_id>" not in ''.join(parts):
+            parts.append(r"\s*(?P<session_id>.*?)\s*")
+
+        elif field_name == "timestamp" and "(?P<timestamp>" not in ''.join(parts):
+            parts.append(r"\s*(?P<timestamp>.*?)\s*")
+
+        else:
+            parts.append(".*?")
+
+    return re.compile(''.join(parts))
+
+
+def levelBit(level: int) -> int:
+    """
+    Return the bit of <level> in the level mask of an index entry.
+
+    level: int, The level code.
+
+    :returns int:
+    """
+
+    return 1 << level
+
+
+def sessionBit(session_id: str) -> int:
+    """
+    Return the bit of <session_id> in the session mask of an index entry.
+    The mask has 64 bits, so a block can match a session it does not contain, but never the other way around.
+
+    session_id: str, The Session ID.
+
+    :returns int:
+    """
+
+    return 1 << (zlib.crc32(str(session_id).encode("utf-8")) & 63)
+
+
+class Timestamper():
+    """
+    Render the epoch time of a log as a string.
+
+    The rendered whole seconds are cached, so `time.strftime()` runs at most
+    once per second. `%f` (microseconds) and `%1f` to `%6f` (that many digits
+    of the fraction, e.g. `%3f` for milliseconds) can be used for sub-second
+    timestamps; only the fraction is rendered for every log.
+    """
+
+    __fraction = re.compile(r"%(?:(%)|([1-6]?)f)")
+
+    def __init__(self, timestamp_format: str = None):
+        """
+        The initialization method of the Timestamper() class.
+
+        timestamp_format: str, A strftime-compatible format to use. If None, `time.asctime()` is used instead.
+        """
+
+        self.timestamp_format = timestamp_format
+
+    @property
+    def timestamp_format(self) -> str:
+        return self.__timestamp_format
+
+    @timestamp_format.setter
+    def timestamp_format(self, value: str) -> None:
+        self.__timestamp_format = value
+        self.__parts = None  # The strftime formats between the fractions, and the number of digits of each fraction.
+        self.resolution = 1.0  # The number of seconds between two times that are rendered differently.
+        if value is not None:
+            parts = []
+            start = 0
+            for match in self.__fraction.finditer(value):
+                if match.group(1) is None:  # Not an escaped `%%`.
+                    parts.append(value[start:match.start()])
+                    parts.append(int(match.group(2) or 6))
+                    start = match.end()
+
+            if parts:
+                parts.append(value[start:])
+                self.__parts = tuple(parts)
+                self.__scale = 10 ** max(parts[1::2])  # Times are rounded to the finest fraction.
+                self.__divisors = tuple(self.__scale // 10 ** digits for digits in parts[1::2])
+                self.resolution = 1 / self.__scale
+
+        self.__cache = (None, None)  # The last rendered second, and what was rendered for it.
+
+    def __call__(self, created: float) -> str:
+        """
+        Render <created>.
+
+        created: float, The time in seconds since the epoch.
+
+        :returns str: The formatted time.
+        """
+
+        if self.__parts is None:
+            second = int(created)
+
+        else:
+            second, ticks = divmod(int(round(created * self.__scale)), self.__scale)  # Rounding up can carry into the next second.
+
+        cached_second, rendered = self.__cache
+        if cached_second != second:
+            localtime = time.localtime(second)
+            if self.__timestamp_format is None:
+                rendered = time.asctime(localtime)
+
+            elif self.__parts is None:
+                rendered = time.strftime(self.__timestamp_format, localtime)
+
+            else:
+                # A str.format template of the whole second, with a field for each fraction.
+                rendered = ''.join(
+                    "{" + str(i // 2) + ":0" + str(part) + "d}" if type(part) is int else time.strftime(part, localtime).replace('{', "{{").replace('}', "}}")
+                    for i, part in enumerate(self.__parts)
+                ).format
+
+            self.__cache = (second, rendered)  # Replaced in one step so other threads see a consistent pair.
+
+        if self.__parts is None:
+            return rendered
+
+        if len(self.__divisors) == 1:
+            return rendered(ticks // self.__divisors[0])
+
+        return rendered(*[ticks // divisor for divisor in self.__divisors])
+
+    def parse(self, timestamp: str) -> float:
+        """
+        Parse a timestamp rendered by this Timestamper back into an epoch time.
+        Raises a ValueError if <timestamp> does not match the format.
+
+        timestamp: str, The rendered timestamp.
+
+        :returns float: A time within `self.resolution` seconds of the time <timestamp> was rendered for.
+        """
+
+        if self.__timestamp_format is None:
+            parse_format = "%a %b %d %H:%M:%S %Y"  # The format of `time.asctime()`.
+
+        else:
+            parse_format = self.__fraction.sub(lambda match: "%%" if match.group(1) else "%f", self.__timestamp_format)
+
+        return datetime.datetime.strptime(timestamp, parse_format).timestamp()
+
+
+class LogFormat():
+    """
+    A `log_format` compiled into a renderer.
+
+    The constant placeholders (`session_id` and the upper-cased `type`) are
+    rendered once into one template per level, and only the placeholders used
+    by the format are computed for each log.
+    """
+
+    def __init__(self, log_format: str, session_id: str, timestamper):
+        """
+        The initialization method of the LogFormat() class.
+
+        log_format  : str,      The format of the log. (See the `log_format` argument of `Logger()`.)
+        session_id  : str,      The Session ID to render.
+        timestamper : callable, Renders the `timestamp` of a log from its epoch time.
+        """
+
+        self.log_format = log_format
+        self.session_id = session_id
+        self.fields = set()  # The placeholders used by the format.
+
+        template = []  # Literal text, or (field, rest of the replacement field) tuples.
+        try:
+            parsed = list(Formatter().parse(log_format))
+
+        except ValueError as e:
+            raise ValueError("Invalid log_format: {0}".format(e))
+
+        for literal, field_name, format_spec, conversion in parsed:
+            template.append(literal.replace('{', "{{").replace('}', "}}"))
+            if field_name is None:
+                continue
+
+            name = field_name
+            for i, char in enumerate(field_name):
+                if char in ".[":
+                    name = field_name[:i]
+                    break
+
+            if name not in FIELDS:
+                raise ValueError("Unknown placeholder in log_format: {{{0}}}".format(field_name))
+
+            if '{' in format_spec:
+                raise ValueError("Nested placeholders are not supported in log_format.")
+
+            self.fields.add(name)
+            rest = field_name[len(name):]
+            if conversion:
+                rest += '!' + conversion
+
+            if format_spec:
+                rest += ':' + format_spec
+
+            template.append((name, rest))
+
+        self.render = self.__compile(template, timestamper)
+
+    def __compile(self, template: list, timestamper):
+        """
+        Build the renderer of <template>.
+
+        :returns callable: A function that takes a log and returns its line, including the newline.
+        """
+
+        args = []  # The expressions of the positional fields, in order.
+        templates = [None]  # The template of each level code.
+        for level in range(1, len(LEVEL_NAMES)):
+            text = []
+            position = 0
+            for part in template:
+                if type(part) is str:
+                    text.append(part)
+                    continue
+
+                name, rest = part
+                if name in ("session_id", "type"):
+                    value = self.session_id if name == "session_id" else LEVEL_NAMES[level].upper()
+                    text.append(("{0" + rest + '}').format(value).replace('{', "{{").replace('}', "}}"))
+                    continue
+
+                text.append("{" + str(position) + rest + '}')
+                expression = FIELDS[name] if name != "caller" else "('' if r.caller is None else r.caller + '()')"  # Empty if not captured.
+
+                position += 1
+                if level == 1:
+                    args.append(expression)
+
+            templates.append(''.join(text) + '\n')
+
+        if not args:
+            templates = [None] + [t.format() for t in templates[1:]]
+            return eval("lambda r: T[r.level]", {"T": tuple(templates)})
+
+        # Only known attribute expressions from `FIELDS` end up in the source code.
+        return eval("lambda r: T[r.level].format({0})".format(", ".join(args)), {"T": tuple(templates), "ts": timestamper})
+
+    def renderMany(self, logs: list) -> str:
+        """
+        Render <logs> into one string.
+
+        logs: list, The logs to render.
+
+        :returns str: The lines of the logs.
+        """
+
+        return ''.join(map(self.render, logs))
+
+
+class JSONLinesFormat():
+    """
+    Render logs as JSON Lines, one object per log with the keys `created`
+    (seconds since the epoch), `level` (the level code), `session_id`,
+    `caller` and `msg`, plus `module`, `filename` and `lineno` when the call
+    site was captured, and `extra` (an object) when the log has extra fields.
+    """
+
+    fields = {"session_id", "type", "timestamp", "message", "caller"}  # What a log shows. (See `LogFormat.fields`.)
+
+    def __init__(self, session_id: str):
+        """
+        The initialization method of the JSONLinesFormat() class.
+
+        session_id: str, The Session ID to render.
+        """
+
+        self.session_id = session_id
+        self.__encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+        self.__head = '{{"created":{0!r},"level":{1},"session_id":' + self.__encode(session_id).replace('{', "{{").replace('}', "}}") + ',"caller":{2},"msg":{3}'
+
+    def render(self, r) -> str:
+        """
+        Render the log <r>.
+
+        :returns str: The JSON object of the log, including the newline.
+        """
+
+        encode = self.__encode
+        line = self.__head.format(r.created, r.level, encode(r.caller), encode(r.msg))
+        if r.site is not None:
+            line += ',"module":{0},"filename":{1},"lineno":{2}'.format(encode(r.site[0]), encode(r.site[1]), r.site[2])
+
+        if r.extra is not None:
+            line += ',"extra":' + encode(r.extra)
+
+        return line + "}\n"
+
+    renderMany = LogFormat.renderMany
+
+
+class BinaryFormat():
+    """
+    Render logs as length-prefixed binary records.
+
+    Every record starts with `BINARY_HEADER`: the magic bytes, the schema
+    version and the length of the rest of the record, so readers can skip
+    records of versions they don't know. Version 1 continues with
+    `BINARY_RECORD`, then the UTF-8 session_id, caller and msg, and if the
+    call site was captured, `BINARY_SITE` followed by the module and filename.
+    If the log has extra fields, `BINARY_EXTRA` and their UTF-8 JSON object
+    come last.
+    """
+
+    fields = JSONLinesFormat.fields
+
+    def __init__(self, session_id: str):
+        """
+        The initialization method of the BinaryFormat() class.
+
+        session_id: str, The Session ID to render.
+        """
+
+        self.session_id = session_id
+        self.__session_id = session_id.encode("utf-8")
+        self.__encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+
+    def render(self, r) -> bytes:
+        """
+        Render the log <r>.
+
+        :returns bytes: The record of the log.
+        """
+
+        session_id = self.__session_id
+        caller = b'' if r.caller is None else r.caller.encode("utf-8")
+        msg = (r.msg if type(r.msg) is str else str(r.msg)).encode("utf-8")
+        flags = 0 if r.caller is None else BINARY_CALLER
+        tail = b''
+        if r.site is not None:
+            flags |= BINARY_HAS_SITE
+            module = (r.site[0] or '').encode("utf-8")
+            filename = r.site[1].encode("utf-8")
+            tail = BINARY_SITE.pack(len(module), len(filename), r.site[2]) + module + filename
+
+        if r.extra is not None:
+            flags |= BINARY_HAS_EXTRA
+            extra = self.__encode(r.extra).encode("utf-8")
+            tail += BINARY_EXTRA.pack(len(extra)) + extra
+
+        length = BINARY_RECORD.size + len(session_id) + len(caller) + len(msg) + len(tail)
+        return b''.join((
+            BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, length),
+            BINARY_RECORD.pack(r.level, flags, r.created, len(session_id), len(caller), len(msg)),
+            session_id, caller, msg, tail
+        ))
+
+    def renderMany(self, logs: list) -> bytes:
+        """
+        Render <logs> into one string of bytes.
+
+        logs: list, The logs to render.
+
+        :returns bytes: The records of the logs.
+        """
+
+        return b''.join(map(self.render, logs))
@@ -0,0 +1,290 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Query logfiles through their sidecar index (`<logfile>.idx`, see `Logger(index=True)`).
+
+Every entry of the index describes one block written to the logfile: its
+offset and length, the times of its first and last log, and masks of the
+levels and sessions in it. A query reads the index, and only the blocks
+that can match are read from the memory-mapped logfile.
+"""
+
+import os
+import json
+import mmap
+
+from .reader import READ_SIZE
+from .reader import parseBinary
+from .reader import detectFormat
+from .records import LEVEL_CODES
+from .formatting import levelBit
+from .formatting import sessionBit
+from .formatting import Timestamper
+from .formatting import textPattern
+from .formatting import DEFAULT_LOG_FORMAT
+from .formatting import BINARY_MAGIC
+from .formatting import INDEX_MAGIC
+from .formatting import INDEX_VERSION
+from .formatting import INDEX_HEADER
+from .formatting import INDEX_ENTRY
+
+MAX_REGION = 1024 * 1024  # Adjacent blocks are merged into regions of up to this many bytes.
+
+
+def readIndex(path: str) -> list:
+    """
+    Read the entries of the index at <path>. An incomplete entry at the end (one that is still being written) is ignored.
+
+    path: str, The path of the index.
+
+    :returns list: (offset, length, first, last, levels, sessions) tuples, in the order the blocks were written.
+    """
+
+    with open(path, "rb") as f:
+        header = f.read(INDEX_HEADER.size)
+        if len(header) < INDEX_HEADER.size or INDEX_HEADER.unpack(header) != (INDEX_MAGIC, INDEX_VERSION):
+            raise ValueError("{0} is not a logfile index of version {1}.".format(path, INDEX_VERSION))
+
+        data = f.read()
+
+    return list(INDEX_ENTRY.iter_unpack(memoryview(data)[:len(data) - len(data) % INDEX_ENTRY.size]))
+
+
+def findBlocks(path: str, loglevel: int = 5, session_id: str = None, since: float = None, until: float = None) -> list:
+    """
+    Find the regions of the logfile at <path> that can contain logs matching the query, using its index.
+
+    path       : str,   The path of the logfile.
+    loglevel   : int,   The highest level code to match. (e.g. 2 for errors and critical errors)
+    session_id : str,   Only match the logs of this session. (Default: None; all sessions)
+    since      : float, Only match the logs made at or after this epoch time. (Default: None)
+    until      : float, Only match the logs made at or before this epoch time. (Default: None)
+
+    :returns list: (offset, length) tuples of the regions, in order. Adjacent blocks are merged up to MAX_REGION bytes.
+    """
+
+    levels = 0
+    for code in range(1, loglevel + 1):
+        levels |= levelBit(code)
+
+    session = None if session_id is None else sessionBit(session_id)
+    regions = []
+    for offset, length, first, last, block_levels, sessions in readIndex(path + ".idx"):
+        if not block_levels & levels:
+            continue
+
+        if session is not None and not sessions & session:
+            continue
+
+        if (since is not None and last < since) or (until is not None and first > until):
+            continue
+
+        if regions and regions[-1][0] + regions[-1][1] == offset and regions[-1][1] + length <= MAX_REGION:
+            regions[-1] = (regions[-1][0], regions[-1][1] + length)
+
+        else:
+            regions.append((offset, length))
+
+    return regions
+
+
+def _readLines(logfile, offset: int, end: int):
+    """
+    Yield the lines of the region of <logfile> from <offset> to <end>, one at a time.
+
+    logfile : mmap, The memory-mapped logfile.
+    offset  : int,  Where the region starts.
+    end     : int,  Where the region ends.
+
+    :returns generator: The lines as bytes, with their line endings.
+    """
+
+    find = logfile.find
+    while offset < end:
+        newline = find(b"\n", offset, end)
+        stop = end if newline == -1 else newline + 1
+        yield logfile[offset:stop]
+        offset = stop
+
+
+def _readRecords(logfile, offset: int, end: int):
+    """
+    Yield the logs in the `binary` output format in the region of <logfile> from <offset> to <end>,
+    decoding READ_SIZE bytes at a time (or more for a larger record).
+
+    logfile : mmap, The memory-mapped logfile.
+    offset  : int,  Where the region starts.
+    end     : int,  Where the region ends.
+
+    :returns generator: The logs as dictionaries.
+    """
+
+    window = READ_SIZE
+    while offset < end:
+        logs, position = parseBinary(logfile[offset:min(offset + window, end)], offset)
+        if not position:
+            if offset + window >= end:
+                return  # An incomplete record at the end.
+
+            window *= 2
+            continue
+
+        window = READ_SIZE
+        offset += position
+        yield from logs
+
+
+def filterText(lines, log_format: str = DEFAULT_LOG_FORMAT, loglevel: int = 5, session_id: str = None, since: float = None,
+               until: float = None, timestamp_format: str = None):
+    """
+    Yield the lines in the `text` output format that match the level, the session and the time.
+    Lines that do not start like <log_format> continue the message of the line before them.
+    The times are parsed from the `{timestamp}` of the lines, so they match within the resolution of <timestamp_format>.
+
+    lines            : iterable, The lines.
+    log_format       : str,      The format the lines were written with.
+    loglevel         : int,      The highest level code to match.
+    session_id       : str,      Only match the logs of this session. (Default: None; all sessions)
+    since            : float,    Only match the logs made at or after this epoch time. (Default: None)
+    until            : float,    Only match the logs made at or before this epoch time. (Default: None)
+    timestamp_format : str,      The `timestamp` the lines were written with. (See `Logger()`.) (Default: None; `time.asctime()`)
+
+    :returns generator: The matching lines.
+    """
+
+    pattern = textPattern(log_format)
+    if loglevel < 5 and "type" not in pattern.groupindex:
+        raise ValueError("The log format has no {type}, so the lines cannot be filtered by level.")
+
+    if session_id is not None and "session_id" not in pattern.groupindex:
+        raise ValueError("The log format has no {session_id}, so the lines cannot be filtered by session.")
+
+    timestamper = None
+    if since is not None or until is not None:
+        if "timestamp" not in pattern.groupindex:
+            raise ValueError("The log format has no {timestamp}, so the lines cannot be filtered by time.")
+
+        timestamper = Timestamper(timestamp_format)
+        resolution = timestamper.resolution
+        since = float("-inf") if since is None else since - resolution
+        until = float("inf") if until is None else until + resolution
+
+    match = pattern.match
+    keep = False
+    parsed = (None, None)  # The last timestamp parsed, and its time; most lines share their timestamp with the line before them.
+    for line in lines:
+        found = match(line)
+        if found is not None:
+            groups = found.groupdict()
+            keep = (
+                ("type" not in groups or LEVEL_CODES.get(groups["type"].lower(), 6) <= loglevel)
+                and (session_id is None or groups["session_id"] == session_id)
+            )
+            if keep and timestamper is not None:
+                if parsed[0] != groups["timestamp"]:
+                    parsed = (groups["timestamp"], timestamper.parse(groups["timestamp"]))
+
+                keep = since <= parsed[1] <= until
+
+        if keep:
+            yield line
+
+
+def queryLogs(path: str, loglevel=5, session_id: str = None, since: float = None, until: float = None, output_format: str = None,
+              log_format: str = DEFAULT_LOG_FORMAT, timestamp_format: str = None):
+    """
+    Read the logs of the logfile at <path> that match the query.
+
+    With an index, only the matching blocks of the logfile are read; without
+    one, the whole logfile is scanned. Logs in the `jsonl` and `binary` output
+    formats are yielded as dictionaries (see `simplelogger.reader`). Lines in
+    the `text` output format are yielded as strings, filtered by the `{type}`,
+    `{session_id}` and `{timestamp}` of <log_format>. Their times are parsed
+    with <timestamp_format>, so <since> and <until> match within its
+    resolution (a second by default). If <log_format> has no `{timestamp}`,
+    the lines are only filtered by time with the index, a whole block at a time.
+
+    path          : str,       The path of the logfile.
+    loglevel      : int | str, The highest level to match, as a code or name. (e.g. 2 or `error` for errors and critical errors)
+    session_id    : str,       Only match the logs of this session. (Default: None; all sessions)
+    since         : float,     Only match the logs made at or after this epoch time. (Default: None)
+    until         : float,     Only match the logs made at or before this epoch time. (Default: None)
+    output_format : str,       `text`, `jsonl` or `binary`. If None, it is detected from the start of the logfile.
+    log_format    : str,       The format of the lines in the `text` output format.
+    timestamp_format: str,     The `timestamp` of the lines in the `text` output format. (Default: None; `time.asctime()`)
+
+    :returns generator: The matching logs.
+    """
+
+    loglevel = LEVEL_CODES.get(loglevel, loglevel)
+    if loglevel not in range(1, 6):
+        raise ValueError("loglevel must be an integer between 1 and 5 or a level name.")
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+
+        indexed = os.path.exists(path + ".idx")
+        if indexed:
+            regions = findBlocks(path, loglevel, session_id, since, until)
+
+        else:
+            regions = [(0, size)]
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as logfile:
+            if output_format is None:
+                output_format = detectFormat(logfile[:len(BINARY_MAGIC)])
+
+            text_since, text_until = since, until
+            if output_format == "text" and indexed and "timestamp" not in textPattern(log_format).groupindex:
+                text_since = text_until = None  # Filtered by the index only.
+
+            for offset, length in regions:
+                if offset + length > size:
+                    break  # The index is newer than the logfile.
+
+                if output_format == "text":
+                    lines = (line.decode("utf-8") for line in _readLines(logfile, offset, offset + length))
+                    yield from filterText(lines, log_format, loglevel, session_id, text_since, text_until, timestamp_format)
+                    continue
+
+                if output_format == "binary":
+                    logs = _readRecords(logfile, offset, offset + length)
+
+                else:
+                    logs = (json.loads(line) for line in _readLines(logfile, offset, offset + length) if line.strip())
+
+                for log in logs:
+                    if log["level"] > loglevel:
+                        continue
+
+                    if session_id is not None and log["session_id"] != session_id:
+                        continue
+
+                    if (since is not None and log["created"] < since) or (until is not None and log["created"] > until):
+                        continue
+
+                    yield log
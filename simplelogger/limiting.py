@@ -0,0 +1,160 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+import random
+
+from .records import LEVEL_CODES
+
+
+class _Site():
+    """
+    The token bucket and the counters of a call site.
+    """
+
+    __slots__ = ("tokens", "updated", "blocked_until", "suppressed", "summary_due")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+        self.blocked_until = 0.0  # The site is throttled until then.
+        self.suppressed = 0  # The number of logs dropped since the last summary.
+        self.summary_due = 0.0  # When a summary of a site that stays throttled is emitted.
+
+
+class RateLimiter():
+    """
+    Limit the logs of each call site and level with a token bucket, and sample logs of chosen levels.
+
+    A throttled site costs a dictionary lookup and a clock read per call.
+    The logs it drops are summarized: when the site is allowed to log again,
+    or every <summary_interval> seconds while it stays throttled, a summary
+    is added to `self.pending` for the logger to emit.
+    """
+
+    def __init__(self, rate: float = None, burst: int = None, sample_rates: dict = None, summary_interval: float = 60.0):
+        """
+        The initialization method of the RateLimiter() class.
+
+        rate             : float, The number of logs per second each call site can make at each level. (None to disable)
+        burst            : int,   The number of logs a call site can make at once. (Default: None; <rate>, and at least 1)
+        sample_rates     : dict,  {level: probability}; only this fraction of the logs of the level (code or name) is kept.
+        summary_interval : float, The number of seconds between the summaries of a site that stays throttled.
+        """
+
+        if rate is not None and rate <= 0:
+            raise ValueError("rate_limit must be a positive number or None.")
+
+        self.rate = None if rate is None else float(rate)
+        self.burst = float(max(1, self.rate or 1) if burst is None else burst)
+        if self.burst < 1:
+            raise ValueError("rate_burst must be at least 1.")
+
+        self.sample_rates = [None] * 6  # The probability of each level code, or None to keep every log.
+        for level, probability in (sample_rates or {}).items():
+            code = LEVEL_CODES.get(level, level)
+            if code not in range(1, 6) or not 0 <= float(probability) <= 1:
+                raise ValueError("sample_rates must map levels to probabilities between 0 and 1.")
+
+            self.sample_rates[code] = float(probability)
+
+        self.summary_interval = float(summary_interval)
+        self.sites = {}
+        self.pending = []  # (key, level, suppressed) summaries waiting to be emitted.
+        self.suppressed = 0  # The number of logs dropped by the rate limit.
+        self.sampled_out = 0  # The number of logs dropped by sampling.
+
+    def check(self, key, level: int) -> bool:
+        """
+        Decide if a log of <level> from the call site <key> is kept.
+
+        key   : Any, What identifies the call site.
+        level : int, The level code of the log.
+
+        :returns bool: True if the log is kept.
+        """
+
+        probability = self.sample_rates[level]
+        if probability is not None and random.random() >= probability:
+            self.sampled_out += 1
+            return False
+
+        if self.rate is None:
+            return True
+
+        now = time.monotonic()
+        site = self.sites.get((key, level))
+        if site is None:
+            site = self.sites[(key, level)] = _Site(self.burst, now)
+
+        elif now < site.blocked_until:
+            site.suppressed += 1
+            self.suppressed += 1
+            if now >= site.summary_due:
+                self.pending.append((key, level, site.suppressed))
+                site.suppressed = 0
+                site.summary_due = now + self.summary_interval
+
+            return False
+
+        site.tokens = min(self.burst, site.tokens + (now - site.updated) * self.rate)
+        site.updated = now
+        if site.tokens >= 1:
+            site.tokens -= 1
+            if site.suppressed:
+                self.pending.append((key, level, site.suppressed))  # The site is allowed to log again.
+                site.suppressed = 0
+
+            return True
+
+        site.blocked_until = now + (1 - site.tokens) / self.rate
+        site.suppressed += 1
+        self.suppressed += 1
+        if site.summary_due <= now:
+            site.summary_due = now + self.summary_interval  # The first summary comes after a full interval.
+
+        return False
+
+    def flush(self) -> None:
+        """
+        Add the summaries of every site that dropped logs since its last summary to `self.pending`.
+
+        :returns void:
+        """
+
+        for (key, level), site in self.sites.items():
+            if site.suppressed:
+                self.pending.append((key, level, site.suppressed))
+                site.suppressed = 0
+
+    def takePending(self) -> list:
+        """
+        Remove and return the pending summaries.
+
+        :returns list: (key, level, suppressed) tuples.
+        """
+
+        pending = self.pending
+        self.pending = []
+        return pending
@@ -25,21 +25,65 @@ SOFTWARE.
 import os
 import sys
 import time
+import threading
 
 from hashlib import blake2b
 
+from .sinks import FileSink
+from .sinks import SharedFileSink
+from .sinks import SpillFile
+from .sinks import _flusher
+from .records import LogRecord
+from .records import LEVEL_CODES
+from .records import LEVEL_NAMES
+from .records import RecordStore
+from .formatting import LogFormat
+from .formatting import BinaryFormat
+from .formatting import JSONLinesFormat
+from .formatting import SITE_FIELDS
+from .formatting import OUTPUT_FORMATS
+from .formatting import levelBit
+from .formatting import sessionBit
+from .formatting import Timestamper
+from .writer import AsyncWriter
+from .metrics import Metrics
+from .limiting import RateLimiter
+from .collector import SocketSink
+from .console import ConsoleSink
+from .console import FLUSH_POLICIES
+
+FLUSH_LEVEL = 2  # Logs of this level code or lower (errors and critical errors) are written out right away.
+DUMP_BATCH = 4096  # The number of logs rendered into each block that is spilled or dumped.
+
 # from . import info as pinfo  # Package info; to avoid confusion with the info method in Logger() class.
 
-# Try to import an optional package
-try:
-    from colorama import init as cm_init
-    from colorama import Fore as cm_fore
-    from colorama import Back as cm_back
-    # from colorama import Style as cm_style
-    COLORAMA_SUPPORT = True
 
-except ImportError:
-    COLORAMA_SUPPORT = False
+def _disabled(msg, *args, **kwargs) -> None:
+    """
+    Replaces the level methods of the levels that are filtered out.
+
+    :returns void:
+    """
+
+
+_call_sites = {}  # The (module, filename, lineno) of each call site, shared by every log made there.
+
+
+def _callSite(frame) -> tuple:
+    """
+    Return the call site of <frame>.
+
+    frame: frame, The frame that made a log.
+
+    :returns tuple: (module, filename, lineno)
+    """
+
+    key = (frame.f_code, frame.f_lineno)
+    site = _call_sites.get(key)
+    if site is None:
+        site = _call_sites.setdefault(key, (frame.f_globals.get("__name__"), frame.f_code.co_filename, frame.f_lineno))
+
+    return site
 
 
 class Logger():
@@ -69,15 +113,79 @@ class Logger():
                      4 = Info
                      5 = Debug
         memory         : bool,    If True, store logs in memory and manually call `dumpLogs()` to dump to file. (Default: False; False when `autoforget` is True or when mode is `append`.)
+        spill_logsize  : int,     With `memory`, the number of logs kept in memory. When there are more, the oldest ones are rendered and moved
+                                  to a temporary spill file until half of them are left. `getAllLogs()` and `query()` only see the logs
+                                  in memory; `dumpLogs()` copies the spill file to the logfile before them. (Default: None; no limit)
+        spill_sz       : float,   With `memory`, the estimated size of the logs kept in memory in MB before the oldest ones are spilled. (Default: None; no limit)
+        spill_dir      : str,     Where to create the spill file. (Default: the directory of the logfile)
         session_id     : str,     The session id of the logger.
         timestamp      : str,     A strftime-compatible format to use. If None, `time.asctime()` is used instead.
-        show_output    : bool,    If True, print the logs to the console. (Default: False)
-        log_format     : str,     The format of the log.
+                                  `%f` (microseconds) and `%1f` to `%6f` (e.g. `%3f` for milliseconds) can be used for sub-second timestamps.
+        show_output    : bool,    If True, print the logs to the console; warnings and more severe logs to stderr, the others to stdout.
+                                  Colors are used for terminals when colorama is installed. (Default: False)
+        console_flush  : str,     When the console output is written out: (Default: `auto`)
+            auto       :          `line` for terminals, `interval` for everything else.
+            line       :          After every log.
+            interval   :          Like the logfile, after `buffer_size` bytes or `flush_interval` seconds, and on `flush()`.
+        caller         : str,     What to capture about the function that made a log: (Default: `auto`)
+            auto       :          Only what `log_format` or the console output needs.
+            none       :          Nothing; `caller` is None.
+            name       :          The function name.
+            full       :          The function name, module, filename and line number.
+        log_format     : str,     The format of the log. A ValueError is raised for unknown placeholders.
            {session_id}: The Session ID of the logger object.
            {type}     : The log level/type.
            {timestamp} : The timestamp of the log.
            {message}   : The message of the log.
-        max_logfile_sz : float,   (WIP) The maximum size of the logfile in MB. Set to `None` to disable limit. (Default: 10)
+           {caller}    : The name of the function that made the log.
+           {module}    : The module of the function that made the log.
+           {filename}  : The file of the function that made the log.
+           {lineno}    : The line number of the call that made the log.
+        output_format  : str,     How logs are written to the logfile: (Default: `text`)
+            text       :          Lines in `log_format`.
+            jsonl      :          JSON Lines with the keys `created`, `level`, `session_id`, `caller` and `msg`,
+                                  plus `module`, `filename` and `lineno` when the call site is captured, and `extra` when the log
+                                  has extra fields (e.g. `logger.info("Done", extra={"job": 42})`).
+            binary     :          Length-prefixed binary records. (See `simplelogger.formatting.BinaryFormat`.)
+                                  `simplelogger.reader.readLogs()` reads the `jsonl` and `binary` formats back.
+        max_logfile_sz : float,   The maximum size of the logfile in MB. The logfile is rotated before it grows past this size. Set to `None` to disable limit. (Default: 10)
+        backup_count   : int,     The number of rotated logfiles to keep. If 0, the logfile is emptied instead of rotated. (Default: 1)
+        rotation       : str,     How rotated logfiles are named: (Default: `numbered`)
+            numbered   :          `<logfile>.1` is the newest, `<logfile>.<backup_count>` the oldest.
+            timestamp  :          `<logfile>.<YYYYmmdd-HHMMSS-microseconds>` of the time of rotation.
+        compression    : str,     Compress rotated logfiles on a background thread with `gzip`, `lzma` or `bz2`. (Default: None)
+        max_backup_sz  : float,   The maximum size of all rotated logfiles together in MB. The oldest ones are removed first. (Default: None; only `backup_count` applies)
+        index          : bool,    If True, write a sidecar index to `<logfile>.idx` with the times, levels and sessions of every block
+                                  written to the logfile, so that `simplelogger.index.queryLogs()` only reads the blocks that match. (Default: False)
+        size_check_interval: float, Ignored; kept for compatibility. The real size of the logfile is checked before every write, and the logfile is
+                                  opened again if another logger or program rotated, removed or replaced it. (Default: None)
+        buffer_size    : int,     The number of bytes to buffer in memory before writing them to the logfile. Set to 0 to write every log immediately.
+                                  Errors and critical errors are always written out immediately, with the logs buffered before them. (Default: 8192)
+        flush_interval : float,   The maximum number of seconds a log stays in the buffer. A background thread writes out the buffer
+                                  when no more logs are written in time. Set to `None` to disable. (Default: 1.0)
+        multiprocess   : bool,    If True, several processes can append to the same logfile. Each buffer flush is one `O_APPEND` write, and
+                                  rotation is coordinated through `<logfile>.lock`. Requires `mode` to be `append` and the `fcntl` module. (Default: False)
+        collector      : str,     The socket path of a collector (`python -m simplelogger collect`). If set, logs are sent to the
+                                  collector, which formats and writes them, and <logfile> is not touched. Requires `mode` to be `append`. (Default: None)
+                                  Logging never raises while the collector (or the disk of the logfile) is unavailable: the logs are kept
+                                  in the buffer and sent again every second, dropping the oldest beyond 1 MiB. `flush()` and `close()`
+                                  raise the error, and the `write_errors` and `dropped_bytes` stats count the failures.
+        asynchronous   : bool,    If True, format and write logs on a background writer thread. Call `close()` to drain it. (Default: False)
+        queue_size     : int,     The maximum number of logs waiting for the writer thread. (Default: 10000)
+        queue_overflow : str,     What to do when the queue is full: (Default: `block`)
+            block      :          Wait for the writer thread.
+            drop       :          Discard the log. Dropped logs are counted in `getLoggerInfo()["stats"]["dropped_logs"]`.
+        rate_limit     : float,   The number of logs per second each function can make at each level. The dropped logs are counted,
+                                  and summarized in a log such as `Suppressed 48,112 records from handler()`. (Default: None; no limit)
+        rate_burst     : int,     The number of logs a function can make at once before `rate_limit` applies. (Default: `rate_limit`)
+        sample_rates   : dict,    {level: probability}; only keep this fraction of the logs of the level, e.g. `{"debug": 0.01}`. (Default: None)
+        summary_interval: float,  The number of seconds between the summaries of a function that stays rate limited. (Default: 60)
+        coalesce       : float,   Collapse identical logs (same level, function and message) made in a row within this many seconds of
+                                  the first one into that log, which gets a `count` and a `last_created` time. Only the first one is
+                                  written, followed by `Last message repeated 4,999 times` when the run ends: when a different log is
+                                  made, on `flush()` and `close()`, or once the window of the first log is over. (Default: None; disabled)
+        metrics        : bool,    If True, count the logs of each level, including the calls of disabled levels, and measure how long
+                                  formatting, console output and writing take. (See `getMetrics()`.) (Default: False)
         """
 
         self.name = str(name)
@@ -107,10 +215,33 @@ class Logger():
         else:
             raise ValueError("mode must be `append` or `overwrite`.")
 
+        # * Get metrics. (Before the log level; the disabled level methods count their calls.)
+        if type(kwargs.get("metrics", False)) is not bool:
+            raise ValueError("metrics must be a boolean.")
+
+        self.__metrics = Metrics() if kwargs.get("metrics", False) else None
+        self.__metrics_base = (0, 0, 0, 0)  # The bytes written, flushes, rotations and dropped logs when the metrics were reset.
+
+        # * Get the rate limit and the sampling.
+        self.__limiter = None
+        if kwargs.get("rate_limit", None) is not None or kwargs.get("sample_rates", None):
+            self.__limiter = RateLimiter(
+                kwargs.get("rate_limit", None),
+                kwargs.get("rate_burst", None),
+                kwargs.get("sample_rates", None),
+                kwargs.get("summary_interval", 60.0)
+            )
+
+        # * Get the coalescing window.
+        self.coalesce = None if kwargs.get("coalesce", None) is None else float(kwargs.get("coalesce"))
+        if self.coalesce is not None and self.coalesce < 0:
+            raise ValueError("coalesce must be a non-negative number or None.")
+
+        self.__run = None  # (code, log) of the log that identical logs are collapsed into.
+        self.__run_lock = threading.Lock()
+
         # * Get log level.
-        self.loglevel = int(kwargs.get("loglevel", 3))
-        if self.loglevel < 1 or self.loglevel > 5:
-            raise ValueError("loglevel must be an integer between 1 and 5.")
+        self.loglevel = kwargs.get("loglevel", 3)
 
         # * Get memory.
         if type(kwargs.get("memory", False)) is bool:
@@ -122,28 +253,124 @@ class Logger():
         else:
             raise ValueError("memory must be a boolean.")
 
+        # * Get the spill settings.
+        self.spill_logsize = None if kwargs.get("spill_logsize", None) is None else int(kwargs.get("spill_logsize"))
+        if self.spill_logsize is not None and self.spill_logsize < 1:
+            raise ValueError("spill_logsize must be a positive integer or None.")
+
+        self.spill_sz = None if kwargs.get("spill_sz", None) is None else float(kwargs.get("spill_sz"))
+        if self.spill_sz is not None and self.spill_sz <= 0:
+            raise ValueError("spill_sz must be a positive number or None.")
+
+        self.__spilling = self.spill_logsize is not None or self.spill_sz is not None
+        if self.__spilling and not self.memory:
+            raise ValueError("`spill_logsize` and `spill_sz` require `memory` to be True.")
+
+        self.spill_dir = kwargs.get("spill_dir", None)
+        self.__spill = None  # The SpillFile, created when logs are first spilled.
+        self.__spilled_logs = 0  # The number of logs in the spill file.
+
         # * Generate or get new session ID.
         self.__session_id = str(kwargs.get("session_id", self.__generateSessionID()))
 
         # * Get timestamp format.
+        self.__timestamper = Timestamper()
         self.timestamp_format = None if kwargs.get("timestamp", None) is None else str(kwargs.get("timestamp"))
 
+        # * Get the output format.
+        self.output_format = str(kwargs.get("output_format", "text"))
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError("output_format must be `text`, `jsonl` or `binary`.")
+
+        # What the logfile is written with. With the `text` output format, it is set together with `log_format`.
+        self.__output = None
+        if self.output_format == "jsonl":
+            self.__output = JSONLinesFormat(self.__session_id)
+
+        elif self.output_format == "binary":
+            self.__output = BinaryFormat(self.__session_id)
+
+        # * Get the write buffer settings.
+        self.buffer_size = int(kwargs.get("buffer_size", 8192))
+        if self.buffer_size < 0:
+            raise ValueError("buffer_size must be a non-negative integer.")
+
+        self.flush_interval = None if kwargs.get("flush_interval", 1.0) is None else float(kwargs.get("flush_interval", 1.0))
+        if self.flush_interval is not None and self.flush_interval < 0:
+            raise ValueError("flush_interval must be a non-negative number or None.")
+
         # * Set show_output.
-        if type(kwargs.get("show_output", False)) is not bool:
-            raise ValueError("show_output must be a boolean.")
+        self.console_flush = str(kwargs.get("console_flush", "auto"))
+        if self.console_flush not in FLUSH_POLICIES:
+            raise ValueError("console_flush must be `auto`, `line` or `interval`.")
 
+        self.__console = None  # The ConsoleSink, created once show_output is set.
+        self.__log_format = None  # Set below; the capture mode depends on it.
         self.show_output = kwargs.get("show_output", False)
 
-        if self.show_output and COLORAMA_SUPPORT:
-            cm_init()  # Initialize colorama if show_output is True.
+        # * Get the caller capture mode.
+        self.caller = str(kwargs.get("caller", "auto"))
 
         # * Set log_format.
-        self.log_format = str(kwargs.get("log_format", ":{type}: [{session_id}] ({timestamp}) {caller} | {message}"))
+        self.log_format = kwargs.get("log_format", ":{type}: [{session_id}] ({timestamp}) {caller} | {message}")
 
         # * Set maximum logfile size. (in megabytes)
         self.max_logfile_sz = None if kwargs.get("max_logfile_sz", 10.0) is None else float(kwargs.get("max_logfile_sz", 10.0))
 
-        self.__session_logs = []  # Create the list that will contain the new logs.
+        # * Get rotation settings.
+        self.backup_count = int(kwargs.get("backup_count", 1))
+        if self.backup_count < 0:
+            raise ValueError("backup_count must be a non-negative integer.")
+
+        self.rotation = str(kwargs.get("rotation", "numbered"))
+        if self.rotation not in ("numbered", "timestamp"):
+            raise ValueError("rotation must be `numbered` or `timestamp`.")
+
+        self.compression = None if kwargs.get("compression", None) is None else str(kwargs.get("compression"))
+        if self.compression not in (None, "gzip", "lzma", "bz2"):
+            raise ValueError("compression must be None, `gzip`, `lzma` or `bz2`.")
+
+        self.max_backup_sz = None if kwargs.get("max_backup_sz", None) is None else float(kwargs.get("max_backup_sz"))
+        self.size_check_interval = None if kwargs.get("size_check_interval", None) is None else float(kwargs.get("size_check_interval"))
+        if type(kwargs.get("index", False)) is not bool:
+            raise ValueError("index must be a boolean.")
+
+        self.index = kwargs.get("index", False)
+        self.__session_bit = sessionBit(self.__session_id)
+        if self.size_check_interval is not None and self.size_check_interval < 0:
+            raise ValueError("size_check_interval must be a non-negative number or None.")
+
+        # * Get multiprocess.
+        if type(kwargs.get("multiprocess", False)) is not bool:
+            raise ValueError("multiprocess must be a boolean.")
+
+        self.multiprocess = kwargs.get("multiprocess", False)
+        if self.multiprocess and self.__mode != "append":
+            raise ValueError("`multiprocess` requires `mode` to be `append`.")
+
+        # * Get the collector.
+        self.collector = None if kwargs.get("collector", None) is None else str(kwargs.get("collector"))
+        if self.collector is not None and (self.__mode != "append" or self.multiprocess):
+            raise ValueError("`collector` requires `mode` to be `append` and `multiprocess` to be False.")
+
+        if self.collector is not None and (self.output_format != "text" or self.index):
+            raise ValueError("The output format and the index of a collector are set by the collector.")
+
+        # * Get the asynchronous mode settings.
+        if type(kwargs.get("asynchronous", False)) is not bool:
+            raise ValueError("asynchronous must be a boolean.")
+
+        self.asynchronous = kwargs.get("asynchronous", False)
+        self.queue_size = int(kwargs.get("queue_size", 10000))
+        if self.queue_size < 1:
+            raise ValueError("queue_size must be a positive integer.")
+
+        self.queue_overflow = str(kwargs.get("queue_overflow", "block"))
+        if self.queue_overflow not in ("block", "drop"):
+            raise ValueError("queue_overflow must be `block` or `drop`.")
+
+        # Create the container of the new logs. With autoforget, it is a ring buffer that drops the oldest log in O(1).
+        self.__session_logs = RecordStore(self.__timestamper, self.logsize if self.autoforget else None)
         self.latest_log = None  # The latest log.
 
         # * Check if logfile already exists.
@@ -158,6 +385,42 @@ class Logger():
             else:
                 raise FileExistsError("The logfile already exists.")
 
+        # The logfile is kept open until `close()` is called.
+        if self.collector is not None:
+            hello = {"name": self.name, "session_id": self.__session_id, "logfile": self.logfile}
+            self.__sink = SocketSink(self.collector, self.buffer_size, self.flush_interval, hello)
+
+        else:
+            self.__sink = (SharedFileSink if self.multiprocess else FileSink)(
+                self.logfile,
+                self.buffer_size,
+                self.flush_interval,
+                max_bytes=None if self.max_logfile_sz is None else int(self.max_logfile_sz * 1024 * 1024),
+                backup_count=self.backup_count,
+                rotation=self.rotation,
+                size_check_interval=self.size_check_interval,
+                compression=self.compression,
+                max_backup_bytes=None if self.max_backup_sz is None else int(self.max_backup_sz * 1024 * 1024),
+                index=self.index
+            )
+
+        # Formatting and I/O happen on the writer thread in asynchronous mode.
+        self.__writer = None
+        if self.asynchronous:
+            self.__writer = AsyncWriter(
+                self.__writeQueued,
+                self.__flushOutput,
+                queue_size=self.queue_size,
+                flush_interval=self.flush_interval,
+                overflow=self.queue_overflow
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @staticmethod
     def __generateSessionID() -> str:
         """
@@ -168,67 +431,251 @@ class Logger():
 
         return blake2b(str(time.time()).encode()).hexdigest().upper()[:8]
 
-    def __timestamper(self) -> str:
+    @property
+    def loglevel(self) -> int:
         """
-        Return time using <self.timestamp_format>.
+        The log level to save. (See the `loglevel` argument of `Logger()`.)
+        Setting it replaces the methods of the disabled levels with a shared no-op.
+        """
+
+        return self.__loglevel
 
-        :returns str: The formatted time.
+    @loglevel.setter
+    def loglevel(self, value: int) -> None:
+        value = int(value)
+        if value < 1 or value > 5:
+            raise ValueError("loglevel must be an integer between 1 and 5.")
+
+        self.__loglevel = value
+        for code, name in enumerate(LEVEL_NAMES):
+            if name is None:
+                continue
+
+            if code <= value:
+                self.__dict__.pop(name, None)  # Use the method of the class again.
+
+            else:
+                setattr(self, name, _disabled if self.__metrics is None else self.__metrics.filteredStub(code))
+
+    @property
+    def show_output(self) -> bool:
+        """
+        If True, print the logs to the console.
         """
 
-        return time.asctime() if self.timestamp_format is None else str(time.strftime(self.timestamp_format))
+        return self.__show_output
+
+    @show_output.setter
+    def show_output(self, value: bool) -> None:
+        if type(value) is not bool:
+            raise ValueError("show_output must be a boolean.")
 
-    def __write_to_file(self, line: str) -> None:
+        self.__show_output = value
+        if value and self.__console is None:
+            self.__console = ConsoleSink(self.console_flush, self.buffer_size, self.flush_interval)
+
+        elif not value and self.__console is not None:
+            self.__console.flush()
+
+        self.__updateCapture()
+
+    @property
+    def caller(self) -> str:
         """
-        Write <line> to a line.
+        What to capture about the function that made a log. (See the `caller` argument of `Logger()`.)
+        """
+
+        return self.__caller
 
-        line: str, the log to write.
+    @caller.setter
+    def caller(self, value: str) -> None:
+        if value not in ("auto", "none", "name", "full"):
+            raise ValueError("caller must be `auto`, `none`, `name` or `full`.")
+
+        self.__caller = value
+        self.__updateCapture()
+
+    def __updateCapture(self) -> None:
+        """
+        Decide how much of the call site the level methods capture.
+        `self.__capture` is None (nothing), `name` (the function name) or `full` (plus module, filename and lineno).
 
         :returns void:
         """
 
-        with open(self.logfile, "a") as file:
-            file.write(self._format_log(line))
+        if self.__log_format is None:
+            return  # Still initializing; called again once log_format is set.
+
+        if self.__caller != "auto":
+            self.__capture = None if self.__caller == "none" else self.__caller
 
-    def _format_log(self, log: dict) -> str:
+        elif self.__output.fields.intersection(SITE_FIELDS):
+            self.__capture = "full"
+
+        elif "caller" in self.__output.fields or self.__show_output:
+            self.__capture = "name"  # The console output of debug logs shows the caller.
+
+        else:
+            self.__capture = None
+
+    @property
+    def log_format(self) -> str:
+        """
+        The format of the logs written to the logfile when `output_format` is `text`. It is compiled into a renderer whenever it is set.
         """
-        Format the log into a string.
 
-        log: dict, the log in dictionary form.
+        return self.__log_format.log_format
 
-        :returns str: The string form of the log.
+    @log_format.setter
+    def log_format(self, value: str) -> None:
+        self.__log_format = LogFormat(str(value), self.__session_id, self.__timestamper)
+        if self.output_format == "text":
+            self.__output = self.__log_format
+
+        self.__updateCapture()
+
+    @property
+    def timestamp_format(self) -> str:
         """
+        The strftime-compatible format of the timestamps. If None, `time.asctime()` is used instead.
+        Changing it also changes how the timestamps of the stored logs are shown.
+        """
+
+        return self.__timestamper.timestamp_format
 
-        return "{0}\n".format(self.log_format.format(
-            session_id=self.__session_id,
-            type=log["type"].upper(),
-            timestamp=log["timestamp"],
-            message=log["msg"],
-            caller=f"{log['caller']}()"
-        ))
+    @timestamp_format.setter
+    def timestamp_format(self, value: str) -> None:
+        self.__timestamper.timestamp_format = None if value is None else str(value)
 
-    def __sizeWatcher(self) -> None:
+    def __write_to_file(self, line: LogRecord) -> None:
         """
-        Monitor the size of the logs and save them to file when it reaches the number of specified log size.
+        Write <line> to the logfile.
+
+        line: LogRecord, the log to write.
 
         :returns void:
         """
 
-        if self.autoforget:
-            if len(self.__session_logs) > self.logsize:
-                self.__session_logs.pop(0)  # Clear the oldest session log.
+        if self.collector is not None:
+            self.__sink.writeRecord(line)  # The collector formats the log.
+
+        elif self.index:
+            self.__sink.write(self.__output.render(line), (line.created, line.created, levelBit(line.level), self.__session_bit))
+
+        else:
+            self.__sink.write(self.__output.render(line))
+
+        if line.level <= FLUSH_LEVEL:
+            self.__sink.flush()
+
+    def __emit(self, log: LogRecord) -> None:
+        """
+        Print <log> and write it to the logfile, or hand it to the writer thread in asynchronous mode.
+
+        log: LogRecord, the log to emit.
+
+        :returns void:
+        """
+
+        if self.__writer is not None:
+            if self.show_output or not self.memory:
+                self.__writer.put(log)
+
+            return
+
+        if self.__metrics is not None:
+            self.__writeBatch([log])  # Measured there.
+            return
+
+        if self.show_output:
+            self.__console.write(log)
+
+        if not self.memory:  # If self.memory is False, save to logfile.
+            self.__write_to_file(log)
+
+    def __writeQueued(self, items: list) -> None:
+        """
+        Print and write the logs taken from the queue. This is called by the writer thread.
+
+        items: list, LogRecord objects, or lists of them queued by `log_many()`.
+
+        :returns void:
+        """
+
+        logs = []
+        for item in items:
+            if type(item) is list:
+                logs.extend(item)
+
+            else:
+                logs.append(item)
+
+        self.__writeBatch(logs)
+
+    def __writeBatch(self, logs: list) -> None:
+        """
+        Print and write a batch of logs with a single write to the sink.
+
+        logs: list, the logs to emit.
+
+        :returns void:
+        """
+
+        metrics = self.__metrics
+        if self.show_output:
+            start = None if metrics is None else time.perf_counter_ns()
+            for log in logs:
+                self.__console.write(log)
+
+            if metrics is not None:
+                metrics.histograms["console"].record((time.perf_counter_ns() - start) // len(logs), len(logs))
+
+        if self.collector is not None:
+            for log in logs:
+                self.__sink.writeRecord(log)
+
+        elif self.memory:
+            pass
+
+        elif metrics is None:
+            self.__sink.write(self.__output.renderMany(logs), self.__indexEntry(logs) if self.index else None)
+
+        else:
+            start = time.perf_counter_ns()
+            data = self.__output.renderMany(logs)
+            formatted = time.perf_counter_ns()
+            self.__sink.write(data, self.__indexEntry(logs) if self.index else None)
+            metrics.histograms["format"].record((formatted - start) // len(logs), len(logs))
+            metrics.histograms["write"].record(time.perf_counter_ns() - formatted)
+
+        if not self.memory and any(log.level <= FLUSH_LEVEL for log in logs):
+            self.__sink.flush()
+
+    def __indexEntry(self, logs: list) -> tuple:
+        """
+        Describe <logs> for the index of the logfile.
+
+        logs: list, The logs to describe.
+
+        :returns tuple: (first created, last created, level mask, session mask)
+        """
 
-        if self.max_logfile_sz is not None:
-            if os.path.exists(self.logfile):
-                if os.path.getsize(self.logfile) > self.max_logfile_sz * 1024 * 1024:
-                    # ? Is this too much to process?
-                    # FIXME: This algorithm degrades performance SIGNIFICANTLY.
-                    with open(self.logfile, 'r') as f:
-                        logs = f.readlines()  # Get ALL logs from the file.
+        levels = 0
+        for level in set(log.level for log in logs):
+            levels |= levelBit(level)
 
-                    with open(self.logfile, 'w') as f:
-                        for i in range(0, len(logs) - 1):
-                            if i != 0:  # Don't write the oldest log. (Which is located at the top of the file)
-                                f.write(logs[i])
+        return (min(log.created for log in logs), max(log.created for log in logs), levels, self.__session_bit)
+
+    def _format_log(self, log: LogRecord) -> str:
+        """
+        Format the log into a string.
+
+        log: LogRecord, the log to format.
+
+        :returns str: The string form of the log.
+        """
+
+        return self.__log_format.render(log)
 
     def dumpLogs(self) -> None:
         """
@@ -241,18 +688,139 @@ class Logger():
         if not self.memory:
             raise PermissionError("self.memory is not True, logs are automatically written to logfile.")
 
-        if self.__mode == "append":
-            mode = 'a'
+        if self.__mode == "overwrite":
+            self.__sink.truncate()
+
+        elif self.__mode != "append":
+            raise ValueError("Invalid mode.")
+
+        # Written through the sink so that the logfile is rotated as usual.
+        # The spilled logs are already rendered and are copied a block at a time.
+        if self.__spill is not None:
+            for data, index in self.__spill.blocks():
+                self.__sink.write(data, index)
+
+        for data, index in self.__renderBlocks(list(self.__session_logs)):
+            self.__sink.write(data, index)
+
+        self.__sink.flush()
+        if self.__sink.error is not None:
+            raise self.__sink.error
+
+    def __renderBlocks(self, logs: list):
+        """
+        Render <logs> in blocks of up to DUMP_BATCH logs. A log that stands
+        for several identical logs is followed by `Last message repeated N times`.
+
+        logs: list, The logs to render.
+
+        :returns generator: (data, index) of each block; <index> is None if `index` is False.
+        """
+
+        for i in range(0, len(logs), DUMP_BATCH):
+            batch = logs[i:i + DUMP_BATCH]
+            rendered = batch
+            if any(log.count > 1 for log in batch):
+                rendered = []
+                for log in batch:
+                    rendered.append(log)
+                    if log.count > 1:
+                        rendered.append(self.__repeated(log))
+
+            yield self.__output.renderMany(rendered), self.__indexEntry(batch) if self.index else None
+
+    def __spillLogs(self) -> None:
+        """
+        Move the oldest logs in memory to the spill file if there are more than `spill_logsize` or they take more than `spill_sz`,
+        until half of the budget is left. The newest log is always kept, as coalescing may still update it.
+
+        :returns void:
+        """
+
+        store = self.__session_logs
+        count = 0
+        if self.spill_logsize is not None and len(store) > self.spill_logsize:
+            count = len(store) - self.spill_logsize // 2
+
+        budget = None if self.spill_sz is None else self.spill_sz * 1024 * 1024
+        if budget is not None and store.nbytes > budget:
+            count = max(count, len(store) - int(len(store) * budget / 2 / store.nbytes))
 
-        elif self.__mode == "overwrite":
-            mode = 'w'
+        count = min(count, len(store) - 1)
+        if count <= 0:
+            return
+
+        if self.__spill is None:
+            self.__spill = SpillFile(
+                os.path.dirname(os.path.abspath(self.logfile)) if self.spill_dir is None else self.spill_dir,
+                self.__sink.encoding
+            )
+
+        for data, index in self.__renderBlocks(store.shift(count)):
+            self.__spill.append(data, index)
+
+        self.__spilled_logs += count
+
+    def flush(self) -> None:
+        """
+        Write the logs in the write buffer to the logfile.
+        In asynchronous mode, this waits for the writer thread to write the queued logs first.
+        Raises the OSError of the write if the logs could not be written; they stay in the buffer and are retried.
+
+        :returns void:
+        """
+
+        if self.coalesce is not None:
+            with self.__run_lock:
+                self.__endRun()
+
+        if self.__writer is not None:
+            self.__writer.sync()
 
         else:
-            raise ValueError("Invalid mode.")
+            self.__flushOutput()
+
+        if self.__sink.error is not None:
+            raise self.__sink.error
 
-        with open(self.logfile, mode) as f:
-            for log in self.__session_logs:
-                f.write(self._format_log(log))
+    def __flushOutput(self) -> None:
+        """
+        Write the buffered logs of the sink and the console out.
+
+        :returns void:
+        """
+
+        self.__sink.flush()
+        if self.__console is not None:
+            self.__console.flush()
+
+    def close(self) -> None:
+        """
+        Drain the writer thread, flush the write buffer and close the logfile.
+        Waits for the rotated logfiles to be compressed.
+
+        :returns void:
+        """
+
+        if self.__limiter is not None:
+            self.__limiter.flush()
+            self.__summarize()
+
+        if self.coalesce is not None:
+            with self.__run_lock:
+                self.__endRun()
+
+        if self.__writer is not None:
+            self.__writer.close()
+
+        if self.__spill is not None:
+            self.__spill.close()
+            self.__spill = None
+
+        if self.__console is not None:
+            self.__console.close()
+
+        self.__sink.close()
 
     def flushLogs(self) -> None:
         """
@@ -265,7 +833,10 @@ class Logger():
         if not self.memory:
             raise PermissionError("self.memory is not True. `autoforget` can be used instead.")
 
-        self.__session_logs = []
+        self.__session_logs.clear()
+        if self.__spill is not None:
+            self.__spill.clear()
+            self.__spilled_logs = 0
 
     def getLoggerInfo(self) -> dict:
         """
@@ -283,186 +854,473 @@ class Logger():
             "mode": self.__mode,
             "loglevel": self.loglevel,
             "memory": self.memory,
+            "spill_logsize": self.spill_logsize,
+            "spill_sz": self.spill_sz,
             "session_id": self.__session_id,
             "timestamp": self.timestamp_format,
             "show_output": self.show_output,
+            "console_flush": self.console_flush,
+            "caller": self.caller,
             "log_format": self.log_format,
+            "output_format": self.output_format,
+            "max_logfile_sz": self.max_logfile_sz,
+            "backup_count": self.backup_count,
+            "rotation": self.rotation,
+            "compression": self.compression,
+            "max_backup_sz": self.max_backup_sz,
+            "index": self.index,
+            "size_check_interval": self.size_check_interval,
+            "buffer_size": self.buffer_size,
+            "flush_interval": self.flush_interval,
+            "multiprocess": self.multiprocess,
+            "collector": self.collector,
+            "asynchronous": self.asynchronous,
+            "metrics": self.metrics,
+            "rate_limit": None if self.__limiter is None else self.__limiter.rate,
+            "coalesce": self.coalesce,
 
             "stats": {
                 "log_size": len(self.__session_logs),
+                "spilled_logs": self.__spilled_logs,
+                "spill_size": 0 if self.__spill is None else self.__spill.size,
+                "logfile_size": self.__sink.size,
+                "queued_logs": 0 if self.__writer is None else self.__writer.qsize(),
+                "dropped_logs": 0 if self.__writer is None else self.__writer.dropped,
+                "suppressed_logs": 0 if self.__limiter is None else self.__limiter.suppressed,
+                "sampled_out_logs": 0 if self.__limiter is None else self.__limiter.sampled_out,
+                "bytes_written": self.__sink.bytes_written,
+                "flushes": self.__sink.flushes,
+                "rotations": self.__sink.rotations,
+                "write_errors": self.__sink.write_errors,
+                "dropped_bytes": self.__sink.dropped_bytes,
+                "metrics": None if self.__metrics is None else self.getMetrics(),
             }
         }
 
-    def getAllLogs(self):
+    def getMetrics(self) -> dict:
         """
-        Return self.__session_logs.
+        Return a snapshot of the metrics since they were last reset.
+        Raises a PermissionError when `metrics` is False.
 
-        :returns list:
+        :returns dict: `emitted` and `filtered` (logs per level), `bytes_written`, `flushes`, `rotations`,
+                       `dropped_logs`, `queued_logs`, and `latency_us`: the latency histograms of the
+                       `format` and `console` stages per log and of the `write` stage per write to the sink,
+                       in microseconds. `since` is when the metrics were last reset.
         """
 
-        return self.__session_logs
+        if self.__metrics is None:
+            raise PermissionError("self.metrics is not True.")
+
+        base_bytes, base_flushes, base_rotations, base_dropped = self.__metrics_base
+        snapshot = self.__metrics.snapshot()
+        snapshot["bytes_written"] = self.__sink.bytes_written - base_bytes
+        snapshot["flushes"] = self.__sink.flushes - base_flushes
+        snapshot["rotations"] = self.__sink.rotations - base_rotations
+        snapshot["dropped_logs"] = (0 if self.__writer is None else self.__writer.dropped) - base_dropped
+        snapshot["queued_logs"] = 0 if self.__writer is None else self.__writer.qsize()
+        return snapshot
 
-    def debug(self, msg: str):
+    def resetMetrics(self) -> dict:
+        """
+        Reset the metrics. Raises a PermissionError when `metrics` is False.
+
+        :returns dict: The snapshot of the metrics before they were reset.
+        """
+
+        snapshot = self.getMetrics()
+        self.__metrics.reset()
+        self.__metrics_base = (
+            self.__sink.bytes_written, self.__sink.flushes, self.__sink.rotations, 0 if self.__writer is None else self.__writer.dropped
+        )
+        return snapshot
+
+    @property
+    def metrics(self) -> bool:
+        """
+        If True, the logger keeps metrics. (See `getMetrics()`.)
         """
-        Log a debug message.
 
-        msg: str, The message to log.
+        return self.__metrics is not None
+
+    def __log(self, level: int, msg, args: tuple, extra: dict = None) -> None:
+        """
+        Store and emit a log. This must be called directly by the level methods.
+
+        level: int,   The level code of the log.
+        msg:   str,   The message to log, or a callable that returns it.
+        args:  tuple, The arguments of <msg>.
+        extra: dict,  The extra fields of the log, or None.
 
         :returns void:
         """
 
-        if self.loglevel >= 5:  # Check if log will be stored.
-            log = {
-                "timestamp": self.__timestamper(),
-                "type": "debug",
-                "msg": msg,
-                "caller": sys._getframe(1).f_code.co_name
-            }
-            if not self.autoforget:
-                self.__session_logs.append(log)
+        frame = None
+        if self.__limiter is not None or self.coalesce is not None:
+            frame = sys._getframe(2)  # The caller of the level method.
 
-            if self.show_output:
-                if COLORAMA_SUPPORT:
-                    print("{0}[{1}DEBUG{0}] {3}(): {1}{2}{0}".format(cm_fore.RESET, cm_fore.LIGHTBLACK_EX, msg, log["caller"]))
+        if self.__limiter is not None:
+            kept = self.__limiter.check(frame.f_code, level)
+            if self.__limiter.pending:
+                self.__summarize()
 
-                else:
-                    print("[DEBUG] {1}(): {0}".format(msg, log["caller"]))
+            if not kept:
+                return
 
-            if not self.memory:  # If self.memory is False, save to logfile.
-                self.__write_to_file(log)
+        if callable(msg):
+            msg = msg(*args)
 
-            self.latest_log = log
+        elif args:
+            msg = msg.format(*args) if '{' in msg else msg % args  # A message without `{}` fields is a `%` format.
+
+        if self.__capture is None:
+            caller = site = None
+
+        else:
+            frame = frame or sys._getframe(2)  # The caller of the level method.
+            caller = frame.f_code.co_name
+            site = None if self.__capture == "name" else _callSite(frame)
+
+        log = LogRecord(level, time.time(), msg, caller, self.__timestamper, site, extra=None if extra is None else dict(extra))
+        if self.coalesce is not None:
+            with self.__run_lock:
+                self.__coalesceLog(log, frame.f_code)
 
-        self.__sizeWatcher()
+            return
 
-    def info(self, msg: str):
+        self.__session_logs.append(log)
+        if self.__spilling:
+            self.__spillLogs()
+
+        if self.__metrics is not None:
+            self.__metrics.emitted[level] += 1
+
+        self.__emit(log)
+
+        self.latest_log = log
+
+    def __coalesceLog(self, log: LogRecord, code) -> None:
         """
-        Log an info message.
+        Collapse <log> into the previous log if it is identical and within the coalescing window, or store and emit it.
+        This must be called with <self.__run_lock> held.
 
-        msg: str, The message to log.
+        log:  LogRecord, The new log.
+        code: code,      The code object of the function that made <log>.
 
         :returns void:
         """
 
-        if self.loglevel >= 4:  # Check if log will be stored.
-            log = {
-                "timestamp": self.__timestamper(),
-                "type": "info",
-                "msg": msg,
-                "caller": sys._getframe(1).f_code.co_name
-            }
-            self.__session_logs.append(log)
+        if self.__metrics is not None:
+            self.__metrics.emitted[log.level] += 1
+
+        run = self.__run
+        if run is not None:
+            first = run[1]
+            if (
+                run[0] is code and first.level == log.level and first.msg == log.msg and first.extra == log.extra
+                and log.created - first.created <= self.coalesce
+            ):
+                first.count += 1
+                first.last_created = log.created
+                self.__session_logs.repeatNewest(first.count, first.last_created)
+                self.latest_log = first
+                if first.count == 2:  # End the run when its window is over, even if no more logs are made.
+                    _flusher.schedule(self, time.monotonic() + first.created + self.coalesce - time.time())
+
+                return
+
+        self.__endRun()
+        self.__session_logs.append(log)
+        if self.__spilling:
+            self.__spillLogs()
+
+        self.__emit(log)
+        self.__run = (code, log)
+        self.latest_log = log
+
+    def __endRun(self) -> None:
+        """
+        End the current run of identical logs, emitting `Last message repeated N times` if there was more than one.
 
-            if self.show_output:
-                if COLORAMA_SUPPORT:
-                    print("{0}[{1}i{0}] {1}{2}{0}".format(cm_fore.RESET, cm_fore.LIGHTGREEN_EX, msg))
+        :returns void:
+        """
+
+        run = self.__run
+        self.__run = None
+        if run is not None and run[1].count > 1:
+            self.__emit(self.__repeated(run[1]))
+
+    def _flushDue(self) -> None:
+        """
+        End the current run of identical logs if its coalescing window is over. Called by the flusher thread.
+
+        :returns void:
+        """
+
+        with self.__run_lock:
+            run = self.__run
+            if run is not None and run[1].count > 1:
+                remaining = run[1].created + self.coalesce - time.time()
+                if remaining < 0:
+                    self.__endRun()
 
                 else:
-                    print("[i] {0}".format(msg))
+                    _flusher.schedule(self, time.monotonic() + remaining)
+
+    def __repeated(self, log: LogRecord) -> LogRecord:
+        """
+        Build the log written after <log> when it stands for several identical logs.
+
+        log: LogRecord, The collapsed log.
+
+        :returns LogRecord:
+        """
+
+        return LogRecord(
+            log.level, log.last_created, "Last message repeated {0:,} times".format(log.count - 1),
+            log.caller, self.__timestamper, log.site
+        )
+
+    def __summarize(self) -> None:
+        """
+        Store and emit the pending summaries of the rate limiter.
+
+        :returns void:
+        """
+
+        if self.coalesce is not None:
+            with self.__run_lock:
+                self.__endRun()
 
-            if not self.memory:  # If self.memory is False, save to logfile.
-                self.__write_to_file(log)
+        for code, level, suppressed in self.__limiter.takePending():
+            log = LogRecord(
+                level, time.time(), "Suppressed {0:,} records from {1}()".format(suppressed, code.co_name),
+                code.co_name, self.__timestamper
+            )
+            self.__session_logs.append(log)
+            if self.__spilling:
+                self.__spillLogs()
 
+            if self.__metrics is not None:
+                self.__metrics.emitted[level] += 1
+
+            self.__emit(log)
             self.latest_log = log
 
-        self.__sizeWatcher()
+    def log_many(self, records) -> int:
+        """
+        Log many messages at once. The messages that pass the level check are
+        timestamped together, stored at once and written with a single write.
+
+        records: iterable, `(level, msg, *args)` tuples or LogRecord objects.
+                           <level> is a level code (1 to 5) or name (e.g. `debug`), and <msg> and <args> work like in the level methods.
+                           LogRecord objects are logged with their own level, time, caller and extra fields.
 
-    def warning(self, msg: str):
+        :returns int: The number of logs stored.
         """
-        Log a warning message.
 
-        msg: str, The message to log.
+        now = time.time()
+        loglevel = self.__loglevel
+        frame = sys._getframe(1)  # Everything in the batch was made by the caller of log_many().
+        if self.__capture is None:
+            caller = site = None
 
-        :returns void:
+        else:
+            caller = frame.f_code.co_name
+            site = None if self.__capture == "name" else _callSite(frame)
+
+        limiter = self.__limiter
+
+        batch = []
+        for record in records:
+            if isinstance(record, LogRecord):
+                if record.level <= loglevel:
+                    if limiter is not None and not limiter.check(frame.f_code, record.level):
+                        continue
+
+                    batch.append(LogRecord(record.level, record.created, record.msg, record.caller, self.__timestamper, record.site, extra=record.extra))
+
+                elif self.__metrics is not None:
+                    self.__metrics.filtered[record.level] += 1
+
+                continue
+
+            level, msg, *args = record
+            level = LEVEL_CODES.get(level, level)
+            if level not in range(1, 6):
+                raise ValueError("level must be an integer between 1 and 5 or a level name.")
+
+            if level > loglevel:
+                if self.__metrics is not None:
+                    self.__metrics.filtered[level] += 1
+
+                continue
+
+            if limiter is not None and not limiter.check(frame.f_code, level):
+                continue
+
+            if callable(msg):
+                msg = msg(*args)
+
+            elif args:
+                msg = msg.format(*args) if '{' in msg else msg % args
+
+            batch.append(LogRecord(level, now, msg, caller, self.__timestamper, site))
+
+        if limiter is not None and limiter.pending:
+            self.__summarize()
+
+        if not batch:
+            return 0
+
+        if self.coalesce is not None:
+            with self.__run_lock:
+                self.__endRun()  # The batch goes after the current run.
+
+        self.__session_logs.extend(batch)
+        if self.__spilling:
+            self.__spillLogs()
+
+        if self.__metrics is not None:
+            for log in batch:
+                self.__metrics.emitted[log.level] += 1
+
+        if self.__writer is not None:
+            if self.show_output or not self.memory:
+                self.__writer.put(batch)
+
+        else:
+            self.__writeBatch(batch)
+
+        self.latest_log = batch[-1]
+        return len(batch)
+
+    def isEnabledFor(self, level) -> bool:
         """
+        Check if logs of <level> will be stored.
 
-        if self.loglevel >= 3:  # Check if log will be stored.
-            log = {
-                "timestamp": self.__timestamper(),
-                "type": "warning",
-                "msg": msg,
-                "caller": sys._getframe(1).f_code.co_name
-            }
-            if not self.autoforget:
-                self.__session_logs.append(log)
+        level: int | str, The level code (1 to 5) or name (e.g. `debug`).
 
-            if self.show_output:
-                if COLORAMA_SUPPORT:
-                    print("{0}[{1}!{0}] {1}{2}{0}".format(cm_fore.RESET, cm_fore.LIGHTYELLOW_EX, msg))
+        :returns bool:
+        """
 
-                else:
-                    print("[!] {0}".format(msg))
+        code = LEVEL_CODES[level] if level in LEVEL_CODES else level
+        if type(code) is not int or code < 1 or code > 5:
+            raise ValueError("loglevel must be an integer between 1 and 5.")
 
-            if not self.memory:  # If self.memory is False, save to logfile.
-                self.__write_to_file(log)
+        return code <= self.__loglevel
 
-            self.latest_log = log
+    def query(self, level=None, loglevel=None, since: float = None, until: float = None, caller: str = None, contains: str = None,
+              limit: int = None, offset: int = 0, newest_first: bool = True) -> list:
+        """
+        Find logs in memory. The logs of each level are indexed, so the time
+        taken depends on the number of logs of the requested levels that are
+        visited, not on the number of logs in memory.
+
+        level        : int | str | list, Only match logs of this level, or of these levels, as codes or names. (Default: None; all levels)
+        loglevel     : int | str,        Only match logs of this level or more severe. (e.g. `error` for errors and critical errors)
+        since        : float,            Only match the logs made at or after this epoch time.
+        until        : float,            Only match the logs made at or before this epoch time.
+        caller       : str,              Only match the logs made by this function.
+        contains     : str,              Only match the logs whose message contains this string.
+        limit        : int,              The maximum number of logs to return. (Default: None; no limit)
+        offset       : int,              The number of matching logs to skip. (Default: 0)
+        newest_first : bool,             If True, return the newest logs first. (Default: True)
+
+        :returns list: The matching logs.
+        """
+
+        levels = set(range(1, len(LEVEL_NAMES)))
+        if level is not None:
+            levels = set(LEVEL_CODES.get(code, code) for code in (level if type(level) in (list, tuple, set) else (level,)))
+
+        if loglevel is not None:
+            loglevel = LEVEL_CODES.get(loglevel, loglevel)
+            levels = set(code for code in levels if type(code) is int and code <= loglevel)
+
+        if not levels.issubset(range(1, len(LEVEL_NAMES))):
+            raise ValueError("level must be an integer between 1 and 5 or a level name.")
+
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError("limit and offset must be non-negative integers.")
 
-        self.__sizeWatcher()
+        return self.__session_logs.query(levels, since, until, caller, contains, limit, offset, newest_first)
 
-    def error(self, msg: str):
+    def getAllLogs(self) -> list:
         """
-        Log an error message.
+        Return the logs in self.__session_logs, oldest first.
 
-        msg: str, The message to log.
+        :returns list:
+        """
 
-        :returns void:
+        return list(self.__session_logs)
+
+    def debug(self, msg, *args, extra: dict = None):
         """
+        Log a debug message.
 
-        if self.loglevel >= 2:  # Check if log will be stored.
-            log = {
-                "timestamp": self.__timestamper(),
-                "type": "error",
-                "msg": msg,
-                "caller": sys._getframe(1).f_code.co_name
-            }
-            if not self.autoforget:
-                self.__session_logs.append(log)
+        msg:  str,   The message to log, or a callable that returns it.
+        args: tuple, Passed to `msg.format()`, to `msg % args` if <msg> has no `{}` fields, or to `msg()`, only if the log will be stored.
+        extra: dict,  Extra fields of the log, written by the `jsonl` and `binary` output formats.
 
-            if self.show_output:
-                if COLORAMA_SUPPORT:
-                    print("{0}[{1}E{0}] {1}{2}{0}".format(cm_fore.RESET, cm_fore.LIGHTRED_EX, msg))
+        :returns void:
+        """
 
-                else:
-                    print("[E] {0}".format(msg))
+        if self.__loglevel >= 5:  # Check if log will be stored.
+            self.__log(5, msg, args, extra)
 
-            if not self.memory:  # If self.memory is False, save to logfile.
-                self.__write_to_file(log)
+    def info(self, msg, *args, extra: dict = None):
+        """
+        Log an info message.
 
-            self.latest_log = log
+        msg:  str,   The message to log, or a callable that returns it.
+        args: tuple, Passed to `msg.format()`, to `msg % args` if <msg> has no `{}` fields, or to `msg()`, only if the log will be stored.
+        extra: dict,  Extra fields of the log, written by the `jsonl` and `binary` output formats.
 
-        self.__sizeWatcher()
+        :returns void:
+        """
+
+        if self.__loglevel >= 4:  # Check if log will be stored.
+            self.__log(4, msg, args, extra)
 
-    def critical(self, msg: str):
+    def warning(self, msg, *args, extra: dict = None):
         """
-        Log a critical error message.
+        Log a warning message.
 
-        msg: str, The message to log.
+        msg:  str,   The message to log, or a callable that returns it.
+        args: tuple, Passed to `msg.format()`, to `msg % args` if <msg> has no `{}` fields, or to `msg()`, only if the log will be stored.
+        extra: dict,  Extra fields of the log, written by the `jsonl` and `binary` output formats.
 
         :returns void:
         """
 
-        if self.loglevel >= 1:  # Check if log will be stored.
-            log = {
-                "timestamp": self.__timestamper(),
-                "type": "critical",
-                "msg": msg,
-                "caller": sys._getframe(1).f_code.co_name
-            }
-            if not self.autoforget:
-                self.__session_logs.append(log)
+        if self.__loglevel >= 3:  # Check if log will be stored.
+            self.__log(3, msg, args, extra)
 
-            if self.show_output:
-                if COLORAMA_SUPPORT:
-                    print("{0}{3}[{1}CRITICAL{0}] {2}{4}".format(cm_fore.RESET, cm_fore.BLACK, msg, cm_back.LIGHTRED_EX, cm_back.RESET))
+    def error(self, msg, *args, extra: dict = None):
+        """
+        Log an error message.
 
-                else:
-                    print("[CRITICAL] {0}".format(msg))
+        msg:  str,   The message to log, or a callable that returns it.
+        args: tuple, Passed to `msg.format()`, to `msg % args` if <msg> has no `{}` fields, or to `msg()`, only if the log will be stored.
+        extra: dict,  Extra fields of the log, written by the `jsonl` and `binary` output formats.
+
+        :returns void:
+        """
 
-            if not self.memory:  # If self.memory is False, save to logfile.
-                self.__write_to_file(log)
+        if self.__loglevel >= 2:  # Check if log will be stored.
+            self.__log(2, msg, args, extra)
 
-            self.latest_log = log
+    def critical(self, msg, *args, extra: dict = None):
+        """
+        Log a critical error message.
+
+        msg:  str,   The message to log, or a callable that returns it.
+        args: tuple, Passed to `msg.format()`, to `msg % args` if <msg> has no `{}` fields, or to `msg()`, only if the log will be stored.
+        extra: dict,  Extra fields of the log, written by the `jsonl` and `binary` output formats.
+
+        :returns void:
+        """
 
-        self.__sizeWatcher()
+        if self.__loglevel >= 1:  # Check if log will be stored.
+            self.__log(1, msg, args, extra)
 
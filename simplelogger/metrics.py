@@ -0,0 +1,214 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+
+from .records import LEVEL_NAMES
+
+SUB_BUCKET_BITS = 3  # Each power of two is split into 2 ** SUB_BUCKET_BITS buckets, so values are recorded within 12.5%.
+BUCKET_COUNT = 320  # Enough for values up to 2 ** 40 nanoseconds (about 18 minutes); larger values go in the last bucket.
+
+
+class Histogram():
+    """
+    A latency histogram with log-linear buckets, like an HDR histogram:
+    small values are counted exactly, and larger ones in buckets whose width
+    is a fixed fraction of their value. Recording a value is one
+    `int.bit_length()` and a list increment.
+    """
+
+    def __init__(self):
+        """
+        The initialization method of the Histogram() class.
+        """
+
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Remove all recorded values.
+
+        :returns void:
+        """
+
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def bucket(value: int) -> int:
+        """
+        Return the index of the bucket of <value>.
+
+        value: int, A non-negative integer.
+
+        :returns int:
+        """
+
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value
+
+        return min(BUCKET_COUNT - 1, (shift << SUB_BUCKET_BITS) + (value >> shift))
+
+    @staticmethod
+    def bounds(index: int) -> tuple:
+        """
+        Return the range of values counted in the bucket at <index>.
+
+        :returns tuple: (lowest value, highest value)
+        """
+
+        sub_buckets = 1 << SUB_BUCKET_BITS
+        if index < 2 * sub_buckets:
+            return (index, index)
+
+        shift = (index >> SUB_BUCKET_BITS) - 1
+        low = (index - (shift << SUB_BUCKET_BITS)) << shift
+        return (low, low + (1 << shift) - 1)
+
+    def record(self, value: int, count: int = 1) -> None:
+        """
+        Record <value> <count> times.
+
+        value: int, The value, e.g. a duration in nanoseconds.
+        count: int, The number of times to record it.
+
+        :returns void:
+        """
+
+        self.counts[self.bucket(value)] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Return the value below which <percentile> percent of the recorded values fall.
+        The value is the middle of its bucket, and is never larger than the largest recorded value.
+
+        :returns int: The value, or 0 if nothing was recorded.
+        """
+
+        if not self.count:
+            return 0
+
+        rank = self.count * percentile / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                low, high = self.bounds(index)
+                return min(self.max, (low + high) // 2)
+
+        return self.max
+
+    def snapshot(self, scale: float = 1.0) -> dict:
+        """
+        Summarize the recorded values, multiplied by <scale>.
+
+        :returns dict: {"count", "min", "mean", "p50", "p90", "p99", "p999", "max"}
+        """
+
+        return {
+            "count": self.count,
+            "min": (self.min or 0) * scale,
+            "mean": (self.total / self.count if self.count else 0) * scale,
+            "p50": self.percentile(50) * scale,
+            "p90": self.percentile(90) * scale,
+            "p99": self.percentile(99) * scale,
+            "p999": self.percentile(99.9) * scale,
+            "max": self.max * scale,
+        }
+
+
+class Metrics():
+    """
+    The counters and latency histograms of a logger.
+
+    The counters are updated without a lock, so logs made at the same moment
+    by several threads can occasionally be counted once.
+    """
+
+    STAGES = ("format", "console", "write")  # The timed stages of writing a log.
+
+    def __init__(self):
+        """
+        The initialization method of the Metrics() class.
+        """
+
+        self.histograms = {stage: Histogram() for stage in self.STAGES}
+        self.emitted = [0] * len(LEVEL_NAMES)  # The number of stored logs of each level code.
+        self.filtered = [0] * len(LEVEL_NAMES)  # The number of calls of disabled level methods.
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Set the counters to 0 and empty the histograms.
+
+        :returns void:
+        """
+
+        # In place; the stubs of `filteredStub()` keep a reference to the list.
+        self.emitted[:] = [0] * len(LEVEL_NAMES)
+        self.filtered[:] = [0] * len(LEVEL_NAMES)
+        self.since = time.time()
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def filteredStub(self, level: int):
+        """
+        Return a replacement for the method of the disabled <level> that only counts its calls.
+
+        level: int, The level code.
+
+        :returns function:
+        """
+
+        filtered = self.filtered
+
+        def count(msg, *args, **kwargs):
+            filtered[level] += 1
+
+        return count
+
+    def snapshot(self) -> dict:
+        """
+        Return the counters, and the histograms in microseconds.
+
+        :returns dict:
+        """
+
+        return {
+            "since": self.since,
+            "emitted": {LEVEL_NAMES[code]: self.emitted[code] for code in range(1, len(LEVEL_NAMES))},
+            "filtered": {LEVEL_NAMES[code]: self.filtered[code] for code in range(1, len(LEVEL_NAMES))},
+            "latency_us": {stage: histogram.snapshot(0.001) for stage, histogram in self.histograms.items()},
+        }
@@ -0,0 +1,344 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+"""
+Read the logfiles written with the `jsonl` and `binary` output formats.
+Compressed segments (`.gz`, `.xz` and `.bz2`) are decompressed while reading.
+
+The readers are generators; the logfile is read in chunks, so files of any
+size can be processed one log at a time. Every log is yielded as a dictionary
+with the keys of the JSON Lines format: `created`, `level`, `session_id`,
+`caller` and `msg`, plus `module`, `filename` and `lineno` when the call site
+was captured, and `extra` when the log has extra fields.
+"""
+
+import os
+import json
+import time
+
+from .sinks import openSegment
+from .formatting import BINARY_MAGIC
+from .formatting import BINARY_VERSION
+from .formatting import BINARY_HEADER
+from .formatting import BINARY_RECORD
+from .formatting import BINARY_SITE
+from .formatting import BINARY_CALLER
+from .formatting import BINARY_HAS_SITE
+from .formatting import BINARY_HAS_EXTRA
+from .formatting import BINARY_EXTRA
+
+READ_SIZE = 1024 * 1024  # The number of bytes read from the logfile at a time.
+
+
+def detectFormat(start: bytes) -> str:
+    """
+    Tell the output format of a logfile from its first bytes.
+
+    start: bytes, At least the first two bytes of the logfile.
+
+    :returns str: `binary`, `jsonl` or `text`.
+    """
+
+    if start[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return "binary"
+
+    return "jsonl" if start[:1] == b'{' else "text"
+
+
+def readJSONLines(stream):
+    """
+    Read logs in the `jsonl` output format from <stream>.
+
+    stream: file, A file opened in binary mode.
+
+    :returns generator: The logs as dictionaries.
+    """
+
+    loads = json.loads
+    for line in stream:
+        if line.strip():
+            yield loads(line)
+
+
+def parseBinary(buffer, offset: int = 0) -> tuple:
+    """
+    Decode the complete records at the start of <buffer>, which holds logs in the `binary` output format.
+    Records of unknown schema versions are skipped.
+
+    buffer : bytes, The data to decode.
+    offset : int,   The position of <buffer> in its file, for error messages.
+
+    :returns tuple: (logs, the number of bytes decoded)
+    """
+
+    header_size = BINARY_HEADER.size
+    record_size = BINARY_RECORD.size
+    site_size = BINARY_SITE.size
+    logs = []
+    position = 0
+    while len(buffer) - position >= header_size:
+        magic, version, length = BINARY_HEADER.unpack_from(buffer, position)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Not a binary log record at offset {0}.".format(offset + position))
+
+        start = position + header_size
+        end = start + length
+        if len(buffer) < end:
+            break
+
+        position = end
+        if version != BINARY_VERSION:
+            continue
+
+        level, flags, created, session_id_length, caller_length, msg_length = BINARY_RECORD.unpack_from(buffer, start)
+        i = start + record_size
+        j = i + session_id_length
+        k = j + caller_length
+        n = k + msg_length
+        log = {
+            "created": created,
+            "level": level,
+            "session_id": str(buffer[i:j], "utf-8"),
+            "caller": str(buffer[j:k], "utf-8") if flags & BINARY_CALLER else None,
+            "msg": str(buffer[k:n], "utf-8")
+        }
+        if flags & BINARY_HAS_SITE:
+            module_length, filename_length, lineno = BINARY_SITE.unpack_from(buffer, n)
+            i = n + site_size
+            j = i + module_length
+            n = j + filename_length
+            log["module"] = str(buffer[i:j], "utf-8")
+            log["filename"] = str(buffer[j:n], "utf-8")
+            log["lineno"] = lineno
+
+        if flags & BINARY_HAS_EXTRA:
+            i = n + BINARY_EXTRA.size
+            log["extra"] = json.loads(str(buffer[i:i + BINARY_EXTRA.unpack_from(buffer, n)[0]], "utf-8"))
+
+        logs.append(log)
+
+    return logs, position
+
+
+def readBinary(stream, chunk_size: int = READ_SIZE):
+    """
+    Read logs in the `binary` output format from <stream>.
+    Records of unknown schema versions are skipped, and an incomplete record
+    at the end of <stream> (e.g. one that is still being written) is ignored.
+
+    stream     : file, A file opened in binary mode.
+    chunk_size : int,  The number of bytes to read at a time.
+
+    :returns generator: The logs as dictionaries.
+    """
+
+    buffer = bytearray()
+    offset = 0  # The position of <buffer> in <stream>.
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+
+        buffer += chunk
+        logs, position = parseBinary(buffer, offset)
+        yield from logs
+        del buffer[:position]
+        offset += position
+
+
+def readLogs(path: str, output_format: str = None):
+    """
+    Read the logs in the logfile at <path>.
+
+    path          : str, The path of the logfile or of a (compressed) segment.
+    output_format : str, `jsonl` or `binary`. If None, it is detected from the start of the logfile.
+
+    :returns generator: The logs as dictionaries.
+    """
+
+    with openSegment(path) as f:
+        if output_format is None:
+            start = f.read(len(BINARY_MAGIC))
+            f.seek(0)
+            if not start:
+                return
+
+            output_format = detectFormat(start)
+
+        if output_format == "jsonl":
+            yield from readJSONLines(f)
+
+        elif output_format == "binary":
+            yield from readBinary(f)
+
+        else:
+            raise ValueError("The logfile is not in the `jsonl` or `binary` output format.")
+
+
+def follow(path: str, offset: int = None, output_format: str = None, timeout: float = None, **kwargs):
+    """
+    Yield the logs appended to the logfile at <path> as they are written, like `tail -f`.
+
+    The logfile is read in large chunks. When there is nothing new, it is
+    polled with an exponential backoff between <min_interval> and
+    <max_interval>, so following a busy logfile costs little and an idle one
+    almost nothing. When the logfile is rotated (the path points to a new
+    file), the rest of the old file is read and the new one is followed from
+    its start; when it is truncated, it is followed from its start again.
+
+    Logs in the `jsonl` and `binary` output formats are yielded as
+    dictionaries (see above), and lines in the `text` output format as strings.
+
+    path          : str,   The path of the logfile. If it does not exist yet, it is waited for.
+    offset        : int,   Where to start reading. (Default: None; at the end of the logfile)
+    output_format : str,   `text`, `jsonl` or `binary`. If None, it is detected from the start of the logfile.
+    timeout       : float, Return once nothing was written for this many seconds. (Default: None; never)
+    kwargs        : dict,  The keyword arguments.
+
+    Available kwargs:
+    min_interval   : float,   The first wait after a poll that found nothing new. (Default: 0.01)
+    max_interval   : float,   The longest wait between polls. (Default: 1.0)
+    chunk_size     : int,     The number of bytes to read at a time. (Default: 1 MiB)
+
+    :returns generator: The logs.
+    """
+
+    min_interval = float(kwargs.get("min_interval", 0.01))
+    max_interval = float(kwargs.get("max_interval", 1.0))
+    chunk_size = int(kwargs.get("chunk_size", READ_SIZE))
+    interval = min_interval
+    last_data = time.monotonic()
+
+    f = None
+    identity = None  # The (inode, device) of the open file.
+    position = 0  # The position in the open file up to which it was read.
+    buffer = bytearray()  # Read data that does not end with a complete record yet.
+
+    def decode(final: bool = False) -> list:
+        """
+        Take the complete records out of <buffer>. If <final>, the file will not grow anymore,
+        so a last line without a newline is complete too.
+
+        :returns list: The logs.
+        """
+
+        if output_format == "binary":
+            logs, end = parseBinary(buffer, position - len(buffer))
+
+        else:
+            end = len(buffer) if final else buffer.rfind(b'\n') + 1
+            lines = bytes(buffer[:end]).splitlines(True)
+            if output_format == "jsonl":
+                logs = [json.loads(line) for line in lines if line.strip()]
+
+            else:
+                logs = [line.decode("utf-8", "replace") for line in lines]
+
+        del buffer[:end]
+        return logs
+
+    def drain() -> list:
+        """
+        Read the open file to its end before it is left, e.g. for the file that replaced it after a rotation.
+
+        :returns list: The logs.
+        """
+
+        nonlocal position, output_format
+        logs = []
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+
+            if output_format is None:
+                output_format = detectFormat(chunk)
+
+            buffer.extend(chunk)
+            position += len(chunk)
+            logs.extend(decode())
+
+        logs.extend(decode(final=True))
+        buffer.clear()  # An incomplete binary record that was never finished.
+        return logs
+
+    try:
+        while True:
+            if f is None:
+                try:
+                    f = open(path, "rb")
+
+                except FileNotFoundError:
+                    offset = 0  # Everything written to it once it is created is new.
+
+                if f is not None:
+                    stat = os.fstat(f.fileno())
+                    identity = (stat.st_ino, stat.st_dev)
+                    position = stat.st_size if offset is None else min(offset, stat.st_size)
+                    offset = 0  # The files that replace this one are followed from their start.
+                    if output_format is None and stat.st_size:
+                        output_format = detectFormat(f.read(len(BINARY_MAGIC)))
+
+                    f.seek(position)
+
+            chunk = None if f is None else f.read(chunk_size)
+            if chunk:
+                if output_format is None:
+                    output_format = detectFormat(chunk)
+
+                buffer += chunk
+                position += len(chunk)
+                yield from decode()
+                interval = min_interval
+                last_data = time.monotonic()
+                continue
+
+            try:
+                stat = os.stat(path)
+
+            except FileNotFoundError:
+                stat = None  # Between the rotation and the creation of the new logfile.
+
+            if f is not None and stat is not None:
+                if (stat.st_ino, stat.st_dev) != identity:
+                    yield from drain()  # Rotated; what was written to the old file since the last read comes first.
+                    f.close()
+                    f = None
+                    continue
+
+                if stat.st_size < position:
+                    yield from drain()  # Truncated.
+                    f.seek(0)
+                    position = 0
+                    continue
+
+            if timeout is not None and time.monotonic() - last_data >= timeout:
+                return
+
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
+
+    finally:
+        if f is not None:
+            f.close()
@@ -0,0 +1,494 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import sys
+import heapq
+import itertools
+import threading
+
+from array import array
+from collections.abc import Mapping
+
+# The level names, indexed by their level code. (The same numbers as `loglevel`.)
+LEVEL_NAMES = (None, "critical", "error", "warning", "info", "debug")
+LEVEL_CODES = {name: code for code, name in enumerate(LEVEL_NAMES) if name is not None}
+RECORD_OVERHEAD = 33  # The bytes a stored log takes besides its message: its level, time, index entry and list slots.
+
+
+class LogRecord(Mapping):
+    """
+    A single log. It can be read like the dictionaries the logger used to store:
+    `timestamp`, `type`, `msg` and `caller`, plus `created`, the epoch time the
+    `timestamp` is rendered from. When the call site was captured, `module`,
+    `filename` and `lineno` are available too. A log that stands for several
+    identical logs in a row (see the `coalesce` argument of `Logger()`) also
+    has `count` and `last_created`, the time of the last of them, and a log
+    made with extra fields has `extra`.
+    """
+
+    __slots__ = ("level", "created", "msg", "caller", "timestamper", "site", "count", "last_created", "extra")
+    _keys = ("timestamp", "type", "msg", "caller", "created")
+    _site_keys = _keys + ("module", "filename", "lineno")
+    _repeat_keys = ("count", "last_created")
+
+    def __init__(self, level: int, created: float, msg: str, caller: str, timestamper, site: tuple = None, count: int = 1, last_created: float = None,
+                 extra: dict = None):
+        """
+        The initialization method of the LogRecord() class.
+
+        level       : int,      The level code of the log.
+        created     : float,    The time the log was made in seconds since the epoch.
+        msg         : str,      The message of the log.
+        caller      : str,      The name of the function that made the log, or None if it was not captured.
+        timestamper : callable, Renders <created> as the `timestamp` of the log.
+        site        : tuple,    The (module, filename, lineno) of the call, or None if it was not captured.
+        count       : int,      The number of identical logs in a row this log stands for.
+        last_created: float,    The time the last of them was made, or None if <count> is 1.
+        extra       : dict,     Extra fields of the log, or None.
+        """
+
+        self.level = level
+        self.created = created
+        self.msg = msg
+        self.caller = caller
+        self.timestamper = timestamper
+        self.site = site
+        self.count = count
+        self.last_created = last_created
+        self.extra = extra
+
+    @property
+    def timestamp(self) -> str:
+        return self.timestamper(self.created)
+
+    @property
+    def type(self) -> str:
+        return LEVEL_NAMES[self.level]
+
+    @property
+    def module(self) -> str:
+        return None if self.site is None else self.site[0]
+
+    @property
+    def filename(self) -> str:
+        return None if self.site is None else self.site[1]
+
+    @property
+    def lineno(self) -> int:
+        return None if self.site is None else self.site[2]
+
+    def __fields(self) -> tuple:
+        fields = self._keys if self.site is None else self._site_keys
+        if self.count != 1:
+            fields += self._repeat_keys
+
+        return fields if self.extra is None else fields + ("extra",)
+
+    def __getitem__(self, key: str):
+        if key not in self.__fields():
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__fields())
+
+    def __len__(self) -> int:
+        return len(self.__fields())
+
+    def __repr__(self) -> str:
+        return "LogRecord({0})".format(dict(self))
+
+
+class RecordStore():
+    """
+    A columnar store of logs. Level codes, times, messages and callers are kept
+    in separate arrays instead of one object per log. If <capacity> is set, the
+    store is a ring buffer that overwrites the oldest log when it is full.
+
+    Every log gets a sequence number, and the sequence numbers of each level
+    are kept in order in a per-level index, so `query()` only visits the logs
+    of the requested levels.
+
+    `nbytes` is an estimate of the memory the logs take. The store can be
+    used from several threads; a log is added to all columns under one lock.
+    """
+
+    def __init__(self, timestamper, capacity: int = None):
+        """
+        The initialization method of the RecordStore() class.
+
+        timestamper : callable, Renders the `timestamp` of the logs.
+        capacity    : int,      The maximum number of logs to keep. (Default: None; unlimited)
+        """
+
+        if capacity is not None and capacity < 0:
+            raise ValueError("capacity must be a non-negative integer or None.")
+
+        self.timestamper = timestamper
+        self.capacity = capacity
+        self.__lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove all logs.
+
+        :returns void:
+        """
+
+        with self.__lock:
+            self.__reset()
+
+    def __reset(self) -> None:
+        """
+        Create the empty columns and indexes. The caller must hold `self.__lock`.
+
+        :returns void:
+        """
+
+        self.__levels = array('B')
+        self.__created = array('d')
+        self.__msgs = []
+        self.__callers = []
+        self.__sites = None  # Only created once a log with a call site is added.
+        self.__repeats = {}  # {position: (count, last_created)} of the logs that stand for several identical logs.
+        self.__extras = {}  # {position: extra} of the logs with extra fields.
+        self.__start = 0  # The position of the oldest log when the ring buffer is full.
+        self.__shifted = 0  # The number of logs removed by `shift()`; the sequence number of the log at position 0.
+        self.__count = 0  # The number of logs added, and the sequence number of the next log.
+        self.__index = [array('Q') for _ in LEVEL_NAMES]  # The sequence numbers of the logs of each level.
+        self.__heads = [0] * len(LEVEL_NAMES)  # The number of evicted sequence numbers at the start of each index.
+        self.__ordered = True  # False once a log older than the previous one is added.
+        self.nbytes = 0
+
+    def append(self, record: LogRecord) -> None:
+        """
+        Add <record> to the store, dropping the oldest log if the store is full.
+
+        record: LogRecord, The log to add.
+
+        :returns void:
+        """
+
+        with self.__lock:
+            self.__append(record)
+
+    def __append(self, record: LogRecord) -> None:
+        """
+        Add <record> to the store. The caller must hold `self.__lock`.
+
+        :returns void:
+        """
+
+        caller = record.caller if record.caller is None else sys.intern(record.caller)
+        if record.site is not None and self.__sites is None:
+            self.__sites = [None] * len(self.__msgs)
+
+        if self.__ordered and self.__created and record.created < self.__created[(self.__start or len(self.__created)) - 1]:
+            self.__ordered = False
+
+        self.nbytes += RECORD_OVERHEAD + sys.getsizeof(record.msg)
+        if self.capacity is None or len(self.__msgs) < self.capacity:
+            self.__index[record.level].append(self.__count)
+            self.__count += 1
+            self.__levels.append(record.level)
+            self.__created.append(record.created)
+            self.__msgs.append(record.msg)
+            self.__callers.append(caller)
+            if self.__sites is not None:
+                self.__sites.append(record.site)
+
+            if record.extra is not None:
+                self.__extras[len(self.__msgs) - 1] = record.extra
+
+        elif self.capacity:
+            i = self.__start
+            self.__evict(self.__levels[i])
+            self.nbytes -= RECORD_OVERHEAD + sys.getsizeof(self.__msgs[i])
+            if self.__repeats:
+                self.__repeats.pop(i, None)
+
+            if record.extra is not None:
+                self.__extras[i] = record.extra
+
+            elif self.__extras:
+                self.__extras.pop(i, None)
+
+            self.__index[record.level].append(self.__count)
+            self.__count += 1
+            self.__levels[i] = record.level
+            self.__created[i] = record.created
+            self.__msgs[i] = record.msg
+            self.__callers[i] = caller
+            if self.__sites is not None:
+                self.__sites[i] = record.site
+
+            self.__start = (i + 1) % self.capacity
+
+    def extend(self, records: list) -> None:
+        """
+        Add <records> to the store, oldest first.
+
+        records: list, The logs to add.
+
+        :returns void:
+        """
+
+        with self.__lock:
+            if self.capacity is not None or self.__sites is not None or any(record.site is not None or record.extra is not None for record in records):
+                for record in records:
+                    self.__append(record)
+
+            else:
+                self.__extend(records)
+
+    def __extend(self, records: list) -> None:
+        """
+        Add <records>, none of which has a call site or extra fields, to a store without a capacity. The caller must hold `self.__lock`.
+
+        :returns void:
+        """
+
+        created = [record.created for record in records]
+        if self.__ordered and (
+            (self.__created and created and created[0] < self.__created[-1])
+            or any(created[i] < created[i - 1] for i in range(1, len(created)))
+        ):
+            self.__ordered = False
+
+        index = self.__index
+        for seq, record in enumerate(records, self.__count):
+            index[record.level].append(seq)
+
+        self.__count += len(records)
+        intern = sys.intern
+        self.__levels.extend(array('B', [record.level for record in records]))
+        self.__created.extend(array('d', created))
+        self.__msgs.extend([record.msg for record in records])
+        self.nbytes += RECORD_OVERHEAD * len(records) + sum(sys.getsizeof(record.msg) for record in records)
+        self.__callers.extend([record.caller if record.caller is None else intern(record.caller) for record in records])
+
+    def shift(self, count: int) -> list:
+        """
+        Remove the <count> oldest logs. Only stores without a capacity can be shifted.
+
+        count: int, The number of logs to remove.
+
+        :returns list: The removed logs, oldest first.
+        """
+
+        if self.capacity is not None:
+            raise ValueError("Only a store without a capacity can be shifted.")
+
+        with self.__lock:
+            return self.__shift(count)
+
+    def __shift(self, count: int) -> list:
+        """
+        Remove the <count> oldest logs. The caller must hold `self.__lock`.
+
+        :returns list:
+        """
+
+        count = min(count, len(self.__msgs))
+        records = [self.__record(i) for i in range(count)]
+        for level in self.__levels[:count]:
+            self.__evict(level)
+
+        self.nbytes -= RECORD_OVERHEAD * count + sum(map(sys.getsizeof, self.__msgs[:count]))
+        del self.__levels[:count]
+        del self.__created[:count]
+        del self.__msgs[:count]
+        del self.__callers[:count]
+        if self.__sites is not None:
+            del self.__sites[:count]
+
+        if self.__repeats:
+            self.__repeats = {i - count: repeat for i, repeat in self.__repeats.items() if i >= count}
+
+        if self.__extras:
+            self.__extras = {i - count: extra for i, extra in self.__extras.items() if i >= count}
+
+        self.__shifted += count
+        return records
+
+    def __evict(self, level: int) -> None:
+        """
+        Remove the oldest sequence number from the index of <level>, as the oldest log is overwritten.
+        The caller must hold `self.__lock`.
+
+        :returns void:
+        """
+
+        head = self.__heads[level] + 1
+        index = self.__index[level]
+        if head >= 1024 and head * 2 >= len(index):
+            del index[:head]  # Compact once the evicted part is large enough to be worth it.
+            head = 0
+
+        self.__heads[level] = head
+
+    def __position(self, seq: int) -> int:
+        """
+        Return the physical position of the log with the sequence number <seq>.
+
+        :returns int:
+        """
+
+        return seq - self.__shifted if self.capacity is None else seq % self.capacity
+
+    def __bisect(self, index: array, lo: int, created: float, right: bool) -> int:
+        """
+        Find where <created> would go in the sequence numbers <index>[lo:], by the time of their logs.
+        Only valid while the logs are in time order.
+
+        :returns int: The first position whose log is newer than (if <right>) or at least as new as <created>.
+        """
+
+        hi = len(index)
+        times = self.__created
+        position = self.__position
+        while lo < hi:
+            middle = (lo + hi) // 2
+            value = times[position(index[middle])]
+            if value < created or (right and value == created):
+                lo = middle + 1
+
+            else:
+                hi = middle
+
+        return lo
+
+    def query(self, levels=None, since: float = None, until: float = None, caller: str = None, contains: str = None,
+              limit: int = None, offset: int = 0, newest_first: bool = True) -> list:
+        """
+        Find logs. Only the indexes of <levels> are visited; while the logs
+        are stored in time order, <since> and <until> are found by binary search.
+
+        levels       : iterable, The level codes to match. (Default: None; all levels)
+        since        : float,    Only match the logs made at or after this epoch time.
+        until        : float,    Only match the logs made at or before this epoch time.
+        caller       : str,      Only match the logs made by this function.
+        contains     : str,      Only match the logs whose message contains this string.
+        limit        : int,      The maximum number of logs to return. (Default: None; no limit)
+        offset       : int,      The number of matching logs to skip.
+        newest_first : bool,     If True, return the newest logs first.
+
+        :returns list: The matching logs.
+        """
+
+        with self.__lock:
+            return self.__query(levels, since, until, caller, contains, limit, offset, newest_first)
+
+    def __query(self, levels, since: float, until: float, caller: str, contains: str, limit: int, offset: int, newest_first: bool) -> list:
+        """
+        Find logs. (See `query()`.) The caller must hold `self.__lock`, so that no log is added or overwritten meanwhile.
+
+        :returns list:
+        """
+
+        streams = []
+        for level in range(1, len(LEVEL_NAMES)) if levels is None else sorted(set(levels)):
+            index = self.__index[level]
+            lo = self.__heads[level]
+            hi = len(index)
+            if self.__ordered:
+                if since is not None:
+                    lo = self.__bisect(index, lo, since, False)
+
+                if until is not None:
+                    hi = self.__bisect(index, lo, until, True)
+
+            if lo < hi:
+                streams.append(map(index.__getitem__, range(hi - 1, lo - 1, -1) if newest_first else range(lo, hi)))
+
+        seqs = heapq.merge(*streams, reverse=newest_first) if len(streams) > 1 else iter(streams[0] if streams else ())
+        position = self.__position
+        if since is not None or until is not None or caller is not None or contains is not None:
+            times = self.__created
+            callers = self.__callers
+            msgs = self.__msgs
+
+            def matches(seq: int) -> bool:
+                i = position(seq)
+                return (
+                    (since is None or times[i] >= since) and (until is None or times[i] <= until)
+                    and (caller is None or callers[i] == caller)
+                    and (contains is None or contains in (msgs[i] if type(msgs[i]) is str else str(msgs[i])))
+                )
+
+            seqs = filter(matches, seqs)
+
+        return [self.__record(position(seq)) for seq in itertools.islice(seqs, offset, None if limit is None else offset + limit)]
+
+    def repeatNewest(self, count: int, last_created: float) -> None:
+        """
+        Record that the newest log stands for <count> identical logs, the last of them made at <last_created>.
+
+        :returns void:
+        """
+
+        with self.__lock:
+            if self.__msgs:
+                self.__repeats[(self.__start or len(self.__msgs)) - 1] = (count, last_created)
+
+    def __len__(self) -> int:
+        return len(self.__msgs)
+
+    def __record(self, i: int) -> LogRecord:
+        """
+        Build the record at physical position <i>.
+
+        :returns LogRecord:
+        """
+
+        record = LogRecord(
+            self.__levels[i], self.__created[i], self.__msgs[i], self.__callers[i], self.timestamper,
+            None if self.__sites is None else self.__sites[i]
+        )
+        if self.__repeats and i in self.__repeats:
+            record.count, record.last_created = self.__repeats[i]
+
+        if self.__extras:
+            record.extra = self.__extras.get(i)
+
+        return record
+
+    def __getitem__(self, index):
+        with self.__lock:
+            length = len(self.__msgs)
+            if isinstance(index, slice):
+                return [self.__record((self.__start + i) % length) for i in range(*index.indices(length))]
+
+            if index < 0:
+                index += length
+
+            if not 0 <= index < length:
+                raise IndexError("record index out of range")
+
+            return self.__record((self.__start + index) % length)
+
+    def __iter__(self):
+        return iter(self[:])  # A snapshot; other threads may add logs meanwhile.
@@ -0,0 +1,953 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import os
+import glob
+import gzip
+import time
+import atexit
+import shutil
+import weakref
+import tempfile
+import threading
+import traceback
+import contextlib
+
+from .formatting import INDEX_MAGIC
+from .formatting import INDEX_VERSION
+from .formatting import INDEX_HEADER
+from .formatting import INDEX_ENTRY
+
+# Try to import optional modules
+try:
+    import fcntl
+    FCNTL_SUPPORT = True
+
+except ImportError:
+    FCNTL_SUPPORT = False
+
+# The compression methods of rotated segments: {name: (suffix, open function)}
+COMPRESSIONS = {"gzip": (".gz", gzip.open)}
+try:
+    import lzma
+    COMPRESSIONS["lzma"] = (".xz", lzma.open)
+
+except ImportError:
+    pass
+
+try:
+    import bz2
+    COMPRESSIONS["bz2"] = (".bz2", bz2.open)
+
+except ImportError:
+    pass
+
+COPY_SIZE = 1024 * 1024  # The number of bytes copied at a time when compressing a segment.
+MAX_PENDING = 1024 * 1024  # The number of bytes kept in the buffer while writes fail. Older data is dropped.
+RETRY_INTERVAL = 1.0  # The number of seconds between retries of a failed write.
+
+# Sinks that are still open. Their buffers are written out when the interpreter exits.
+_open_sinks = weakref.WeakSet()
+
+
+def _flushOpenSinks() -> None:
+    """
+    Write the buffered data of every open sink to disk.
+
+    :returns void:
+    """
+
+    for sink in list(_open_sinks):
+        try:
+            sink.flush()
+
+        except (OSError, ValueError):
+            pass  # There is nobody left to report the error to.
+
+
+atexit.register(_flushOpenSinks)
+
+
+class _Flusher():
+    """
+    A daemon thread that writes out the buffers of sinks that were not written
+    to again before their flush interval passed, so that an idle logger does
+    not keep its last logs in memory. Anything with a `_flushDue()` method can
+    be scheduled, e.g. a Logger whose run of coalesced logs must be ended.
+    """
+
+    def __init__(self):
+        """
+        The initialization method of the _Flusher() class.
+        """
+
+        self._condition = threading.Condition()
+        self._deadlines = weakref.WeakKeyDictionary()  # {sink: the monotonic time its buffer must be written by}
+        self._thread = None
+
+    def schedule(self, sink, deadline: float) -> None:
+        """
+        Call `sink._flushDue()` at <deadline>.
+
+        sink     : FileSink, The sink (or other object with a `_flushDue()` method) to flush.
+        deadline : float,    The `time.monotonic()` time to flush it at.
+
+        :returns void:
+        """
+
+        with self._condition:
+            if sink in self._deadlines and self._deadlines[sink] <= deadline:
+                return
+
+            self._deadlines[sink] = deadline
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="simplelogger-flusher", daemon=True)
+                self._thread.start()
+
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """
+        Flush the sinks as their deadlines pass.
+
+        :returns void:
+        """
+
+        while True:
+            with self._condition:
+                if not self._deadlines:
+                    self._condition.wait()
+                    continue
+
+                sink, deadline = min(self._deadlines.items(), key=lambda item: item[1])
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    del sink  # Not kept alive while waiting.
+                    self._condition.wait(delay)
+                    continue
+
+                del self._deadlines[sink]
+
+            try:
+                sink._flushDue()
+
+            except ValueError:
+                pass  # The sink was closed meanwhile.
+
+            del sink
+
+    def _reset(self) -> None:
+        """
+        Forget the thread and the lock of the parent process after a fork.
+
+        :returns void:
+        """
+
+        self._condition = threading.Condition()
+        self._thread = None
+
+
+_flusher = _Flusher()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_flusher._reset)
+
+
+def openSegment(path: str):
+    """
+    Open a logfile or a rotated segment for reading, decompressing it if its name ends with the suffix of a compression method.
+
+    path: str, The path of the logfile or segment.
+
+    :returns file: A binary file object.
+    """
+
+    for suffix, opener in COMPRESSIONS.values():
+        if path.endswith(suffix):
+            return opener(path, "rb")
+
+    return open(path, "rb")
+
+
+class FileSink():
+    """
+    A sink that keeps the logfile open for its whole life and buffers writes in memory.
+
+    Writing out the buffer never raises. If it fails, e.g. when the disk is
+    full, the data stays in the buffer and is written again every
+    RETRY_INTERVAL seconds. While it fails, `self.error` is the OSError and
+    the oldest data beyond MAX_PENDING bytes is dropped and counted in
+    `self.dropped_bytes`. Data still in the buffer when the sink is closed is
+    dropped, and `close()` raises the error.
+    """
+
+    def __init__(self, path: str, buffer_size: int = io.DEFAULT_BUFFER_SIZE, flush_interval: float = 1.0, encoding: str = "utf-8", **kwargs):
+        """
+        The initialization method of the FileSink() class.
+
+        path           : str,     The path of the logfile.
+        buffer_size    : int,     The number of bytes to buffer before writing them to the logfile. (0 disables buffering)
+        flush_interval : float,   The maximum number of seconds data stays in the buffer. Checked on every write, and a background
+                                  thread writes out the buffer of a sink that is not written to again in time. (None to disable)
+        encoding       : str,     The encoding of the logfile.
+        kwargs         : dict,    The keyword arguments.
+
+        Available kwargs:
+        max_bytes      : int,     Rotate the logfile before it grows past this size. (Default: None; never rotate)
+        backup_count   : int,     The number of rotated segments to keep. If 0, the logfile is truncated instead. (Default: 1)
+        rotation       : str,     How rotated segments are named: (Default: `numbered`)
+            numbered   :          `<path>.1` is the newest segment, `<path>.<backup_count>` the oldest.
+            timestamp  :          `<path>.<YYYYmmdd-HHMMSS-microseconds>` of the time of rotation.
+        size_check_interval: float, Ignored. The real size of the logfile is checked before every write. (Kept for compatibility)
+        compression    : str,     Compress rotated segments on a background thread with `gzip`, `lzma` or `bz2`. (Default: None)
+                                  The segment is renamed right away and gets its final name (plus `.gz`, `.xz` or `.bz2`) once compressed.
+        max_backup_bytes: int,    Remove the oldest segments while all of them together are larger than this. (Default: None)
+        index          : bool,    If True, write a sidecar index to `<path>.idx`, with an entry for every block written to the logfile.
+                                  The entries describe the data passed to `write()` with an <index> tuple. (Default: False)
+        """
+
+        self.path = str(path)
+        self.buffer_size = int(buffer_size)
+        self.flush_interval = None if flush_interval is None else float(flush_interval)
+        self.encoding = encoding
+
+        self.max_bytes = None if kwargs.get("max_bytes", None) is None else int(kwargs.get("max_bytes"))
+        self.backup_count = int(kwargs.get("backup_count", 1))
+        if self.backup_count < 0:
+            raise ValueError("backup_count must be a non-negative integer.")
+
+        self.rotation = str(kwargs.get("rotation", "numbered"))
+        if self.rotation not in ("numbered", "timestamp"):
+            raise ValueError("rotation must be `numbered` or `timestamp`.")
+
+        self.compression = kwargs.get("compression", None)
+        if self.compression is not None and self.compression not in COMPRESSIONS:
+            raise ValueError("compression must be None or one of: {0}".format(", ".join(COMPRESSIONS)))
+
+        self.max_backup_bytes = None if kwargs.get("max_backup_bytes", None) is None else int(kwargs.get("max_backup_bytes"))
+        self._compressor = None  # The thread that compresses rotated segments; runs only while there are any.
+        self._uncompressed = []  # The rotated segments waiting for the compression thread.
+        self._compressor_lock = threading.Lock()
+        if type(kwargs.get("index", False)) is not bool:
+            raise ValueError("index must be a boolean.")
+
+        self.index = kwargs.get("index", False)
+        self.index_path = self.path + ".idx"
+        self._index_fd = None
+        self._block = None  # The [first, last, levels, sessions] of the buffered data.
+        self.size = None  # The size of the logfile, checked before every write.
+        self.bytes_written = 0  # Counters for the metrics of the logger.
+        self.flushes = 0
+        self.rotations = 0
+        self.write_errors = 0
+        self.dropped_bytes = 0
+        self.error = None  # The OSError of the last write, until a write succeeds.
+
+        self._fd = None  # The logfile is opened on the first write.
+        self._buffer = []
+        self._buffered = 0  # The number of bytes in `self._buffer`.
+        self._deadline = None  # When the oldest buffered data must be written.
+        self._retry = None  # When a failed write may be retried because the buffer is full.
+        self._lock = threading.RLock()
+        self.closed = False
+
+        _open_sinks.add(self)
+
+    def __del__(self):
+        try:
+            self.close()
+
+        except (AttributeError, OSError, ValueError):
+            pass  # The sink was not fully initialized or the logfile is gone.
+
+    def _open(self) -> None:
+        """
+        Open the logfile for appending.
+
+        :returns void:
+        """
+
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+        self.size = os.fstat(self._fd).st_size
+        if self.index:
+            self._openIndex()
+
+    def _openIndex(self) -> None:
+        """
+        Open the sidecar index for appending, writing its header if it is new.
+        An index left behind by a logfile that was removed or emptied is emptied too.
+
+        :returns void:
+        """
+
+        if self._index_fd is not None:
+            os.close(self._index_fd)
+
+        self._index_fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+        index_size = os.fstat(self._index_fd).st_size
+        if index_size == 0:
+            os.write(self._index_fd, INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION))
+
+        elif self.size == 0 and index_size > INDEX_HEADER.size:
+            os.ftruncate(self._index_fd, INDEX_HEADER.size)
+
+    def _reopenIfMoved(self) -> None:
+        """
+        Open the logfile again if it was rotated, removed or replaced by another
+        sink or process since it was opened, and update `self.size`.
+
+        :returns void:
+        """
+
+        if self._fd is not None:
+            try:
+                current = os.stat(self.path)
+
+            except FileNotFoundError:
+                current = None
+
+            opened = os.fstat(self._fd)
+            if current is not None and (current.st_ino, current.st_dev) == (opened.st_ino, opened.st_dev):
+                self.size = opened.st_size
+                return
+
+            os.close(self._fd)
+            self._fd = None
+
+        self._open()
+
+    def _write(self, data: bytes, block: list = None) -> None:
+        """
+        Write <data> to the logfile, bypassing the buffer.
+
+        data  : bytes, The data to write.
+        block : list,  The [first, last, levels, sessions] of <data> for the index, or None.
+
+        :returns void:
+        """
+
+        self._reopenIfMoved()  # Notice if the logfile was rotated, truncated or written to by someone else.
+        if self._mustRotate(len(data)):
+            self._rotate()
+
+        self._append(data, block)
+
+    def _mustRotate(self, length: int) -> bool:
+        """
+        Check if the logfile must be rotated before <length> more bytes are written to it.
+
+        :returns bool:
+        """
+
+        return self.max_bytes is not None and self.size > 0 and self.size + length > self.max_bytes
+
+    def _append(self, data: bytes, block: list = None) -> None:
+        """
+        Append <data> to the open logfile with one `os.write()` call where possible,
+        then add the entry of <block> to the index.
+
+        :returns void:
+        """
+
+        offset = self.size
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            self.size += written
+            self.bytes_written += written  # Counted as it goes, so that a failed write is retried from where it stopped.
+            view = view[written:]
+
+        if block is not None and self._index_fd is not None:
+            os.write(self._index_fd, INDEX_ENTRY.pack(offset, len(data), *block))
+
+    def segments(self) -> list:
+        """
+        Return the paths of the rotated segments of the logfile, oldest first.
+        Compressed segments are included. Segments waiting to be compressed are
+        only included with the `timestamp` rotation, under their uncompressed name.
+
+        :returns list:
+        """
+
+        suffixes = [''] + [suffix for suffix, _ in COMPRESSIONS.values()]
+        if self.rotation == "numbered":
+            segments = []
+            for i in range(1, self.backup_count + 1):
+                for suffix in suffixes:
+                    segment = "{0}.{1}{2}".format(self.path, i, suffix)
+                    if os.path.exists(segment):
+                        segments.insert(0, segment)
+
+            return segments
+
+        prefix = "{0}.{1}".format(glob.escape(self.path), "[0-9]" * 8 + "-" + "[0-9]" * 6 + "-" + "[0-9]" * 6)
+        return sorted(
+            segment for segment in glob.glob(prefix + '*')
+            if segment[len(self.path) + 23:] in suffixes  # Skip the temporary files of the compressor.
+        )
+
+    def _stampedName(self) -> str:
+        """
+        Return the name of a segment rotated now with the `timestamp` rotation.
+
+        :returns str:
+        """
+
+        now = time.time()
+        return "{0}.{1}-{2:06d}".format(self.path, time.strftime("%Y%m%d-%H%M%S", time.localtime(now)), int(now % 1 * 1000000))
+
+    def _shiftSegments(self) -> None:
+        """
+        Rename the numbered segments `<path>.<i>` to `<path>.<i + 1>`, removing the oldest one.
+
+        :returns void:
+        """
+
+        suffixes = ['', ".idx"] + [suffix for suffix, _ in COMPRESSIONS.values()]
+        for suffix in suffixes:
+            oldest = "{0}.{1}{2}".format(self.path, self.backup_count, suffix)
+            if os.path.exists(oldest):
+                os.remove(oldest)
+
+        for i in range(self.backup_count - 1, 0, -1):
+            for suffix in suffixes:
+                segment = "{0}.{1}{2}".format(self.path, i, suffix)
+                if os.path.exists(segment):
+                    os.replace(segment, "{0}.{1}{2}".format(self.path, i + 1, suffix))
+
+    def _retain(self) -> None:
+        """
+        Remove the oldest segments beyond `backup_count` or `max_backup_bytes`.
+
+        :returns void:
+        """
+
+        segments = self.segments()
+        sizes = []
+        for segment in segments:
+            try:
+                sizes.append(os.path.getsize(segment))
+
+            except FileNotFoundError:
+                sizes.append(0)
+
+        count = len(segments)
+        total = sum(sizes)
+        for segment, size in zip(segments, sizes):
+            if count <= self.backup_count and (self.max_backup_bytes is None or total <= self.max_backup_bytes):
+                break
+
+            for path in (segment, segment + ".idx"):
+                try:
+                    os.remove(path)
+
+                except FileNotFoundError:
+                    pass
+
+            count -= 1
+            total -= size
+
+    @contextlib.contextmanager
+    def _segmentsLock(self):
+        """
+        Held by the compression thread while it renames and removes segments.
+        A FileSink rotates and compresses from one process, so there is nothing to exclude.
+        """
+
+        yield
+
+    def _rotate(self) -> None:
+        """
+        Move the logfile to a new segment and open a new logfile. The caller must hold `self._lock`.
+        With compression, the segment is handed to the compression thread under a temporary name.
+
+        :returns void:
+        """
+
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+        if self._index_fd is not None:
+            os.close(self._index_fd)
+            self._index_fd = None
+
+        self.rotations += 1
+        segment = None  # Where the logfile is moved to, unless it is removed or compressed.
+        if self.backup_count == 0:
+            os.remove(self.path)
+
+        elif self.compression is not None:
+            compressed = self._stampedName()
+            os.replace(self.path, compressed)
+            with self._compressor_lock:
+                self._uncompressed.append(compressed)
+                if self._compressor is None:
+                    self._compressor = threading.Thread(target=self._compressPending, name="simplelogger-compressor")
+                    self._compressor.start()
+
+        elif self.rotation == "numbered":
+            self._shiftSegments()
+            segment = self.path + ".1"
+            os.replace(self.path, segment)
+
+        else:
+            segment = self._stampedName()
+            os.replace(self.path, segment)
+
+        if os.path.exists(self.index_path):
+            if segment is None:
+                os.remove(self.index_path)  # Compressed segments are not indexed; the offsets are of the uncompressed data.
+
+            else:
+                os.replace(self.index_path, segment + ".idx")
+
+        if segment is not None and (self.rotation == "timestamp" or self.max_backup_bytes is not None):
+            self._retain()
+
+        self._open()
+
+    def _compressPending(self) -> None:
+        """
+        Compress the rotated segments until there are no more, then let the compression thread exit,
+        so that it does not keep the sink alive.
+
+        :returns void:
+        """
+
+        while True:
+            with self._compressor_lock:
+                segments = self._uncompressed
+                if not segments:
+                    self._compressor = None
+                    return
+
+                self._uncompressed = []
+
+            try:
+                self._compressSegments(segments)
+
+            except Exception:
+                traceback.print_exc()
+
+    def _compressSegments(self, segments: list) -> None:
+        """
+        Compress rotated segments and give them their final names. This is called by the compression thread.
+
+        segments: list, The paths the segments were moved to by `_rotate()`.
+
+        :returns void:
+        """
+
+        suffix, opener = COMPRESSIONS[self.compression]
+        for segment in segments:
+            temporary = segment + suffix + ".tmp"
+            try:
+                with open(segment, "rb") as source, opener(temporary, "wb") as target:
+                    shutil.copyfileobj(source, target, COPY_SIZE)
+
+            except FileNotFoundError:
+                continue  # Already removed by the retention of another process.
+
+            with self._segmentsLock():
+                if self.rotation == "numbered":
+                    self._shiftSegments()
+                    os.replace(temporary, "{0}.1{1}".format(self.path, suffix))
+
+                else:
+                    os.replace(temporary, segment + suffix)
+
+                os.remove(segment)
+                self._retain()
+
+    def wait(self) -> None:
+        """
+        Wait until the rotated segments are compressed.
+
+        :returns void:
+        """
+
+        while True:
+            with self._compressor_lock:
+                compressor = self._compressor
+
+            if compressor is None or compressor is threading.current_thread() or not compressor.is_alive():
+                return  # Also when the thread was left behind in the parent process by a fork.
+
+            compressor.join()
+
+    def truncate(self) -> None:
+        """
+        Discard the buffer and empty the logfile.
+
+        :returns void:
+        """
+
+        with self._lock:
+            if self.closed:
+                raise ValueError("I/O operation on a closed sink.")
+
+            self._buffer = []
+            self._buffered = 0
+            self._deadline = None
+            self._block = None
+            self._reopenIfMoved()
+            os.ftruncate(self._fd, 0)
+            self.size = 0
+            if self._index_fd is not None:
+                os.ftruncate(self._index_fd, INDEX_HEADER.size)
+
+    def write(self, data, index: tuple = None) -> None:
+        """
+        Add <data> to the buffer, writing the buffer to the logfile when it is full or too old.
+
+        data  : str | bytes, The data to write. Strings are encoded with <self.encoding>.
+        index : tuple,       What the index should know about <data>: (first created, last created, level mask, session mask).
+                             (See `levelBit()` and `sessionBit()` in `simplelogger.formatting`.) Ignored if `self.index` is False.
+
+        :returns void:
+        """
+
+        self._put(data if type(data) is bytes else data.encode(self.encoding), index)
+
+    def _put(self, data: bytes, index: tuple = None) -> None:
+        """
+        Add encoded <data> to the buffer, writing the buffer out when it is full or too old.
+
+        data  : bytes, The data to buffer.
+        index : tuple, See `write()`.
+
+        :returns void:
+        """
+
+        with self._lock:
+            if self.closed:
+                raise ValueError("I/O operation on a closed sink.")
+
+            if index is not None and self.index:
+                block = self._block
+                if block is None:
+                    self._block = list(index)
+
+                else:
+                    block[0] = min(block[0], index[0])
+                    block[1] = max(block[1], index[1])
+                    block[2] |= index[2]
+                    block[3] |= index[3]
+
+            self._buffer.append(data)
+            self._buffered += len(data)
+            if self._retry is not None and self._buffered > MAX_PENDING:
+                self._dropOldest()
+
+            if self._buffered >= self.buffer_size and (self._retry is None or time.monotonic() >= self._retry):
+                self._flush()
+
+            elif self._deadline is None:
+                if self.flush_interval is not None:
+                    self._deadline = time.monotonic() + self.flush_interval
+                    _flusher.schedule(self, self._deadline)
+
+            elif time.monotonic() >= self._deadline:
+                self._flush()
+
+    def _flushDue(self) -> None:
+        """
+        Write the buffer out if its flush deadline has passed. Called by the flusher thread.
+
+        :returns void:
+        """
+
+        with self._lock:
+            if self.closed or self._deadline is None:
+                return
+
+            if time.monotonic() >= self._deadline:
+                self._flush()
+
+            else:
+                _flusher.schedule(self, self._deadline)
+
+    def _flush(self) -> None:
+        """
+        Write the buffer to the logfile. The caller must hold `self._lock`.
+        If the write fails, the data is put back into the buffer to be retried.
+
+        :returns void:
+        """
+
+        if self._buffer:
+            data = b"".join(self._buffer)
+            written = self.bytes_written
+            try:
+                self._write(data, self._block)
+
+            except OSError as e:
+                data = data[self.bytes_written - written:]
+                self._buffer = [data]
+                self._buffered = len(data)
+                self.error = e
+                self.write_errors += 1
+                self._retry = self._deadline = time.monotonic() + RETRY_INTERVAL
+                _flusher.schedule(self, self._deadline)
+                if self._buffered > MAX_PENDING:
+                    self._dropOldest()
+
+                return
+
+            self._buffer = []
+            self._buffered = 0
+            self._deadline = None
+            self._retry = None
+            self._block = None
+            self.error = None
+            self.flushes += 1
+
+    def _dropOldest(self) -> None:
+        """
+        Drop the oldest buffered data until at most MAX_PENDING bytes are left. The caller must hold `self._lock`.
+
+        :returns void:
+        """
+
+        buffer = self._buffer
+        dropped = 0
+        while buffer and self._buffered - dropped > MAX_PENDING:
+            dropped += len(buffer[0])
+            del buffer[0]
+
+        self._buffered -= dropped
+        self.dropped_bytes += dropped
+
+    def flush(self) -> None:
+        """
+        Write the buffered data to the logfile. If that fails, the data stays in the buffer and `self.error` is set.
+
+        :returns void:
+        """
+
+        with self._lock:
+            if not self.closed:
+                self._flush()
+
+    def close(self) -> None:
+        """
+        Flush the buffer and close the logfile. The sink cannot be used afterwards.
+        If the buffer cannot be written, its data is dropped and the OSError is raised.
+
+        :returns void:
+        """
+
+        with self._lock:
+            if self.closed:
+                return
+
+            try:
+                self._flush()
+                if self._buffer:
+                    self.dropped_bytes += self._buffered
+                    self._buffer = []
+                    self._buffered = 0
+                    raise self.error
+
+            finally:
+                self.closed = True
+                _open_sinks.discard(self)
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+
+                if self._index_fd is not None:
+                    os.close(self._index_fd)
+                    self._index_fd = None
+
+                self.wait()  # Finish compressing the rotated segments.
+
+
+class SharedFileSink(FileSink):
+    """
+    A FileSink for a logfile that several processes append to.
+
+    Every flush of the buffer is a single `os.write()` on an `O_APPEND`
+    descriptor, so lines from different processes never tear. The write
+    happens while holding an exclusive `flock()` on `<path>.lock`, so the
+    size check and the rotation see every other process's writes, only one
+    process rotates, and the others reopen the new logfile before their
+    next write.
+    """
+
+    def __init__(self, path: str, *args, **kwargs):
+        """
+        The initialization method of the SharedFileSink() class. It takes the same arguments as FileSink().
+        """
+
+        if not FCNTL_SUPPORT:
+            raise ValueError("Sharing a logfile between processes requires the `fcntl` module.")
+
+        super().__init__(path, *args, **kwargs)
+        self.lockfile = self.path + ".lock"
+        self._lock_fd = None
+
+    def _write(self, data: bytes, block: list = None) -> None:
+        """
+        Write <data> to the logfile while holding the lock file.
+
+        data  : bytes, The data to write.
+        block : list,  The [first, last, levels, sessions] of <data> for the index, or None.
+
+        :returns void:
+        """
+
+        if self._lock_fd is None:
+            self._lock_fd = os.open(self.lockfile, os.O_RDWR | os.O_CREAT, 0o666)
+
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            super()._write(data, block)
+
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def truncate(self) -> None:
+        """
+        Discard the buffer and empty the logfile while holding the lock file exclusively.
+
+        :returns void:
+        """
+
+        with self._lock:
+            if self._lock_fd is None:
+                self._lock_fd = os.open(self.lockfile, os.O_RDWR | os.O_CREAT, 0o666)
+
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                super().truncate()
+
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    @contextlib.contextmanager
+    def _segmentsLock(self):
+        """
+        Hold the lock file exclusively, so that no other process rotates or
+        compresses while the compression thread renames and removes segments.
+        The lock file is opened again because `flock()` locks belong to the
+        open file, which the logging thread uses too.
+        """
+
+        lock_fd = os.open(self.lockfile, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            yield
+
+        finally:
+            os.close(lock_fd)  # Also releases the lock.
+
+    def close(self) -> None:
+        """
+        Flush the buffer and close the logfile and the lock file.
+
+        :returns void:
+        """
+
+        with self._lock:
+            try:
+                super().close()
+
+            finally:
+                if self._lock_fd is not None:
+                    os.close(self._lock_fd)
+                    self._lock_fd = None
+
+
+class SpillFile():
+    """
+    A temporary file that holds rendered logs moved out of memory, in the
+    blocks they were appended in. The file is removed when it is closed.
+    """
+
+    def __init__(self, directory: str = None, encoding: str = "utf-8"):
+        """
+        The initialization method of the SpillFile() class.
+
+        directory : str, Where to create the file. (Default: None; the system temporary directory)
+        encoding  : str, The encoding of the logs.
+        """
+
+        self.encoding = encoding
+        self._file = tempfile.TemporaryFile(prefix="simplelogger-", suffix=".spill", dir=directory)
+        self._blocks = []  # (length, index) of each block, in order.
+        self.size = 0  # The number of bytes in the file.
+
+    def append(self, data, index: tuple = None) -> None:
+        """
+        Append a block of rendered logs to the end of the file.
+
+        data  : str | bytes, The rendered logs. Strings are encoded with <self.encoding>.
+        index : tuple,       What the index should know about <data>. (See `FileSink.write()`.)
+
+        :returns void:
+        """
+
+        if type(data) is not bytes:
+            data = data.encode(self.encoding)
+
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(data)
+        self._blocks.append((len(data), index))
+        self.size += len(data)
+
+    def blocks(self):
+        """
+        Read the blocks back in the order they were appended.
+
+        :returns generator: (data, index) of each block.
+        """
+
+        self._file.flush()
+        self._file.seek(0)
+        read = self._file.read
+        for length, index in self._blocks:
+            yield read(length), index
+
+    def clear(self) -> None:
+        """
+        Remove all blocks.
+
+        :returns void:
+        """
+
+        self._file.seek(0)
+        self._file.truncate()
+        self._blocks = []
+        self.size = 0
+
+    def close(self) -> None:
+        """
+        Close and remove the file.
+
+        :returns void:
+        """
+
+        self._file.close()
@@ -0,0 +1,203 @@
+"""
+MIT License
+
+Copyright (c) 2020-2022 Chris1320
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import queue
+import atexit
+import threading
+import traceback
+
+_STOP = object()  # Tells the writer thread to exit after draining the queue.
+
+
+class _Sync(threading.Event):
+    """
+    Set by the writer thread once the items queued before it are flushed.
+    """
+
+
+_running_writers = set()
+
+
+def _closeRunningWriters() -> None:
+    """
+    Drain and stop every running writer thread.
+
+    :returns void:
+    """
+
+    for writer in list(_running_writers):
+        writer.close()
+
+
+atexit.register(_closeRunningWriters)
+
+
+class AsyncWriter():
+    """
+    A writer thread that drains a bounded queue in batches.
+    """
+
+    def __init__(self, handler, flush=None, queue_size: int = 10000, batch_size: int = 512, flush_interval: float = 1.0, overflow: str = "block"):
+        """
+        The initialization method of the AsyncWriter() class.
+
+        handler        : callable, Called on the writer thread with a list of queued items.
+        flush          : callable, Called on the writer thread when the queue stays empty for <flush_interval> seconds and on `close()`.
+        queue_size     : int,      The maximum number of items in the queue.
+        batch_size     : int,      The maximum number of items passed to <handler> at once.
+        flush_interval : float,    See <flush>. If None, <flush> is only called on `close()`.
+        overflow       : str,      What to do when the queue is full: (Default: `block`)
+            block      :           Wait until the writer thread makes room.
+            drop       :           Discard the item and count it in `self.dropped`.
+        """
+
+        if overflow not in ("block", "drop"):
+            raise ValueError("overflow must be `block` or `drop`.")
+
+        self.__handler = handler
+        self.__flush = flush
+        self.batch_size = int(batch_size)
+        self.flush_interval = flush_interval
+        self.__block = overflow == "block"
+        self.__queue = queue.Queue(int(queue_size))
+        self.dropped = 0
+        self.closed = False
+
+        self.__thread = threading.Thread(target=self.__run, name="SimpleLogger writer", daemon=True)
+        self.__thread.start()
+        _running_writers.add(self)
+
+    def put(self, item) -> bool:
+        """
+        Add <item> to the queue.
+
+        item: Any, The item to pass to the handler.
+
+        :returns bool: False if the item was dropped.
+        """
+
+        if self.closed:
+            raise ValueError("The writer thread has been closed.")
+
+        try:
+            self.__queue.put(item, self.__block)
+            return True
+
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def qsize(self) -> int:
+        """
+        Return the approximate number of items waiting in the queue.
+
+        :returns int:
+        """
+
+        return self.__queue.qsize()
+
+    def __call(self, function, *args) -> None:
+        """
+        Call <function> without letting an exception kill the writer thread.
+
+        :returns void:
+        """
+
+        try:
+            function(*args)
+
+        except Exception:
+            traceback.print_exc()
+
+    def __run(self) -> None:
+        """
+        The main loop of the writer thread.
+
+        :returns void:
+        """
+
+        get = self.__queue.get
+        get_nowait = self.__queue.get_nowait
+        while True:
+            try:
+                item = get(timeout=self.flush_interval)
+
+            except queue.Empty:
+                if self.__flush is not None:
+                    self.__call(self.__flush)
+
+                continue
+
+            batch = []
+            while item is not _STOP and type(item) is not _Sync:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+
+                try:
+                    item = get_nowait()
+
+                except queue.Empty:
+                    break
+
+            if batch:
+                self.__call(self.__handler, batch)
+
+            if item is _STOP or type(item) is _Sync:
+                if self.__flush is not None:
+                    self.__call(self.__flush)
+
+                if item is _STOP:
+                    return
+
+                item.set()
+
+    def sync(self) -> None:
+        """
+        Wait until every item queued so far is handled and flushed.
+
+        :returns void:
+        """
+
+        if self.closed:
+            return
+
+        done = _Sync()
+        self.__queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """
+        Wait for the writer thread to drain the queue, then stop it.
+
+        :returns void:
+        """
+
+        if self.closed:
+            return
+
+        self.closed = True
+        _running_writers.discard(self)
+        self.__queue.put(_STOP)
+        self.__thread.join()